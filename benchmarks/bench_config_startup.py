@@ -0,0 +1,99 @@
+"""Benchmark job startup through hydra.main vs a compiled config snapshot.
+
+Each job is a fresh python process running a no-op entry point, so the timing is
+interpreter start, imports and config handling only.
+
+Usage:
+    uv run python benchmarks/bench_config_startup.py --runs 10
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import train_model as tm
+
+ENTRY_POINT = textwrap.dedent(
+    """
+    import hydra
+
+    import train_model as tm
+
+
+    def run(args):
+        assert args.batch_predict.chunk_size > 0
+
+
+    @hydra.main(config_path={config_dir!r}, config_name="process_data.yaml", version_base=None)
+    def main(args):
+        run(args)
+
+
+    if __name__ == "__main__":
+        tm.config_snapshot.run_entry_point(run, main)
+    """
+)
+
+
+def time_job(command: list[str], cwd: str, runs: int) -> list[float]:
+    """Wall time of each run of a command in a new process."""
+    env = {**os.environ, "PYTHONPATH": str(Path(tm.__file__).parents[1])}
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, env=env, check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    """Run both startup paths and print a summary table."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    cli_args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        script = Path(tmp_dir, "entry_point.py")
+        script.write_text(
+            ENTRY_POINT.format(config_dir=str(tm.config_snapshot.CONFIG_DIR.resolve()))
+        )
+        snapshot = Path(tmp_dir, "snapshot.json")
+        tm.config_snapshot.compile_snapshot(snapshot)
+
+        results = {
+            "hydra_main": time_job(
+                [sys.executable, str(script)], tmp_dir, cli_args.runs
+            ),
+            "snapshot": time_job(
+                [sys.executable, str(script), "--snapshot", str(snapshot)],
+                tmp_dir,
+                cli_args.runs,
+            ),
+        }
+
+        # config handling alone, in process
+        start = time.perf_counter()
+        for _ in range(cli_args.runs):
+            tm.config_snapshot.load_snapshot(snapshot)
+        load_time = (time.perf_counter() - start) / cli_args.runs
+
+    summary = pd.DataFrame(
+        {
+            "mode": list(results),
+            "median_s": [pd.Series(t).median() for t in results.values()],
+            "min_s": [min(t) for t in results.values()],
+        }
+    )
+    print(summary.round(3).to_string(index=False))
+    print(f"load_snapshot in process: {load_time * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
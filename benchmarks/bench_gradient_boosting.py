@@ -0,0 +1,129 @@
+"""Benchmark one-hot LinearRegression vs native categorical gradient boosting.
+
+Usage:
+    uv run python benchmarks/bench_gradient_boosting.py --rows 200000
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import omegaconf
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import root_mean_squared_error
+
+import train_model as tm
+
+CATEGORICAL = ["town", "flat_type", "street_name", "block"]
+NUMERIC = ["storey_area_ratio", "remaining_lease", "floor_area_sqm"]
+
+
+def make_data(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic cleaned HDB data with high cardinality street_name and block."""
+    rng = np.random.default_rng(seed)
+    street = rng.integers(0, 2_000, n_rows)
+    town = street % 26
+    floor_area = rng.uniform(30, 200, n_rows)
+    remaining_lease = rng.integers(40, 99, n_rows)
+    price = (
+        floor_area * 4_000
+        + remaining_lease * 2_000
+        + town * 10_000
+        + np.sin(street) * 50_000
+        + rng.normal(0, 20_000, n_rows)
+    )
+    return pd.DataFrame(
+        {
+            "town": [f"TOWN_{t}" for t in town],
+            "flat_type": rng.choice(["3 ROOM", "4 ROOM", "5 ROOM"], n_rows),
+            "street_name": [f"STREET {s}" for s in street],
+            "block": rng.integers(1, 999, n_rows).astype(str),
+            "storey_to": rng.integers(3, 51, n_rows),
+            "floor_area_sqm": floor_area,
+            "remaining_lease": remaining_lease,
+            "resale_price": price,
+        }
+    )
+
+
+def run(name: str, preprocess: dict, predictor, train, test) -> dict:
+    """Time transform and fit, trace peak memory and score on test data."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+            omegaconf.DictConfig(preprocess), tmp_dir, precision="float32"
+        )
+        train = preprocessor.feature_engineer(train)
+        test = preprocessor.feature_engineer(test)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        preprocessor.fit_preprocessors(train)
+        features = preprocessor.transform_data(train)
+        predictor.fit(features, train["resale_price"])
+        fit_time = time.perf_counter() - start
+        _, fit_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        ypred = predictor.predict(preprocessor.transform_data(test))
+
+    return {
+        "model": name,
+        "n_features": features.shape[1],
+        "matrix_mb": features.memory_usage(index=False).sum() / 1e6,
+        "fit_peak_mb": fit_peak / 1e6,
+        "fit_s": fit_time,
+        "test_rmse": root_mean_squared_error(test["resale_price"], ypred),
+    }
+
+
+def main():
+    """Run benchmark for both backends and print a summary table."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--n-threads", type=int, default=None)
+    cli_args = parser.parse_args()
+
+    data = make_data(cli_args.rows)
+    n_train = int(len(data) * 0.8)
+    train, test = data.iloc[:n_train].copy(), data.iloc[n_train:].copy()
+
+    linear = run(
+        "onehot_linear",
+        {
+            "standardscaler": {"columns": NUMERIC},
+            "onehotencoder": {"columns": CATEGORICAL},
+        },
+        tm.models.SKLearnPredictor({}, LinearRegression, precision="float32"),
+        train.copy(),
+        test.copy(),
+    )
+    hgb = run(
+        "native_hgb",
+        {
+            "standardscaler": {"columns": NUMERIC},
+            "ordinalencoder": {"columns": CATEGORICAL},
+        },
+        tm.models.HistGradientBoostingPredictor(
+            omegaconf.DictConfig(
+                {
+                    "categorical_features": CATEGORICAL,
+                    "max_iter": 300,
+                    "random_state": 0,
+                }
+            ),
+            HistGradientBoostingRegressor,
+            precision="float32",
+            n_threads=cli_args.n_threads,
+        ),
+        train.copy(),
+        test.copy(),
+    )
+    print(pd.DataFrame([linear, hgb]).round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark per-row vs parse-unique-then-map parsing of lease and month strings.
+
+Usage:
+    uv run python benchmarks/bench_parsers.py --rows 1000000
+"""
+
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+import train_model as tm
+
+
+def make_data(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw api-like remaining_lease and month strings."""
+    rng = np.random.default_rng(seed)
+    years = rng.integers(40, 99, n_rows)
+    months = rng.integers(0, 12, n_rows)
+    return pd.DataFrame(
+        {
+            "storey_range": "01 TO 03",
+            "remaining_lease": [
+                f"{y} years {m:02d} months" for y, m in zip(years, months)
+            ],
+            "month": [
+                f"{y}-{m:02d}"
+                for y, m in zip(rng.integers(1990, 2025, n_rows), months + 1)
+            ],
+        }
+    )
+
+
+def parse_per_row(data: pd.DataFrame) -> pd.DataFrame:
+    """Baseline parsing every row with a python regex."""
+    lease = re.compile(tm.data_cleaner.LEASE_PATTERN, re.IGNORECASE)
+
+    def lease_months(value):
+        match = lease.match(str(value))
+        if match is None:
+            return np.nan
+        return round(float(match["years"]) * 12) + int(match["months"] or 0)
+
+    year_month = data["month"].str.split("-", expand=True).astype(int)
+    return pd.DataFrame(
+        {
+            "remaining_lease_months": data["remaining_lease"].map(lease_months),
+            "month_period": year_month[0] * 12 + year_month[1] - 1,
+        }
+    )
+
+
+def main():
+    """Time both strategies and check they agree."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    cli_args = parser.parse_args()
+
+    data = make_data(cli_args.rows)
+
+    start = time.perf_counter()
+    expected = parse_per_row(data)
+    per_row = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cleaned = tm.data_cleaner.HdbDataCleaner()._parse_remaining_lease(data)
+    cleaned = tm.data_cleaner.HdbDataCleaner()._parse_month(cleaned)
+    unique_map = time.perf_counter() - start
+
+    np.testing.assert_array_equal(
+        cleaned["remaining_lease_months"], expected["remaining_lease_months"]
+    )
+    np.testing.assert_array_equal(cleaned["month_period"], expected["month_period"])
+    print(
+        pd.DataFrame(
+            {
+                "strategy": ["per_row", "parse_unique_then_map"],
+                "seconds": [per_row, unique_map],
+            }
+        )
+        .round(3)
+        .to_string(index=False)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark memory and throughput of float64 vs float32 feature pipeline.
+
+Usage:
+    uv run python benchmarks/bench_precision.py --rows 1000000
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import omegaconf
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+import train_model as tm
+
+PREPROCESS = {
+    "standardscaler": {
+        "columns": ["storey_area_ratio", "remaining_lease", "floor_area_sqm"]
+    },
+    "onehotencoder": {"columns": ["town", "lease_less_than_50_yrs"]},
+}
+
+
+def make_data(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic cleaned HDB data."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "town": rng.choice([f"TOWN_{i}" for i in range(26)], n_rows),
+            "storey_to": rng.integers(3, 51, n_rows),
+            "floor_area_sqm": rng.uniform(30, 200, n_rows),
+            "remaining_lease": rng.integers(40, 99, n_rows),
+            "resale_price": rng.uniform(2e5, 1.5e6, n_rows),
+        }
+    )
+
+
+def run(data: pd.DataFrame, precision: str) -> dict:
+    """Time transform, fit and predict and trace peak memory of transform."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+            omegaconf.DictConfig(PREPROCESS), tmp_dir, precision=precision
+        )
+        data = preprocessor.feature_engineer(data)
+        preprocessor.fit_preprocessors(data)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        features = preprocessor.transform_data(data)
+        transform_time = time.perf_counter() - start
+        _, transform_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        predictor = tm.models.SKLearnPredictor(
+            {}, LinearRegression, precision=precision
+        )
+        start = time.perf_counter()
+        predictor.fit(features, data["resale_price"])
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predictor.predict(features)
+        predict_time = time.perf_counter() - start
+
+    return {
+        "precision": precision,
+        "matrix_mb": features.memory_usage(index=False).sum() / 1e6,
+        "transform_peak_mb": transform_peak / 1e6,
+        "transform_rows_s": len(data) / transform_time,
+        "fit_s": fit_time,
+        "predict_rows_s": len(data) / predict_time,
+    }
+
+
+def main():
+    """Run benchmark for both precisions and print a summary table."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    cli_args = parser.parse_args()
+
+    data = make_data(cli_args.rows)
+    results = pd.DataFrame([run(data, p) for p in ("float64", "float32")])
+    print(results.round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark json vs Arrow IPC batch prediction requests end to end.
+
+Usage:
+    uv run python benchmarks/bench_serving.py --rows 10000 100000
+"""
+
+import argparse
+import io
+import tempfile
+import time
+
+import numpy as np
+import omegaconf
+import pandas as pd
+import pyarrow as pa
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LinearRegression
+
+import train_model as tm
+
+PREPROCESS = {
+    "standardscaler": {
+        "columns": ["storey_area_ratio", "remaining_lease", "floor_area_sqm"]
+    },
+    "onehotencoder": {"columns": ["town", "lease_less_than_50_yrs"]},
+}
+
+
+def make_records(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic raw HDB records matching HDBFeatureData."""
+    rng = np.random.default_rng(seed)
+    storey_from = rng.integers(0, 16, n_rows) * 3 + 1
+    return pd.DataFrame(
+        {
+            "month": rng.choice([f"2020-{m:02d}" for m in range(1, 13)], n_rows),
+            "town": rng.choice([f"TOWN_{i}" for i in range(26)], n_rows),
+            "flat_type": rng.choice(["3 ROOM", "4 ROOM", "5 ROOM"], n_rows),
+            "block": rng.integers(1, 999, n_rows).astype(str),
+            "street_name": rng.choice([f"STREET {i}" for i in range(500)], n_rows),
+            "storey_range": [f"{s:02d} TO {s + 2:02d}" for s in storey_from],
+            "floor_area_sqm": rng.uniform(30, 200, n_rows).round(1),
+            "flat_model": rng.choice(["Improved", "New Generation"], n_rows),
+            "lease_commence_date": rng.integers(1970, 2020, n_rows),
+            "remaining_lease": rng.integers(40, 99, n_rows),
+        }
+    )
+
+
+def make_registry(root: str) -> tm.registry.ModelRegistry:
+    """Register a model fitted on synthetic records."""
+    data = make_records(50_000, seed=1)
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        omegaconf.DictConfig(PREPROCESS), root
+    )
+    data = preprocessor.feature_engineer(
+        tm.data_cleaner.HdbDataCleaner().clean_data(data)
+    )
+    preprocessor.fit_preprocessors(data)
+    predictor = tm.models.SKLearnPredictor({}, LinearRegression)
+    predictor.fit(preprocessor.transform_data(data), np.log(data["floor_area_sqm"]))
+
+    registry = tm.registry.ModelRegistry(f"{root}/registry")
+    registry.register(preprocessor, predictor)
+    return registry
+
+
+def post_json(client: TestClient, records: pd.DataFrame) -> np.ndarray:
+    """Encode, send and decode a json batch."""
+    response = client.post("/predict", json=records.to_dict(orient="records"))
+    return np.asarray(response.json()["predictions"])
+
+
+def post_arrow(client: TestClient, records: pd.DataFrame) -> np.ndarray:
+    """Encode, send and decode an Arrow IPC batch."""
+    sink = io.BytesIO()
+    table = pa.Table.from_pandas(records, preserve_index=False)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    response = client.post(
+        "/predict/batch",
+        content=sink.getvalue(),
+        headers={"content-type": tm.serving.ARROW_STREAM},
+    )
+    return pa.ipc.open_stream(response.content).read_all()["prediction"].to_numpy()
+
+
+def main():
+    """Time both endpoints for each batch size and print a summary table."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    cli_args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = tm.serving.ModelService(make_registry(tmp_dir))
+        with TestClient(tm.serving.create_app(service)) as client:
+            for n_rows in cli_args.rows:
+                records = make_records(n_rows)
+                for name, post in (("json", post_json), ("arrow", post_arrow)):
+                    timings = []
+                    for _ in range(cli_args.repeat):
+                        start = time.perf_counter()
+                        ypred = post(client, records)
+                        timings.append(time.perf_counter() - start)
+                    assert len(ypred) == n_rows
+
+                    results.append(
+                        {
+                            "rows": n_rows,
+                            "format": name,
+                            "best_s": min(timings),
+                            "rows_s": n_rows / min(timings),
+                        }
+                    )
+
+    print(pd.DataFrame(results).round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Pipeline to score a large file of listings with the saved model artefacts."""
+
+import logging
+from pathlib import Path
+
+import hydra
+
+import train_model as tm
+
+logger = logging.getLogger(__name__)
+
+
+def run(args):
+    """Score cleaned listings in chunks across a process pool."""
+    batch_args = args.batch_predict
+    input_path = Path(args.data_folder, batch_args.input_file)
+    output_path = Path(args.data_folder, batch_args.output_file)
+
+    logger.info("Validating file path")
+    if not input_path.is_file():
+        err_msg = f"Input file {input_path} does not exist"
+        logger.error(err_msg)
+        raise FileNotFoundError(err_msg)
+
+    logger.info(f"Scoring {input_path} with {batch_args.n_workers} workers")
+    n_rows = tm.batch_scoring.score_file(
+        args,
+        input_path,
+        output_path,
+        chunk_size=batch_args.chunk_size,
+        n_workers=batch_args.n_workers,
+        id_columns=batch_args.id_columns,
+    )
+    logger.info(f"Predictions for {n_rows} rows saved to {output_path}")
+
+
+@hydra.main(config_path="../conf", config_name="process_data.yaml", version_base=None)
+def main(args):
+    """Main function to score cleaned listings in chunks across a process pool."""
+    run(args)
+
+
+if __name__ == "__main__":
+    # `--snapshot <path>` runs from a compiled config snapshot, skipping hydra
+    tm.config_snapshot.run_entry_point(run, main)
@@ -0,0 +1,29 @@
+"""Compile the config with overrides into a snapshot for `--snapshot` runs.
+
+Usage:
+    python src/compile_config.py snapshot.json [batch_predict.n_workers=8 ...]
+    python src/batch_predict.py --snapshot snapshot.json
+
+The config is read from `$TRAIN_MODEL_CONFIG_DIR`, else `./conf`.
+"""
+
+import logging
+import sys
+
+import train_model as tm
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv: list[str]):
+    """Main function to compose, validate and save the config snapshot."""
+    if not argv:
+        raise SystemExit(__doc__)
+
+    output_path, *overrides = argv
+    tm.config_snapshot.compile_snapshot(output_path, overrides)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main(sys.argv[1:])
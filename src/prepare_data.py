@@ -11,9 +11,8 @@ import train_model as tm
 logger = logging.getLogger(__name__)
 
 
-@hydra.main(config_path="../conf", config_name="process_data.yaml", version_base=None)
-def main(args):
-    """Main fuction to retrieve and process initial raw data."""
+def run(args):
+    """Retrieve and process initial raw data."""
     logger.info("Validating file path")
     if not Path(args.data_folder).is_dir():
         err_msg = f"Data path {args.data_folder} does not exist"
@@ -27,22 +26,43 @@ def main(args):
     # TODO: to make this a potential abstract class for various dataset
     logger.info("Retrieving data")
     if not cleaned_data_path.is_file():
-        hdb_data = tm.retrieve_data.get_multiple_offset_response(args.api_entry_call)
+        landing_zone = tm.retrieve_data.LandingZone(args.landing_folder)
+        if args.replay:
+            hdb_data = tm.retrieve_data.replay_landing_zone(landing_zone)
+        else:
+            hdb_data = tm.retrieve_data.get_multiple_offset_response(
+                args.api_entry_call, landing_zone=landing_zone
+            )
 
-        logger.info(f"Saving data to {raw_data_path}")
+        logger.info(f"Upserting data into {raw_data_path}")
         data = pd.DataFrame([d.model_dump() for d in hdb_data])
-        data.to_csv(raw_data_path, index=False)
-    else:
-        data = pd.read_csv(raw_data_path)
+        tm.key_index.ingest(raw_data_path, data, on_duplicate=args.on_duplicate)
+
+    data = tm.key_index.read_current(raw_data_path)
 
     logger.info("Processing / Cleaning data")
     cleaner = tm.data_cleaner.HdbDataCleaner()
     cleaned_data = cleaner.clean_data(data)
 
+    logger.info("Validating cleaned data")
+    validator = tm.data_validator.HdbDataValidator(args.validate)
+    report = validator.validate(cleaned_data)
+    if args.validate.fail_on_error and not report["passed"].all():
+        err_msg = f"Cleaned data failed validation\n{report[~report['passed']]}"
+        logger.error(err_msg)
+        raise ValueError(err_msg)
+
     # TODO: add save_data function into the cleaner
     logger.info(f"Data cleaned and saved to {cleaned_data_path}")
     cleaned_data.to_csv(cleaned_data_path, index=False)
 
 
+@hydra.main(config_path="../conf", config_name="process_data.yaml", version_base=None)
+def main(args):
+    """Main fuction to retrieve and process initial raw data."""
+    run(args)
+
+
 if __name__ == "__main__":
-    main()
+    # `--snapshot <path>` runs from a compiled config snapshot, skipping hydra
+    tm.config_snapshot.run_entry_point(run, main)
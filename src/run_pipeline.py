@@ -0,0 +1,47 @@
+"""Run the training pipeline DAG declared in the pipeline config.
+
+Usage:
+    python src/run_pipeline.py [--dry-run] [pipeline.force=[train_linear]]
+    python src/run_pipeline.py --snapshot snapshot.json
+"""
+
+import logging
+import sys
+from functools import partial
+
+import hydra
+
+import train_model as tm
+
+logger = logging.getLogger(__name__)
+
+
+def run(args, dry_run: bool = False):
+    """Run stale pipeline stages, only plan them if dry_run or configured to."""
+    pipeline_args = args.pipeline
+    dry_run = dry_run or pipeline_args.dry_run
+    pipeline = tm.pipeline.Pipeline.from_config(pipeline_args.stages)
+    stages = pipeline.run(
+        args,
+        n_jobs=pipeline_args.n_jobs,
+        force=pipeline_args.force,
+        dry_run=dry_run,
+    )
+    logger.info(f"{'Would run' if dry_run else 'Ran'} stages {stages}")
+
+
+@hydra.main(config_path="../conf", config_name="process_data.yaml", version_base=None)
+def main(args):
+    """Main function to run stale pipeline stages."""
+    run(args)
+
+
+if __name__ == "__main__":
+    # `--dry-run` is shorthand for the hydra override pipeline.dry_run=true
+    dry_run = "--dry-run" in sys.argv
+    if dry_run:
+        sys.argv.remove("--dry-run")
+        if tm.config_snapshot.SNAPSHOT_ARG not in sys.argv:
+            sys.argv.append("pipeline.dry_run=true")
+    # `--snapshot <path>` runs from a compiled config snapshot, skipping hydra
+    tm.config_snapshot.run_entry_point(partial(run, dry_run=dry_run), main)
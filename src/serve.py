@@ -0,0 +1,42 @@
+"""Serve predictions from the model registry, new versions are swapped in live."""
+
+import logging
+
+import hydra
+import uvicorn
+
+import train_model as tm
+
+logger = logging.getLogger(__name__)
+
+
+def run(args):
+    """Serve the current registry version over http."""
+    serve_args = args.serve
+    registry = tm.registry.ModelRegistry(serve_args.registry_folder)
+    service = tm.serving.ModelService(
+        registry,
+        poll_interval=serve_args.poll_interval,
+        cache_size=serve_args.cache_size,
+        cache_ttl=serve_args.cache_ttl,
+        warmup_data=tm.serving.read_warmup_data(
+            serve_args.get("warmup_file"), serve_args.get("warmup_rows", 100)
+        ),
+        drift_interval=serve_args.get("drift_interval"),
+    )
+
+    logger.info(f"Serving {registry.current_version()} from {registry.root}")
+    uvicorn.run(
+        tm.serving.create_app(service), host=serve_args.host, port=serve_args.port
+    )
+
+
+@hydra.main(config_path="../conf", config_name="process_data.yaml", version_base=None)
+def main(args):
+    """Main function to serve the current registry version over http."""
+    run(args)
+
+
+if __name__ == "__main__":
+    # `--snapshot <path>` runs from a compiled config snapshot, skipping hydra
+    tm.config_snapshot.run_entry_point(run, main)
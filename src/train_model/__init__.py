@@ -1,21 +1,69 @@
-"""Init file for ml module."""
-
-from . import (
-    data_cleaner,
-    data_model,
-    data_preprocessor,
-    evaluator,
-    models,
-    retrieve_data,
-    utils,
-)
+"""Init file for ml module.
+
+Submodules are imported on first access, so an entry point only pays for the
+modules it uses, e.g. a snapshot run does not import serving or sklearn up front.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import (
+        batch_scoring,
+        config_snapshot,
+        data_cleaner,
+        data_model,
+        data_preprocessor,
+        data_validator,
+        drift,
+        encoders,
+        evaluator,
+        feature_matrix,
+        feature_store,
+        key_index,
+        models,
+        pipeline,
+        prediction_cache,
+        registry,
+        retrieve_data,
+        sampler,
+        serving,
+        stages,
+        utils,
+    )
 
 __all__ = [
+    "batch_scoring",
+    "config_snapshot",
     "data_cleaner",
     "data_model",
     "data_preprocessor",
+    "data_validator",
+    "drift",
+    "encoders",
     "evaluator",
+    "feature_matrix",
+    "feature_store",
+    "key_index",
     "models",
+    "pipeline",
+    "prediction_cache",
+    "registry",
     "retrieve_data",
+    "sampler",
+    "serving",
+    "stages",
     "utils",
 ]
+
+
+def __getattr__(name: str):
+    """Import a submodule on first access."""
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    """Submodules of the package."""
+    return __all__
@@ -0,0 +1,196 @@
+"""Module for chunked and parallel batch scoring of large files."""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import omegaconf
+import pandas as pd
+
+from . import data_preprocessor, registry
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_COL = "prediction"
+
+# artefacts loaded once per worker process by `_init_worker`
+_WORKER_ARTEFACTS = {}
+
+
+def load_artefacts(args: omegaconf.DictConfig) -> tuple:
+    """Load the fitted preprocessor and predictor of `batch_predict.model_folder`.
+
+    The folder is a model bundle, e.g. a model of the training pipeline or a
+    version of the model registry, see `registry.save_bundle`.
+    """
+    bundle = registry.load_bundle(args.batch_predict.model_folder)
+    return bundle.preprocessor, bundle.predictor
+
+
+def score_chunk(
+    chunk: pd.DataFrame,
+    preprocessor: data_preprocessor.HdbDataPreprocessor,
+    predictor,
+    buffer: np.ndarray | None = None,
+) -> np.ndarray:
+    """Feature engineer, transform and predict a single chunk of cleaned data.
+
+    The transformed features are written into `buffer` if provided, which must have
+    at least as many rows as the chunk.
+    """
+    chunk = preprocessor.feature_engineer(chunk)
+    out = None if buffer is None else buffer[: len(chunk)]
+    features = preprocessor.transform_data(chunk, out=out)
+
+    return predictor.predict(features)
+
+
+def allocate_buffer(
+    preprocessor: data_preprocessor.HdbDataPreprocessor, n_rows: int
+) -> np.ndarray:
+    """Allocate a feature buffer reused by `score_chunk` across chunks."""
+    n_features = len(preprocessor.get_feature_names_out())
+    return np.empty((n_rows, n_features), dtype=preprocessor.dtype)
+
+
+def _init_worker(args: omegaconf.DictConfig, chunk_size: int) -> None:
+    """Load the artefacts and allocate the feature buffer once per worker."""
+    preprocessor, predictor = load_artefacts(args)
+    _WORKER_ARTEFACTS["preprocessor"] = preprocessor
+    _WORKER_ARTEFACTS["predictor"] = predictor
+    _WORKER_ARTEFACTS["buffer"] = allocate_buffer(preprocessor, chunk_size)
+
+
+def _score_chunk_in_worker(chunk: pd.DataFrame) -> np.ndarray:
+    """Score a chunk with the artefacts loaded by `_init_worker`."""
+    return score_chunk(
+        chunk,
+        _WORKER_ARTEFACTS["preprocessor"],
+        _WORKER_ARTEFACTS["predictor"],
+        buffer=_WORKER_ARTEFACTS["buffer"],
+    )
+
+
+class PredictionWriter:
+    """Append predictions chunk by chunk to a parquet or csv file.
+
+    Parquet output requires the optional `pyarrow` dependency.
+    """
+
+    def __init__(self, output_path: str | Path) -> None:
+        """Initialize writer, file format is taken from the file suffix."""
+        if isinstance(output_path, str):
+            output_path = Path(output_path)
+
+        self.output_path = output_path
+        self._parquet_writer = None
+        self._csv_header = True
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        """Append a chunk of predictions to the output file."""
+        if self.output_path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            mode = "w" if self._csv_header else "a"
+            chunk.to_csv(
+                self.output_path, mode=mode, header=self._csv_header, index=False
+            )
+            self._csv_header = False
+
+    def close(self) -> None:
+        """Close the underlying parquet writer if any."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+def score_file(
+    args: omegaconf.DictConfig,
+    input_path: str | Path,
+    output_path: str | Path,
+    chunk_size: int = 50_000,
+    n_workers: int = 0,
+    id_columns: list[str] | None = None,
+) -> int:
+    """Score a csv file of cleaned listings in chunks, in parallel if required.
+
+    At most `2 * n_workers` chunks are in flight at any time so memory stays bounded
+    regardless of input size. Predictions are written in input order.
+
+    Args:
+        args (omegaconf.DictConfig): Config with preprocess, model and model_folder.
+        input_path (str | Path): Csv file of cleaned data to score.
+        output_path (str | Path): Output file, `.parquet` or `.csv`.
+        chunk_size (int, optional): Rows read per chunk. Defaults to 50_000.
+        n_workers (int, optional): Worker processes, 0 scores in the current process.
+        id_columns (list[str], optional): Input columns copied to the output.
+
+    Returns:
+        int: Number of rows scored.
+    """
+    id_columns = list(id_columns or [])
+    chunks = pd.read_csv(input_path, chunksize=chunk_size)
+    writer = PredictionWriter(output_path)
+
+    n_rows = 0
+    start_time = time.perf_counter()
+
+    try:
+        predictions = _iter_predictions(args, chunks, id_columns, chunk_size, n_workers)
+        for result, ypred in predictions:
+            result = result.reset_index(drop=True)
+            result[PREDICTION_COL] = ypred
+            writer.write(result)
+
+            n_rows += len(result)
+            elapsed = time.perf_counter() - start_time
+            logger.info(f"Scored {n_rows} rows, {n_rows / elapsed:,.0f} rows/s")
+    finally:
+        writer.close()
+
+    return n_rows
+
+
+def _iter_predictions(
+    args: omegaconf.DictConfig,
+    chunks: Iterator[pd.DataFrame],
+    id_columns: list[str],
+    chunk_size: int,
+    n_workers: int,
+) -> Iterator[tuple[pd.DataFrame, np.ndarray]]:
+    """Yield (id columns of chunk, prediction) in input order."""
+    if n_workers == 0:
+        preprocessor, predictor = load_artefacts(args)
+        buffer = allocate_buffer(preprocessor, chunk_size)
+        for chunk in chunks:
+            ypred = score_chunk(chunk, preprocessor, predictor, buffer=buffer)
+            yield chunk[id_columns], ypred
+        return
+
+    max_pending = 2 * n_workers
+    pending = deque()
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=_init_worker,
+        initargs=(args, chunk_size),
+    ) as executor:
+        for chunk in chunks:
+            if len(pending) >= max_pending:
+                ids, future = pending.popleft()
+                yield ids, future.result()
+            future = executor.submit(_score_chunk_in_worker, chunk)
+            pending.append((chunk[id_columns], future))
+
+        while pending:
+            ids, future = pending.popleft()
+            yield ids, future.result()
@@ -0,0 +1,210 @@
+"""Module to compile the hydra config once into a frozen, validated snapshot.
+
+Entry points normally compose `conf/process_data.yaml` through `hydra.main` on
+every run. A snapshot is the composed and resolved config, typed against the
+`Config` schema and saved as json, so later jobs load it directly without
+config search, composition, logging setup or output directories.
+"""
+
+import json
+import logging
+import os
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import omegaconf
+
+logger = logging.getLogger(__name__)
+
+# the conf folder is not packaged, it is found relative to the working directory
+CONFIG_DIR_ENV = "TRAIN_MODEL_CONFIG_DIR"
+CONFIG_DIR = Path(os.environ.get(CONFIG_DIR_ENV, "conf"))
+CONFIG_NAME = "process_data"
+SNAPSHOT_ARG = "--snapshot"
+
+
+@dataclass
+class ModelConfig:
+    """Schema of the `model` config."""
+
+    predictor_path: str = omegaconf.MISSING
+    model_object: str = omegaconf.MISSING
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BatchPredictConfig:
+    """Schema of the `batch_predict` config."""
+
+    model_folder: str = omegaconf.MISSING
+    input_file: str = omegaconf.MISSING
+    output_file: str = omegaconf.MISSING
+    chunk_size: int = 50_000
+    n_workers: int = 0
+    id_columns: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ServeConfig:
+    """Schema of the `serve` config."""
+
+    registry_folder: str = omegaconf.MISSING
+    poll_interval: float = 5.0
+    warmup_file: str | None = None
+    warmup_rows: int = 100
+    cache_size: int = 0
+    cache_ttl: float | None = None
+    drift_interval: float | None = None
+    host: str = "0.0.0.0"
+    port: int = 8000
+
+
+@dataclass
+class SampleConfig:
+    """Schema of the `sample` config."""
+
+    n_rows: int | None = None
+    strata: list[str] = field(default_factory=lambda: ["town", "flat_type", "year"])
+    seed: int = 0
+    chunk_size: int = 100_000
+
+
+@dataclass
+class PipelineConfig:
+    """Schema of the `pipeline` config."""
+
+    n_jobs: int = 1
+    dry_run: bool = False
+    force: list[str] = field(default_factory=list)
+    stages: dict[str, Any] = field(default_factory=dict)
+    metrics: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Config:
+    """Schema of `conf/process_data.yaml`."""
+
+    data_folder: str = omegaconf.MISSING
+    model_folder: str = omegaconf.MISSING
+    raw_file: str = omegaconf.MISSING
+    cleaned_file: str = omegaconf.MISSING
+    api_entry_call: int = 500
+    landing_folder: str = omegaconf.MISSING
+    replay: bool = False
+    on_duplicate: str = "upsert"
+    precision: str = "float64"
+    validate: dict[str, Any] = field(default_factory=dict)
+    preprocess: dict[str, Any] = field(default_factory=dict)
+    drift_columns: list[str] | None = None
+    sample: SampleConfig = field(default_factory=SampleConfig)
+    model: ModelConfig = field(default_factory=ModelConfig)
+    batch_predict: BatchPredictConfig = field(default_factory=BatchPredictConfig)
+    serve: ServeConfig = field(default_factory=ServeConfig)
+    pipeline: PipelineConfig = field(default_factory=PipelineConfig)
+
+
+def validate_config(config: omegaconf.DictConfig) -> omegaconf.DictConfig:
+    """Type a resolved config against the `Config` schema and check option values.
+
+    Raises:
+        omegaconf.ValidationError: a value does not match its schema type.
+        omegaconf.MissingMandatoryValue: a required value is not set.
+        ValueError: an option is not one of its expected values.
+    """
+    from .data_preprocessor import PRECISION
+    from .key_index import ON_DUPLICATE
+
+    typed = omegaconf.OmegaConf.merge(omegaconf.OmegaConf.structured(Config), config)
+    missing = omegaconf.OmegaConf.missing_keys(typed)
+    if missing:
+        raise omegaconf.MissingMandatoryValue(
+            f"Missing config values {sorted(missing)}"
+        )
+
+    if typed.precision not in PRECISION:
+        raise ValueError(
+            f"{typed.precision} precision is not implemented, "
+            f"expected one of {list(PRECISION)}."
+        )
+    if typed.on_duplicate not in ON_DUPLICATE:
+        raise ValueError(
+            f"{typed.on_duplicate} is not implemented, expected one of {ON_DUPLICATE}."
+        )
+    return typed
+
+
+def compile_snapshot(
+    output_path: str | Path,
+    overrides: list[str] | None = None,
+    config_dir: str | Path = CONFIG_DIR,
+    config_name: str = CONFIG_NAME,
+) -> omegaconf.DictConfig:
+    """Compose, resolve and validate the config with overrides, save it as json.
+
+    Overrides use the hydra command line syntax, e.g. `batch_predict.n_workers=8`.
+    The config folder defaults to `$TRAIN_MODEL_CONFIG_DIR`, else `./conf`.
+    """
+    from hydra import compose, initialize_config_dir
+
+    with initialize_config_dir(
+        config_dir=str(Path(config_dir).resolve()), version_base=None
+    ):
+        config = compose(config_name=config_name, overrides=list(overrides or []))
+
+    config = validate_config(config)
+    container = omegaconf.OmegaConf.to_container(config, resolve=True)
+    with open(output_path, "w") as f:
+        json.dump(container, f, indent=2)
+
+    logger.info(f"Config snapshot with overrides {overrides} saved to {output_path}")
+    return load_snapshot(output_path)
+
+
+def load_snapshot(snapshot_path: str | Path) -> omegaconf.DictConfig:
+    """Load a compiled snapshot as a read-only config, no composition or validation.
+
+    The snapshot was validated when compiled, it is only frozen here so a job
+    cannot diverge from the config it was compiled from.
+    """
+    with open(snapshot_path) as f:
+        config = omegaconf.OmegaConf.create(json.load(f))
+
+    omegaconf.OmegaConf.set_readonly(config, True)
+    omegaconf.OmegaConf.set_struct(config, True)
+    return config
+
+
+def run_entry_point(
+    run: Callable[[omegaconf.DictConfig], Any],
+    hydra_main: Callable[[], Any],
+    argv: list[str] | None = None,
+) -> Any:
+    """Run an entry point from `--snapshot <path>` if given, else through hydra.
+
+    A snapshot is frozen, so other command line overrides are rejected instead of
+    silently ignored. Snapshot runs log to stderr with a plain handler instead of
+    the hydra logging config.
+    """
+    argv = sys.argv if argv is None else argv
+    if SNAPSHOT_ARG not in argv:
+        return hydra_main()
+
+    position = argv.index(SNAPSHOT_ARG)
+    if position + 1 >= len(argv):
+        raise ValueError(f"{SNAPSHOT_ARG} expects the path of a compiled snapshot.")
+
+    snapshot_path = argv[position + 1]
+    overrides = argv[1:position] + argv[position + 2 :]
+    if overrides:
+        raise ValueError(
+            f"Overrides {overrides} are not applied to a snapshot, "
+            "compile a new snapshot with them."
+        )
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s][%(name)s][%(levelname)s] - %(message)s",
+    )
+    return run(load_snapshot(snapshot_path))
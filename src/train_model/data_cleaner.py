@@ -1,17 +1,83 @@
 """Module for data cleaning and feature engineering."""
 
 import logging
+import re
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 
+import numpy as np
 import omegaconf
 import pandas as pd
 
 from . import data_model
+from .utils.utils import with_columns
 
 logger = logging.getLogger(__name__)
 
 COL = data_model.ColumnEnum
 
+# "61 years 04 months", "61 years", "61" or "61.5" (years), case insensitive
+LEASE_PATTERN = (
+    r"^\s*(?P<years>\d+(?:\.\d+)?)\s*(?:years?)?"
+    r"(?:\s*(?P<months>\d+)\s*months?)?\s*$"
+)
+MONTH_PATTERN = r"^\s*(?P<year>\d{4})-(?P<month>\d{1,2})\s*$"
+
+
+def parse_unique(
+    values: pd.Series, parser: Callable[[pd.Series], pd.DataFrame]
+) -> pd.DataFrame:
+    """Parse only the distinct values of a column and map results back to rows.
+
+    Columns like month and remaining_lease have a few hundred distinct strings
+    over millions of rows, so parsing cost depends on the number of distinct
+    values instead of rows. Missing values map to missing results, rows whose
+    value could not be parsed are counted in a warning.
+
+    Args:
+        values (pd.Series): Column to parse.
+        parser (Callable[[pd.Series], pd.DataFrame]): Vectorized parser of the
+            distinct values as strings, one output column per parsed field and
+            missing fields if a value could not be parsed.
+
+    Returns:
+        pd.DataFrame: Parsed fields aligned with values, dtypes of the parser.
+    """
+    codes, uniques = pd.factorize(values)
+    parsed = parser(pd.Series(uniques.astype(str)))
+
+    failed = parsed.isna().any(axis=1).to_numpy()
+    if failed.any():
+        n_failed = np.bincount(codes[codes >= 0], minlength=len(uniques))[failed].sum()
+        logger.warning(f"{n_failed} {values.name} values could not be parsed.")
+
+    return pd.DataFrame(
+        {col: parsed[col].array.take(codes, allow_fill=True) for col in parsed},
+        index=values.index,
+    )
+
+
+def _parse_lease(uniques: pd.Series) -> pd.DataFrame:
+    """Months of lease remaining of distinct remaining_lease strings."""
+    parts = uniques.str.extract(LEASE_PATTERN, flags=re.IGNORECASE)
+    years = parts["years"].astype(np.float64)
+    months = parts["months"].astype(np.float64).fillna(0)
+    return pd.DataFrame({"months": (years * 12).round() + months})
+
+
+def _parse_storey_range(uniques: pd.Series) -> pd.DataFrame:
+    """Lower and upper storey of distinct "01 TO 03" strings, as strings."""
+    parts = uniques.str.split(" TO ", n=1, expand=True)
+    return pd.DataFrame({"from": parts[0], "to": parts.get(1)})
+
+
+def _parse_month(uniques: pd.Series) -> pd.DataFrame:
+    """Year, month and month period of distinct "YYYY-MM" strings."""
+    parts = uniques.str.extract(MONTH_PATTERN).astype("Int64")
+    parts[~parts["month"].between(1, 12).fillna(False)] = pd.NA
+    parts["period"] = parts["year"] * 12 + parts["month"] - 1
+    return parts
+
 
 class DataCleaner(ABC):
     """For cleaning data into required format."""
@@ -37,6 +103,9 @@ class HdbDataCleaner(DataCleaner):
     def clean_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Main method to clean the data for saving.
 
+        Every step returns a new dataframe with its new columns, the input is never
+        changed and unchanged columns are shared with it, not copied.
+
         Args:
             data (pd.DataFrame): Input data as dataframe
 
@@ -44,6 +113,10 @@ class HdbDataCleaner(DataCleaner):
             pd.DataFrame: Cleaned data as dataframe
         """
         data = self._normalize_storey_range(data)
+        if COL.remaining_lease in data.columns:
+            data = self._parse_remaining_lease(data)
+        if COL.month in data.columns:
+            data = self._parse_month(data)
 
         return data
 
@@ -58,9 +131,49 @@ class HdbDataCleaner(DataCleaner):
             data (pd.DataFrame): Input data with required storey range.
 
         Returns:
-            _type_: Resultant data with new columns.
+            pd.DataFrame: Resultant data with new columns.
         """
-        data[COL.storey_from] = data[COL.storey_range].str.split(" TO ", expand=True)[0]
-        data[COL.storey_to] = data[COL.storey_range].str.split(" TO ", expand=True)[1]
+        storeys = parse_unique(data[COL.storey_range], _parse_storey_range)
+        return with_columns(
+            data, {COL.storey_from: storeys["from"], COL.storey_to: storeys["to"]}
+        )
 
-        return data
+    def _parse_remaining_lease(self, data: pd.DataFrame):
+        """Method to parse remaining lease into numeric months and years.
+
+        Accepts years as numbers or text such as "61 years 04 months". Adds
+        remaining_lease_months, and remaining_lease becomes years as a float so
+        existing features in years keep working. Unparseable values are missing.
+
+        Args:
+            data (pd.DataFrame): Input data with remaining lease.
+
+        Returns:
+            pd.DataFrame: Resultant data with parsed columns.
+        """
+        months = parse_unique(data[COL.remaining_lease], _parse_lease)["months"]
+        return with_columns(
+            data, {COL.remaining_lease_months: months, COL.remaining_lease: months / 12}
+        )
+
+    def _parse_month(self, data: pd.DataFrame):
+        """Method to parse "YYYY-MM" month into integer year, month and period.
+
+        month_period counts months since year 0, so differences are month gaps.
+        Unparseable values are missing.
+
+        Args:
+            data (pd.DataFrame): Input data with month.
+
+        Returns:
+            pd.DataFrame: Resultant data with new columns.
+        """
+        parsed = parse_unique(data[COL.month], _parse_month)
+        return with_columns(
+            data,
+            {
+                COL.year: parsed["year"],
+                COL.month_of_year: parsed["month"],
+                COL.month_period: parsed["period"],
+            },
+        )
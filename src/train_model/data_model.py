@@ -2,13 +2,14 @@
 
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ColumnEnum(str, Enum):
     """Setting enums for column names."""
 
     # initial columns
+    record_id = "record_id"
     month = "month"
     town = "town"
     resale_price = "resale_price"
@@ -21,16 +22,19 @@ class ColumnEnum(str, Enum):
     # cleaned column
     storey_from = "storey_from"
     storey_to = "storey_to"
+    remaining_lease_months = "remaining_lease_months"
+    year = "year"
+    month_of_year = "month_of_year"
+    month_period = "month_period"
 
     # feature engineered column
     storey_area_ratio = "storey_area_ratio"
     lease_less_than_50_yrs = "lease_less_than_50_yrs"
 
 
-class HDBData(BaseModel):
-    """Expected data types from API call."""
+class HDBFeatureData(BaseModel):
+    """Expected data types of a record to predict."""
 
-    _id: int
     month: str
     town: str
     flat_type: str
@@ -40,5 +44,17 @@ class HDBData(BaseModel):
     floor_area_sqm: float
     flat_model: str
     lease_commence_date: int
-    remaining_lease: int
+    # years as a number, or text from the live api, e.g. "61 years 04 months"
+    remaining_lease: int | str
+
+
+class HDBData(HDBFeatureData):
+    """Expected data types from API call.
+
+    The api record key `_id` is kept as `record_id`, the primary key of stored data.
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    record_id: int = Field(alias="_id")
     resale_price: float
@@ -2,21 +2,47 @@
 
 import logging
 from abc import ABC, abstractmethod
+from functools import partial
 from pathlib import Path
 
 import numpy as np
 import omegaconf
 import pandas as pd
 import scipy.sparse
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
 
 from . import data_model, utils
+from .drift import REFERENCE_FILE, DriftReference
+from .encoders import HashingEncoder, MeanTargetEncoder
+from .utils.utils import with_columns
 
 logger = logging.getLogger(__name__)
 COL = data_model.ColumnEnum
 
 
-PREPROCESSOR = {"standardscaler": StandardScaler, "onehotencoder": OneHotEncoder}
+PREPROCESSOR = {
+    "standardscaler": StandardScaler,
+    "onehotencoder": OneHotEncoder,
+    # integer codes for native categorical support of tree models, unknown values
+    # are missing and rare values beyond 255 categories share a single code
+    "ordinalencoder": partial(
+        OrdinalEncoder,
+        handle_unknown="use_encoded_value",
+        unknown_value=np.nan,
+        max_categories=255,
+    ),
+    # fixed width encodings of high cardinality columns, e.g. street_name, block
+    "hashingencoder": HashingEncoder,
+    "meantargetencoder": MeanTargetEncoder,
+}
+# preprocessors outputting 0 / 1 indicators, fitted to output uint8 below float64
+INDICATOR_PREPROCESSORS = ["onehotencoder"]
+PRECISION = {"float64": np.float64, "float32": np.float32}
+# precision of preprocessors and predictors unless set by the `precision` config
+DEFAULT_PRECISION = "float64"
+
+# bump when `HdbDataPreprocessor.feature_engineer` output changes
+FEATURE_VERSION = 1
 
 
 class DataPreprocessor(ABC):
@@ -37,11 +63,25 @@ class HdbDataPreprocessor(DataPreprocessor):
     """For feature engineering and additional preprocessing."""
 
     def __init__(
-        self, params: omegaconf.DictConfig, object_filepath: str | Path
+        self,
+        params: omegaconf.DictConfig,
+        object_filepath: str | Path,
+        precision: str = DEFAULT_PRECISION,
+        drift_columns: list[str] | None = None,
     ) -> None:
-        """Initialize data preprocessor."""
+        """Initialize data preprocessor.
+
+        precision sets the dtype of the transformed feature matrix, with "float32"
+        indicator preprocessors (e.g. onehotencoder) are fitted to output uint8.
+
+        drift_columns present in the fit data are sketched as the reference for
+        `drift.DriftMonitor`, defaults to the columns of all preprocessors.
+        """
         self.params = params
         self.object_filepath = object_filepath
+        self.precision = precision
+        self.drift_columns = drift_columns
+        self.drift_reference: DriftReference | None = None
         self._preprocessors = []
         self._validate_params()
 
@@ -56,6 +96,13 @@ class HdbDataPreprocessor(DataPreprocessor):
                     f"{key} is either not implemented or check spelling."
                 )
 
+        if PRECISION.get(self.precision) is None:
+            raise NotImplementedError(
+                f"{self.precision} precision is not implemented, "
+                f"expected one of {list(PRECISION)}."
+            )
+        self.dtype = PRECISION[self.precision]
+
         if isinstance(self.object_filepath, str):
             logger.debug(f"Converting {self.object_filepath} in to Path object.")
             self.object_filepath = Path(self.object_filepath)
@@ -70,62 +117,153 @@ class HdbDataPreprocessor(DataPreprocessor):
             logger.info("Resetting preprocessors data to fit.")
             self._preprocessors = []
 
+        # target is passed to every fit, preprocessors not using it ignore it
+        y = data[COL.resale_price] if COL.resale_price in data.columns else None
+
         for key in self.params:
-            preprocessor = PREPROCESSOR.get(key)()
+            preprocessor = PREPROCESSOR.get(key)(**self.params[key].get("params", {}))
+            if self.dtype != np.float64 and key in INDICATOR_PREPROCESSORS:
+                preprocessor.set_params(dtype=np.uint8)
             preprocess_data = data[self.params[key]["columns"]]
-            preprocessor.fit(preprocess_data)
+            preprocessor.fit(preprocess_data, y)
             self._preprocessors.append(preprocessor)
 
+        drift_columns = self.drift_columns or [
+            col for key in self.params for col in self.params[key]["columns"]
+        ]
+        drift_columns = [col for col in dict.fromkeys(drift_columns) if col in data]
+        self.drift_reference = DriftReference.from_data(data[drift_columns])
+
         self._save_preprocessors()
         return None
 
     def _save_preprocessors(self):
         """Save preprocessors after fitting it."""
-        for p in self._preprocessors:
+        for p_name, p in zip(self.params, self._preprocessors):
             logger.debug(f"Saving preprocessor {p} into {self.object_filepath} folder.")
-            p_name = p.__class__.__name__.lower()
             p_file_path = Path(self.object_filepath, p_name)
             utils.utils.save_object(p, p_file_path)
 
-    def transform_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        if self.drift_reference is not None:
+            self.drift_reference.save(self.object_filepath)
+
+    def load_preprocessors(self) -> None:
+        """Load fitted preprocessors saved in object_filepath."""
+        logger.info(f"Loading preprocesors from {self.object_filepath}")
+        self._preprocessors = []
+
+        for key in self.params:
+            p_file_path = Path(self.object_filepath, key + ".pkl")
+            preprocessor = utils.utils.load_object(p_file_path)
+            self._preprocessors.append(preprocessor)
+
+        if Path(self.object_filepath, REFERENCE_FILE).is_file():
+            self.drift_reference = DriftReference.load(self.object_filepath)
+
+    def get_feature_names_out(self) -> np.ndarray:
+        """Output feature names of the fitted preprocessors in transform order."""
+        if not self._preprocessors:
+            logger.info(f"Preprocessor attribute is empty {self._preprocessors=}.")
+            self.load_preprocessors()
+
+        return np.concatenate([p.get_feature_names_out() for p in self._preprocessors])
+
+    def get_feature_origins(self) -> np.ndarray:
+        """Input column of each output feature in transform order.
+
+        Read from each preprocessor's output names, which are an input column or
+        prefixed by it, e.g. one-hot columns including dropped or infrequent
+        categories. Other outputs mixing several columns (e.g. hashingencoder) map
+        to the columns joined by "+".
+        """
+        if not self._preprocessors:
+            self.load_preprocessors()
+
+        origins = []
+        for p_name, p in zip(self.params, self._preprocessors):
+            columns = list(self.params[p_name]["columns"])
+            # longest first, so a column prefixing another keeps its own outputs
+            candidates = sorted(columns, key=len, reverse=True)
+            for name in p.get_feature_names_out():
+                origin = next(
+                    (c for c in candidates if name == c or name.startswith(f"{c}_")),
+                    "+".join(columns),
+                )
+                origins.append(origin)
+
+        return np.asarray(origins, dtype=object)
+
+    def aggregate_contributions(self, contributions: pd.DataFrame) -> pd.DataFrame:
+        """Sum per-feature contributions from `Predictor.explain` by input column.
+
+        Columns after the features, e.g. bias, are kept as they are.
+        """
+        origins = self.get_feature_origins()
+        codes, columns = pd.factorize(origins)
+        aggregation = scipy.sparse.csr_matrix(
+            (np.ones(len(codes)), (np.arange(len(codes)), codes)),
+            shape=(len(codes), len(columns)),
+        )
+        features = contributions.iloc[:, : len(origins)].to_numpy()
+        result = pd.DataFrame(
+            features @ aggregation, columns=columns, index=contributions.index
+        )
+        others = contributions.iloc[:, len(origins) :]
+        return pd.concat([result, others], axis=1)
+
+    def transform_data(
+        self, data: pd.DataFrame, out: np.ndarray | None = None, y=None
+    ) -> pd.DataFrame:
         """Uses fitted scaler to preprocessing / scaling .
 
         Load the preprocess for transform if self._preprocessors is empty.
         Uses exisiting self.preprocessors after fitted for transforming data.
-        """
-        scaled_data_array = []
-        scaled_data_names = []
 
-        if not self._preprocessors:
-            logger.info(f"Preprocessor attribute is empty {self._preprocessors=}.")
-            logger.info(f"Loading preprocesors from {self.object_filepath}")
+        The output matrix is allocated once and each preprocessor writes into its
+        own column slice. Pass `out` of shape (n_rows, n_features) to reuse a buffer
+        across batches, the returned dataframe is a view on `out`.
 
-            for key in self.params:
-                p_file_path = Path(self.object_filepath, key + ".pkl")
-                preprocessor = utils.utils.load_object(p_file_path)
-                self._preprocessors.append(preprocessor)
+        Pass the target `y` only when transforming the training data, target
+        encoders (e.g. meantargetencoder) then encode it out of fold.
+        """
+        feature_names = self.get_feature_names_out()
+        shape = (len(data), len(feature_names))
 
-        for p in self._preprocessors:
-            p_name = p.__class__.__name__.lower()
+        if out is None:
+            out = np.empty(shape, dtype=self.dtype)
+        elif out.shape != shape:
+            raise ValueError(f"Expected out buffer of shape {shape}, got {out.shape}.")
+
+        col_start = 0
+        for p_name, p in zip(self.params, self._preprocessors):
             logger.info(f"Transforming data with {p_name}")
             preprocess_data = data[self.params[p_name]["columns"]]
-            scaled_data = p.transform(preprocess_data)
+            if y is not None and hasattr(p, "cross_fit_transform"):
+                scaled_data = p.cross_fit_transform(preprocess_data, y)
+            else:
+                scaled_data = p.transform(preprocess_data)
+
+            col_end = col_start + scaled_data.shape[1]
+            out_slice = out[:, col_start:col_end]
 
             if scipy.sparse.issparse(scaled_data):
-                logger.debug(f"Converting sparse matrix from {p}")
-                scaled_data = scaled_data.toarray()
+                logger.debug(f"Scattering sparse matrix from {p} into output")
+                scaled_data = scaled_data.tocoo()
+                out_slice[:] = 0
+                out_slice[scaled_data.row, scaled_data.col] = scaled_data.data
+            else:
+                out_slice[:] = scaled_data
 
-            scaled_data_array.append(scaled_data)
-            scaled_data_names.append(p.get_feature_names_out())
+            col_start = col_end
 
-        df = pd.DataFrame(
-            np.concatenate(scaled_data_array, axis=1),
-            columns=np.concatenate(scaled_data_names),
-        )
+        df = pd.DataFrame(out, columns=feature_names, copy=False)
         return df
 
     def feature_engineer(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Main function to feature engineer data."""
+        """Main function to feature engineer data.
+
+        Returns a new dataframe with the engineered columns, data is not changed.
+        """
         data = self._fe_ratio_storey_to_floor_area(data)
         data = self._fe_lease_less_than_50_yrs(data)
 
@@ -137,14 +275,10 @@ class HdbDataPreprocessor(DataPreprocessor):
 
     def _fe_ratio_storey_to_floor_area(self, data: pd.DataFrame) -> pd.DataFrame:
         """Feature Engineer ratio of floor storey and sq area."""
-        data[COL.storey_area_ratio.name] = (
-            data[COL.floor_area_sqm] / data[COL.storey_to]
-        )
-
-        return data
+        ratio = data[COL.floor_area_sqm] / pd.to_numeric(data[COL.storey_to])
+        return with_columns(data, {COL.storey_area_ratio.name: ratio})
 
     def _fe_lease_less_than_50_yrs(self, data: pd.DataFrame) -> pd.DataFrame:
         """Feature Engineer for boolean lease if it is less than 50 years remaining."""
-        data[COL.lease_less_than_50_yrs.name] = data[COL.remaining_lease] < 50
-
-        return data
+        less_than_50 = data[COL.remaining_lease] < 50
+        return with_columns(data, {COL.lease_less_than_50_yrs.name: less_than_50})
@@ -0,0 +1,146 @@
+"""Module for column-wise data quality validation of cleaned data."""
+
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Iterable
+
+import numpy as np
+import omegaconf
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_CHECKS = ["ranges", "domains", "max_null_rate", "ordered", "unique_key"]
+
+
+def canonical_keys(data: pd.DataFrame) -> pd.DataFrame:
+    """Key columns as strings independent of the dtype a chunk was read with.
+
+    Numbers are written as float64 so 5, 5.0 and "5" match, missing values are empty.
+    """
+    keys = {}
+    for col in data.columns:
+        numeric = pd.to_numeric(data[col], errors="coerce").astype(np.float64)
+        text = data[col].astype(str).mask(data[col].isna(), "")
+        keys[col] = numeric.astype(str).where(numeric.notna(), text)
+
+    return pd.DataFrame(keys, index=data.index)
+
+
+class DataValidator(ABC):
+    """For validating data before being used by the pipeline."""
+
+    @abstractmethod
+    def validate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Main abstract method to validate data."""
+        ...
+
+
+class HdbDataValidator(DataValidator):
+    """Declarative validation of cleaned data using vectorized masks.
+
+    Checks are declared in params, every check is a boolean mask over a column so a
+    chunk is validated in a single vectorized pass.
+
+    Example params:
+        ranges:
+          floor_area_sqm: [20, 400]
+        domains:
+          flat_type: ["3 ROOM", "4 ROOM"]
+        max_null_rate:
+          town: 0.0
+        ordered:
+          - [storey_from, storey_to]
+        unique_key: [record_id]
+    """
+
+    def __init__(self, params: omegaconf.DictConfig) -> None:
+        """Initialize validator with the declared checks."""
+        self.params = params
+        self._validate_params()
+
+    def _validate_params(self):
+        """Check all declared checks are implemented."""
+        for key in self.params:
+            if key not in VALIDATION_CHECKS and key != "fail_on_error":
+                raise NotImplementedError(
+                    f"{key} is either not implemented or check spelling."
+                )
+
+    def validate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Validate a single dataframe, see `validate_chunks`."""
+        return self.validate_chunks([data])
+
+    def validate_chunks(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """Validate chunks of data and return a compact violation report.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Chunks of cleaned data.
+
+        Returns:
+            pd.DataFrame: One row per check and column with the violation count, rate
+                and if the check passed.
+        """
+        violations = defaultdict(int)
+        key_hashes = []
+        n_rows = 0
+
+        for chunk in chunks:
+            n_rows += len(chunk)
+            for check_col, n_violations in self._chunk_violations(chunk):
+                violations[check_col] += n_violations
+
+            if self.params.get("unique_key"):
+                key_data = canonical_keys(chunk[list(self.params.unique_key)])
+                key_hashes.append(
+                    pd.util.hash_pandas_object(key_data, index=False).to_numpy()
+                )
+
+        if self.params.get("unique_key"):
+            all_hashes = np.concatenate(key_hashes) if key_hashes else np.array([])
+            key_name = ",".join(self.params.unique_key)
+            violations[("unique_key", key_name)] = len(all_hashes) - len(
+                np.unique(all_hashes)
+            )
+
+        report = pd.DataFrame(
+            [(check, col, n, n_rows) for (check, col), n in violations.items()],
+            columns=["check", "column", "n_violations", "n_rows"],
+        )
+        report["violation_rate"] = report["n_violations"] / max(n_rows, 1)
+        report["passed"] = report["n_violations"] == 0
+
+        null_checks = report["check"] == "max_null_rate"
+        max_rates = report.loc[null_checks, "column"].map(
+            lambda col: self.params.max_null_rate[col]
+        )
+        report.loc[null_checks, "passed"] = (
+            report.loc[null_checks, "violation_rate"] <= max_rates
+        )
+
+        failed = report.loc[~report["passed"]]
+        if not failed.empty:
+            logger.warning(f"{len(failed)} data validation checks failed\n{failed}")
+
+        return report
+
+    def _chunk_violations(self, chunk: pd.DataFrame) -> Iterable[tuple[tuple, int]]:
+        """Yield ((check, column), violation count) for a single chunk."""
+        for col, (low, high) in self.params.get("ranges", {}).items():
+            values = pd.to_numeric(chunk[col], errors="coerce")
+            not_numeric = values.isna() & chunk[col].notna()
+            mask = (values < low) | (values > high) | not_numeric
+            yield ("ranges", col), int(mask.sum())
+
+        for col, allowed in self.params.get("domains", {}).items():
+            mask = ~chunk[col].isin(list(allowed)) & chunk[col].notna()
+            yield ("domains", col), int(mask.sum())
+
+        for col in self.params.get("max_null_rate", {}):
+            yield ("max_null_rate", col), int(chunk[col].isna().sum())
+
+        for low_col, high_col in self.params.get("ordered", []):
+            low = pd.to_numeric(chunk[low_col], errors="coerce")
+            high = pd.to_numeric(chunk[high_col], errors="coerce")
+            yield ("ordered", f"{low_col}<={high_col}"), int((low > high).sum())
@@ -0,0 +1,245 @@
+"""Module to monitor drift of scoring traffic against the training data."""
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_FILE = "drift_reference.json"
+# proportions are clipped so empty buckets do not make psi infinite
+EPSILON = 1e-4
+
+
+class DriftReference:
+    """Compact binned distributions of columns at fit time.
+
+    Numeric columns are binned on training quantiles, categorical columns keep the
+    most frequent categories and an "other" bucket. Every column has a last
+    bucket for missing values.
+    """
+
+    def __init__(self, columns: dict[str, dict], n_rows: int) -> None:
+        """Initialize reference from per column sketches, see `from_data`."""
+        self.columns = columns
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_data(
+        cls, data: pd.DataFrame, bins: int = 10, max_categories: int = 50
+    ) -> "DriftReference":
+        """Sketch reference distributions of all columns of data."""
+        columns = {}
+        for col in data.columns:
+            values = data[col]
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(
+                values
+            ):
+                quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+                edges = np.unique(np.nanquantile(values.to_numpy(float), quantiles))
+                sketch = {"kind": "numeric", "edges": edges.tolist()}
+            else:
+                top = values.value_counts().head(max_categories).index
+                sketch = {"kind": "categorical", "categories": [str(c) for c in top]}
+
+            columns[col] = sketch
+            counts = cls.bucket_counts(sketch, values)
+            sketch["proportions"] = (counts / max(counts.sum(), 1)).tolist()
+
+        return cls(columns, len(data))
+
+    @staticmethod
+    def bucket_counts(sketch: dict, values: pd.Series) -> np.ndarray:
+        """Count values per bucket of a column sketch, vectorized."""
+        is_missing = values.isna().to_numpy()
+        if sketch["kind"] == "numeric":
+            edges = np.asarray(sketch["edges"])
+            # values not parsing as numbers, e.g. unclean text, count as missing
+            numeric = pd.to_numeric(values, errors="coerce").to_numpy(float)
+            is_missing |= np.isnan(numeric)
+            bucket = np.searchsorted(edges, numeric, side="right")
+            n_buckets = len(edges) + 1
+        else:
+            categories = pd.Index(sketch["categories"])
+            bucket = categories.get_indexer(values.astype(str))
+            n_buckets = len(categories) + 1
+            bucket[bucket < 0] = len(categories)
+
+        bucket[is_missing] = n_buckets
+        return np.bincount(bucket, minlength=n_buckets + 1)
+
+    def scores(self, counts: dict[str, np.ndarray]) -> pd.DataFrame:
+        """PSI and KS of current bucket counts against the reference.
+
+        KS is the largest gap between binned cumulative distributions of non
+        missing values, numeric columns only.
+        """
+        rows = []
+        for col, sketch in self.columns.items():
+            current = counts.get(col)
+            if current is None or current.sum() == 0:
+                continue
+
+            expected = np.clip(sketch["proportions"], EPSILON, None)
+            actual = np.clip(current / current.sum(), EPSILON, None)
+            psi = np.sum((actual - expected) * np.log(actual / expected))
+
+            ks = np.nan
+            if sketch["kind"] == "numeric":
+                ref = np.asarray(sketch["proportions"][:-1])
+                cur = current[:-1]
+                if ref.sum() > 0 and cur.sum() > 0:
+                    ks = np.max(
+                        np.abs(np.cumsum(ref / ref.sum()) - np.cumsum(cur / cur.sum()))
+                    )
+
+            rows.append((col, psi, ks, int(current.sum())))
+
+        return pd.DataFrame(rows, columns=["column", "psi", "ks", "n_rows"])
+
+    def save(self, save_path: str | Path) -> None:
+        """Save reference as json into save_path folder."""
+        with open(Path(save_path, REFERENCE_FILE), "w") as f:
+            json.dump({"n_rows": self.n_rows, "columns": self.columns}, f)
+
+    @classmethod
+    def load(cls, load_path: str | Path) -> "DriftReference":
+        """Load reference saved by `save` from load_path folder."""
+        with open(Path(load_path, REFERENCE_FILE)) as f:
+            reference = json.load(f)
+        return cls(reference["columns"], reference["n_rows"])
+
+
+class DriftMonitor:
+    """Rolling drift scores of scoring traffic, computed off the predict path.
+
+    `observe` only puts the batch on a bounded queue, batches are dropped rather
+    than blocking if the queue is full. A background thread counts batches into
+    the current bucket and every `interval` seconds scores the last `n_windows`
+    buckets against the reference, logging columns with psi above `threshold`.
+
+    `prepare`, e.g. the cleaner, is applied to raw batches in the background thread
+    so they are compared in the same form as the fit data.
+    """
+
+    def __init__(
+        self,
+        reference: DriftReference,
+        interval: float = 60.0,
+        n_windows: int = 10,
+        threshold: float = 0.2,
+        max_queue: int = 1_000,
+        prepare: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+    ) -> None:
+        """Initialize monitor with the fit time reference."""
+        self.reference = reference
+        self.prepare = prepare
+        self.interval = interval
+        self.threshold = threshold
+        self.n_dropped = 0
+        self.n_failed = 0
+        self.latest_scores = pd.DataFrame(columns=["column", "psi", "ks", "n_rows"])
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._windows = deque(maxlen=n_windows)
+        self._new_window()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _new_window(self) -> None:
+        """Start a new bucket of counts, the oldest drops out of the window."""
+        self._windows.append(
+            {
+                col: np.zeros(len(sketch["proportions"]), dtype=np.int64)
+                for col, sketch in self.reference.columns.items()
+            }
+        )
+
+    def observe(self, data: pd.DataFrame) -> None:
+        """Queue a scored batch, never blocks."""
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            self.n_dropped += 1
+
+    def update(self, data: pd.DataFrame) -> None:
+        """Count a batch into the current bucket, missing columns are skipped."""
+        if self.prepare is not None:
+            data = self.prepare(data)
+        window = self._windows[-1]
+        for col, sketch in self.reference.columns.items():
+            if col in data.columns:
+                window[col] += self.reference.bucket_counts(sketch, data[col])
+
+    def _count(self, data: pd.DataFrame) -> None:
+        """Count a queued batch, a batch failing to count is logged and skipped."""
+        try:
+            self.update(data)
+        except Exception:
+            self.n_failed += 1
+            logger.exception("Failed to count batch for drift, skipping it")
+
+    def drain(self) -> None:
+        """Count all queued batches."""
+        while True:
+            try:
+                data = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._count(data)
+
+    def score(self) -> pd.DataFrame:
+        """Score the rolling window and start a new bucket."""
+        self.drain()
+        counts = {
+            col: sum(window[col] for window in self._windows)
+            for col in self.reference.columns
+        }
+        scores = self.reference.scores(counts)
+        scores["drifted"] = scores["psi"] > self.threshold
+        self.latest_scores = scores
+        self._new_window()
+
+        drifted = scores.loc[scores["drifted"], "column"].tolist()
+        if drifted:
+            logger.warning(f"Drift detected in {drifted}\n{scores}")
+        return scores
+
+    def _watch(self) -> None:
+        """Count queued batches continuously and score every interval.
+
+        Failing batches are skipped, see `_count`, so monitoring never stops.
+        """
+        next_score = time.monotonic() + self.interval
+        while not self._stop_event.is_set():
+            try:
+                data = self._queue.get(timeout=min(self.interval, 0.5))
+            except queue.Empty:
+                pass
+            else:
+                self._count(data)
+
+            if time.monotonic() >= next_score:
+                self.score()
+                next_score = time.monotonic() + self.interval
+
+    def start(self) -> None:
+        """Start counting and scoring in the background."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,153 @@
+"""Memory-bounded encoders for high-cardinality categorical columns.
+
+Both follow the sklearn transformer api so they can be registered in
+`data_preprocessor.PREPROCESSOR` and saved, loaded and used like sklearn's.
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse
+from sklearn.base import (
+    BaseEstimator,
+    ClassNamePrefixFeaturesOutMixin,
+    TransformerMixin,
+)
+from sklearn.model_selection import KFold
+
+
+class HashingEncoder(ClassNamePrefixFeaturesOutMixin, TransformerMixin, BaseEstimator):
+    """Hash (column, value) pairs into a fixed number of sparse output columns.
+
+    Output width is `n_features` whatever the number of categories, unseen values
+    need no refit. With `alternate_sign` collisions cancel out in expectation.
+    """
+
+    def __init__(self, n_features: int = 64, alternate_sign: bool = True) -> None:
+        """Initialize encoder with a fixed output width."""
+        self.n_features = n_features
+        self.alternate_sign = alternate_sign
+
+    def fit(self, x: pd.DataFrame, y=None) -> "HashingEncoder":
+        """Record input columns, hashing needs no fitted state."""
+        self.feature_names_in_ = np.asarray(x.columns, dtype=object)
+        self._n_features_out = self.n_features
+        return self
+
+    def transform(self, x: pd.DataFrame) -> scipy.sparse.csr_matrix:
+        """Hash each column value into one of n_features columns."""
+        n_rows, n_cols = x.shape
+        hashes = np.empty((n_rows, n_cols), dtype=np.uint64)
+        for i, col in enumerate(x.columns):
+            values = x[col].astype(str).to_numpy(dtype=object)
+            # a per column hash key keeps equal values of different columns apart
+            hash_key = f"{i:016d}"
+            hashes[:, i] = pd.util.hash_array(values, hash_key=hash_key)
+
+        hashes = hashes.ravel()
+        indices = (hashes % np.uint64(self.n_features)).astype(np.int64)
+        data = np.ones(len(hashes), dtype=np.float64)
+        if self.alternate_sign:
+            data[(hashes >> np.uint64(63)) == 1] = -1.0
+
+        indptr = np.arange(0, n_rows * n_cols + 1, n_cols)
+        matrix = scipy.sparse.csr_matrix(
+            (data, indices, indptr), shape=(n_rows, self.n_features)
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+
+class MeanTargetEncoder(TransformerMixin, BaseEstimator):
+    """Encode categories with their smoothed target mean, one output per column.
+
+    Means are shrunk towards the global mean by `smoothing` pseudo counts and
+    unseen or missing values are encoded as the global mean. Statistics are
+    computed with vectorized bincounts over factorized codes.
+
+    `transform` uses statistics of all training rows. Encoding the training rows
+    themselves with those leaks the target, use `cross_fit_transform` where each
+    row is encoded with statistics of the other `n_splits` - 1 folds.
+    """
+
+    def __init__(
+        self, n_splits: int = 5, smoothing: float = 10.0, random_state: int = 0
+    ) -> None:
+        """Initialize encoder with cross-fitting folds and smoothing."""
+        self.n_splits = n_splits
+        self.smoothing = smoothing
+        self.random_state = random_state
+
+    def _smoothed_mean(self, sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Target mean shrunk towards the global mean, the global mean if no counts."""
+        denominator = counts + self.smoothing
+        return np.divide(
+            sums + self.smoothing * self.global_mean_,
+            denominator,
+            out=np.full(len(sums), self.global_mean_),
+            where=denominator > 0,
+        )
+
+    def fit(self, x: pd.DataFrame, y) -> "MeanTargetEncoder":
+        """Compute smoothed target means of each category."""
+        if y is None:
+            raise ValueError(f"{type(self).__name__} requires the target to fit.")
+
+        y = np.asarray(y, dtype=np.float64)
+        self.feature_names_in_ = np.asarray(x.columns, dtype=object)
+        self.global_mean_ = y.mean()
+        self.encodings_ = []
+        for col in x.columns:
+            codes, uniques = pd.factorize(x[col])
+            valid = codes >= 0
+            sums = np.bincount(codes[valid], weights=y[valid], minlength=len(uniques))
+            counts = np.bincount(codes[valid], minlength=len(uniques))
+            self.encodings_.append(
+                pd.Series(self._smoothed_mean(sums, counts), index=uniques)
+            )
+        return self
+
+    def transform(self, x: pd.DataFrame) -> np.ndarray:
+        """Encode categories with the fitted means."""
+        out = np.empty(x.shape, dtype=np.float64)
+        for i, (col, encoding) in enumerate(zip(x.columns, self.encodings_)):
+            index = encoding.index.get_indexer(x[col])
+            out[:, i] = np.where(
+                index >= 0, encoding.to_numpy()[index], self.global_mean_
+            )
+        return out
+
+    def cross_fit_transform(self, x: pd.DataFrame, y) -> np.ndarray:
+        """Encode training rows out of fold, fitted statistics are left unchanged."""
+        y = np.asarray(y, dtype=np.float64)
+        fold = np.empty(len(y), dtype=np.int64)
+        kfold = KFold(self.n_splits, shuffle=True, random_state=self.random_state)
+        for i, (_, fold_index) in enumerate(kfold.split(y)):
+            fold[fold_index] = i
+
+        out = np.empty(x.shape, dtype=np.float64)
+        for i, col in enumerate(x.columns):
+            codes, uniques = pd.factorize(x[col])
+            n_codes = len(uniques) + 1
+            # missing values get their own code, encoded as the global mean below
+            codes = np.where(codes >= 0, codes, len(uniques))
+
+            # sums and counts per (fold, code), out of fold is total minus in fold
+            fold_codes = fold * n_codes + codes
+            size = self.n_splits * n_codes
+            fold_sums = np.bincount(fold_codes, weights=y, minlength=size)
+            fold_counts = np.bincount(fold_codes, minlength=size)
+            fold_sums = fold_sums.reshape(self.n_splits, n_codes)
+            fold_counts = fold_counts.reshape(self.n_splits, n_codes)
+
+            oof_sums = fold_sums.sum(axis=0)[codes] - fold_sums[fold, codes]
+            oof_counts = fold_counts.sum(axis=0)[codes] - fold_counts[fold, codes]
+            out[:, i] = np.where(
+                codes < len(uniques),
+                self._smoothed_mean(oof_sums, oof_counts),
+                self.global_mean_,
+            )
+        return out
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        """Output feature names, the same as the input columns."""
+        return np.asarray(self.feature_names_in_, dtype=object)
@@ -8,6 +8,7 @@ import numpy as np
 import omegaconf
 
 import train_model.utils.utils as utils
+from train_model.utils.sketches import TDigest
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,98 @@ class Evaluator:
             fn_result = fn(ytrue, ypred)
             self.metrics[fn_name] = fn_result
 
+    def evaluate_accumulator(self, accumulator: "RegressionAccumulator") -> None:
+        """Evaluates pooled metrics of an accumulator for the metrics in params.
+
+        Metric names are matched on the function name, e.g.
+        "sklearn.metrics.mean_squared_error" reads "mean_squared_error".
+        """
+        pooled_metrics = accumulator.result()
+        self.metrics: dict[str, float] = {}
+
+        for p in self.params:
+            fn_name = p.rsplit(".", maxsplit=1)[-1]
+            if fn_name not in pooled_metrics:
+                raise KeyError(
+                    f"Metric {fn_name} is not supported by {type(accumulator).__name__}.",
+                    f"Expected the followings from {list(pooled_metrics)}",
+                )
+            self.metrics[fn_name] = pooled_metrics[fn_name]
+
+
+class RegressionAccumulator:
+    """Mergeable sufficient statistics for pooled regression metrics.
+
+    Updated chunk by chunk and merged across folds or workers, the result is the
+    same as computing the metric on the concatenated arrays. Target mean and
+    variance are merged with Chan's parallel algorithm for numerical stability,
+    median_absolute_error is approximated from a t-digest of absolute residuals.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.n = 0
+        self.ytrue_mean = 0.0
+        self.ytrue_m2 = 0.0
+        self.sum_abs_residual = 0.0
+        self.sum_sq_residual = 0.0
+        self.max_abs_residual = 0.0
+        self.abs_residual_digest = TDigest()
+
+    def update(self, ypred, ytrue) -> "RegressionAccumulator":
+        """Update statistics with a chunk of predictions and targets."""
+        ypred = np.asarray(ypred, dtype=np.float64)
+        ytrue = np.asarray(ytrue, dtype=np.float64)
+        abs_residual = np.abs(ytrue - ypred)
+
+        chunk = RegressionAccumulator()
+        chunk.n = len(ytrue)
+        if chunk.n == 0:
+            return self
+        chunk.ytrue_mean = ytrue.mean()
+        chunk.ytrue_m2 = np.square(ytrue - chunk.ytrue_mean).sum()
+        chunk.sum_abs_residual = abs_residual.sum()
+        chunk.sum_sq_residual = np.square(abs_residual).sum()
+        chunk.max_abs_residual = abs_residual.max()
+        chunk.abs_residual_digest.update(abs_residual)
+
+        return self.merge(chunk)
+
+    def merge(self, other: "RegressionAccumulator") -> "RegressionAccumulator":
+        """Merge statistics of another chunk, fold or worker into this one."""
+        n = self.n + other.n
+        if n == 0:
+            return self
+
+        delta = other.ytrue_mean - self.ytrue_mean
+        self.ytrue_mean += delta * other.n / n
+        self.ytrue_m2 += other.ytrue_m2 + delta**2 * self.n * other.n / n
+        self.n = n
+
+        self.sum_abs_residual += other.sum_abs_residual
+        self.sum_sq_residual += other.sum_sq_residual
+        self.max_abs_residual = max(self.max_abs_residual, other.max_abs_residual)
+        self.abs_residual_digest.merge(other.abs_residual_digest)
+
+        return self
+
+    def result(self) -> dict[str, float]:
+        """Pooled metrics named after their sklearn.metrics functions."""
+        if self.n == 0:
+            raise ValueError("RegressionAccumulator is empty, call update first.")
+
+        mse = self.sum_sq_residual / self.n
+        return {
+            "mean_absolute_error": self.sum_abs_residual / self.n,
+            "mean_squared_error": mse,
+            "root_mean_squared_error": np.sqrt(mse),
+            "r2_score": 1 - self.sum_sq_residual / self.ytrue_m2
+            if self.ytrue_m2 > 0
+            else np.nan,
+            "max_error": self.max_abs_residual,
+            "median_absolute_error": float(self.abs_residual_digest.quantile(0.5)),
+        }
+
 
 class CVMetrics:
     """Data class to store evaluation metrics from cross validation(cv)."""
@@ -57,6 +150,23 @@ class CVMetrics:
     def __init__(self):
         """Initialize class with metrics attribute to store cv results."""
         self.metrics = defaultdict(list)
+        self.pooled = RegressionAccumulator()
+
+    def update_accumulator(self, accumulator: RegressionAccumulator) -> None:
+        """Ingest a fold's accumulator, merged into pooled metrics across cv."""
+        self.update_metrics(accumulator.result())
+        self.pooled.merge(accumulator)
+
+    def get_pooled(self, metric_name: str) -> float:
+        """Get the pooled metric over all cv folds, not the mean of fold metrics."""
+        result = self.pooled.result()
+        if metric_name not in result:
+            raise KeyError(
+                f"Selected Metric {metric_name} is not a valid name.",
+                f"Expected the followings from {list(result)}",
+            )
+
+        return result[metric_name]
 
     def update_metrics(self, current_metrics: dict[str, float]) -> None:
         """Ingest current training metrics and store it across cv."""
@@ -0,0 +1,161 @@
+"""Module to store transformed feature matrix on disk for out-of-core training."""
+
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import data_model
+from .data_preprocessor import HdbDataPreprocessor
+from .evaluator import Evaluator, RegressionAccumulator
+
+logger = logging.getLogger(__name__)
+COL = data_model.ColumnEnum
+
+FEATURE_FILE = "features.dat"
+TARGET_FILE = "target.dat"
+META_FILE = "meta.json"
+
+
+def write_feature_matrix(
+    preprocessor: HdbDataPreprocessor,
+    data: pd.DataFrame | Iterable[pd.DataFrame],
+    save_path: str | Path,
+    target: str = COL.resale_price,
+    chunk_size: int = 100_000,
+    dtype: str = "float32",
+) -> "FeatureMatrix":
+    """Transform data chunk by chunk and append it to a memory-mappable store.
+
+    Only a single chunk of transformed data is held in memory at any time, the
+    rest is streamed to raw binary files that can be opened with `np.memmap`.
+
+    Args:
+        preprocessor (HdbDataPreprocessor): Fitted preprocessor used to transform.
+        data (pd.DataFrame | Iterable[pd.DataFrame]): Feature engineered data, either
+            as a single dataframe or an iterable of chunks (e.g. `read_csv(chunksize)`).
+        save_path (str | Path): Folder to write the feature matrix into.
+        target (str, optional): Target column name. Defaults to resale_price.
+        chunk_size (int, optional): Rows per chunk if data is a dataframe.
+        dtype (str, optional): On-disk dtype. Defaults to "float32".
+
+    Returns:
+        FeatureMatrix: Read-only memory-mapped view of the written store.
+    """
+    if isinstance(save_path, str):
+        save_path = Path(save_path)
+    save_path.mkdir(parents=True, exist_ok=True)
+
+    if isinstance(data, pd.DataFrame):
+        data = iter_dataframe_chunks(data, chunk_size)
+
+    n_rows = 0
+    columns = preprocessor.get_feature_names_out().tolist()
+    buffer = np.empty((0, len(columns)), dtype=dtype)
+
+    with (
+        open(Path(save_path, FEATURE_FILE), "wb") as feature_file,
+        open(Path(save_path, TARGET_FILE), "wb") as target_file,
+    ):
+        for chunk in data:
+            if len(chunk) > len(buffer):
+                buffer = np.empty((len(chunk), len(columns)), dtype=dtype)
+
+            out = buffer[: len(chunk)]
+            preprocessor.transform_data(chunk, out=out)
+
+            out.tofile(feature_file)
+            np.ascontiguousarray(chunk[target].to_numpy(), dtype=dtype).tofile(
+                target_file
+            )
+            n_rows += len(chunk)
+
+    meta = {"n_rows": n_rows, "columns": columns, "dtype": dtype}
+    with open(Path(save_path, META_FILE), "w") as meta_file:
+        json.dump(meta, meta_file)
+
+    logger.info(f"Saved feature matrix of {n_rows} rows into {save_path}")
+    return FeatureMatrix(save_path)
+
+
+def iter_dataframe_chunks(
+    data: pd.DataFrame, chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """Yield consecutive row slices of a dataframe."""
+    for start in range(0, len(data), chunk_size):
+        yield data.iloc[start : start + chunk_size]
+
+
+class FeatureMatrix:
+    """Memory-mapped feature matrix and target written by `write_feature_matrix`.
+
+    Pages are loaded lazily by the OS, so the matrix can be larger than memory
+    and opened read-only by multiple processes sharing the same page cache.
+
+    Training is only out-of-core through `SKLearnPredictor.fit_chunks`, which needs
+    an estimator with `partial_fit` such as SGDRegressor. `fit` on `x`, e.g. with
+    the default LinearRegression, pages the whole matrix into memory. An empty
+    matrix is held in memory, as empty files cannot be memory mapped.
+    """
+
+    def __init__(self, load_path: str | Path, mmap_mode: str = "r") -> None:
+        """Open the feature matrix store in load_path."""
+        if isinstance(load_path, str):
+            load_path = Path(load_path)
+
+        with open(Path(load_path, META_FILE)) as meta_file:
+            meta = json.load(meta_file)
+
+        self.load_path = load_path
+        self.columns: list[str] = meta["columns"]
+        self.n_rows: int = meta["n_rows"]
+        self.dtype = np.dtype(meta["dtype"])
+
+        if self.n_rows == 0:
+            self.x = np.empty((0, len(self.columns)), dtype=self.dtype)
+            self.y = np.empty(0, dtype=self.dtype)
+            return
+
+        self.x = np.memmap(
+            Path(load_path, FEATURE_FILE),
+            dtype=self.dtype,
+            mode=mmap_mode,
+            shape=(self.n_rows, len(self.columns)),
+        )
+        self.y = np.memmap(
+            Path(load_path, TARGET_FILE),
+            dtype=self.dtype,
+            mode=mmap_mode,
+            shape=(self.n_rows,),
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Shape of the feature matrix."""
+        return self.x.shape
+
+    def iter_chunks(self, chunk_size: int = 100_000) -> Iterator[tuple[np.ndarray]]:
+        """Yield (x, y) views of consecutive chunks without copying."""
+        for start in range(0, self.n_rows, chunk_size):
+            yield self.x[start : start + chunk_size], self.y[start : start + chunk_size]
+
+    def evaluate(
+        self, predictor, evaluator: Evaluator, chunk_size: int = 100_000
+    ) -> dict[str, float]:
+        """Evaluate a fitted predictor on the matrix chunk by chunk.
+
+        Predictions of each chunk are folded into a `RegressionAccumulator`, so
+        neither the matrix nor all predictions are held in memory at once.
+
+        Returns:
+            dict[str, float]: Pooled metrics, also set on `evaluator.metrics`.
+        """
+        accumulator = RegressionAccumulator()
+        for x, y in self.iter_chunks(chunk_size):
+            accumulator.update(predictor.predict(x), y)
+
+        evaluator.evaluate_accumulator(accumulator)
+        return evaluator.metrics
@@ -0,0 +1,265 @@
+"""Module for a local feature store partitioned by month and feature version."""
+
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import data_model
+from .data_preprocessor import FEATURE_VERSION, HdbDataPreprocessor
+
+logger = logging.getLogger(__name__)
+COL = data_model.ColumnEnum
+
+META_FILE = "_meta.json"
+# suffix of the missing value mask saved next to a column with missing values
+MASK_SUFFIX = ".na"
+
+
+def _column_name(col) -> str:
+    """Plain name of a column label, including `ColumnEnum` members."""
+    return str(getattr(col, "value", col))
+
+
+def source_hash(data: pd.DataFrame) -> str:
+    """Hash of column names and row values in row order."""
+    digest = hashlib.sha1(json.dumps([_column_name(c) for c in data.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _save_column(folder: Path, name: str, values: pd.Series) -> str:
+    """Save a column as a plain npy array, returns the dtype to restore.
+
+    Text and nullable columns are saved as fixed-width unicode or numpy numbers
+    with a separate missing value mask, so partitions load without pickle.
+    """
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype != object:
+        np.save(Path(folder, f"{name}.npy"), values.to_numpy())
+        return str(dtype)
+
+    mask = values.isna().to_numpy()
+    if mask.any():
+        np.save(Path(folder, f"{name}{MASK_SUFFIX}.npy"), mask)
+
+    if dtype == object or pd.api.types.is_string_dtype(dtype):
+        array = values.astype(str).to_numpy(dtype=str)
+        array[mask] = ""
+    else:
+        numpy_dtype = getattr(dtype, "numpy_dtype", None)
+        if numpy_dtype is None:
+            raise TypeError(f"Column {name} of dtype {dtype} cannot be stored.")
+        array = values.to_numpy(dtype=numpy_dtype, na_value=0)
+    np.save(Path(folder, f"{name}.npy"), array)
+    return str(dtype)
+
+
+def _load_column(
+    folder: Path, name: str, dtype: str
+) -> pd.api.extensions.ExtensionArray | np.ndarray:
+    """Load a column saved by `_save_column` with its dtype and missing values."""
+    array = np.load(Path(folder, f"{name}.npy"), allow_pickle=False)
+    mask_path = Path(folder, f"{name}{MASK_SUFFIX}.npy")
+    mask = np.load(mask_path) if mask_path.is_file() else None
+
+    if array.dtype.kind == "U":
+        array = array.astype(object)
+        if mask is not None:
+            array[mask] = np.nan
+        return array if dtype == "object" else pd.array(array, dtype=dtype)
+
+    if dtype == str(array.dtype):
+        return array
+
+    result = pd.array(array, dtype=dtype)
+    if mask is not None:
+        result[mask] = pd.NA
+    return result
+
+
+class MonthlyFeatureStore:
+    """Persist feature engineered data as one folder per month partition.
+
+    Layout is `<root>/v=<feature version>/month=<YYYY-MM>/<column>.npy` so a time
+    window can be assembled by reading only the required partitions and columns.
+    Each partition records a hash of its source rows, partitions are recomputed
+    only when new, changed or explicitly invalidated. A partition is swapped in by
+    renaming the old one aside first, an aside partition left by an interrupted
+    swap is restored when the store is opened.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        preprocessor: HdbDataPreprocessor,
+        version: int = FEATURE_VERSION,
+    ) -> None:
+        """Initialize feature store for a preprocessor and feature version."""
+        if isinstance(root, str):
+            root = Path(root)
+
+        self.preprocessor = preprocessor
+        self.version = version
+        self.store_path = Path(root, f"v={version}")
+        self._restore_interrupted()
+
+    def _restore_interrupted(self) -> None:
+        """Restore partitions renamed aside by a swap that did not complete."""
+        if not self.store_path.is_dir():
+            return
+
+        for old_path in self.store_path.glob("month=*.old"):
+            partition_path = old_path.with_suffix("")
+            if partition_path.is_dir():
+                shutil.rmtree(old_path)
+            else:
+                logger.warning(f"Restoring partition {partition_path.name}")
+                old_path.rename(partition_path)
+
+    def _partition_path(self, month: str) -> Path:
+        """Folder of a single month partition."""
+        return Path(self.store_path, f"month={month}")
+
+    def months(self) -> list[str]:
+        """Sorted list of months stored for the current feature version."""
+        if not self.store_path.is_dir():
+            return []
+
+        return sorted(
+            p.name.removeprefix("month=")
+            for p in self.store_path.iterdir()
+            if not p.suffix and Path(p, META_FILE).is_file()
+        )
+
+    def _read_meta(self, month: str) -> dict | None:
+        """Read partition metadata, None if the partition does not exist."""
+        meta_path = Path(self._partition_path(month), META_FILE)
+        if not meta_path.is_file():
+            return None
+
+        with open(meta_path) as meta_file:
+            return json.load(meta_file)
+
+    def update(self, data: pd.DataFrame, force: bool = False) -> list[str]:
+        """Feature engineer and persist months that are new or changed.
+
+        data is the full source, partitions of months no longer in it are removed.
+        Rows without a month cannot be partitioned and are skipped with a warning.
+
+        Args:
+            data (pd.DataFrame): Cleaned data with a month column.
+            force (bool, optional): Recompute every month in data. Defaults to False.
+
+        Returns:
+            list[str]: Months that were recomputed.
+        """
+        recomputed = []
+        n_missing = int(data[COL.month].isna().sum())
+        if n_missing:
+            logger.warning(f"Skipping {n_missing} rows without a month")
+
+        source_months = set(data[COL.month].dropna())
+        for month in set(self.months()) - source_months:
+            logger.info(f"Removing partition {month} no longer in the source")
+            shutil.rmtree(self._partition_path(month))
+
+        for month, partition in data.groupby(COL.month, sort=True):
+            partition_hash = source_hash(partition)
+            meta = self._read_meta(month)
+            if not force and meta is not None and meta["source_hash"] == partition_hash:
+                logger.debug(f"Partition {month} is up to date, skipping.")
+                continue
+
+            features = self.preprocessor.feature_engineer(
+                partition.reset_index(drop=True)
+            )
+            self._write_partition(month, features, partition_hash)
+            recomputed.append(month)
+
+        logger.info(f"Recomputed {len(recomputed)} partitions in {self.store_path}")
+        return recomputed
+
+    def _write_partition(
+        self, month: str, features: pd.DataFrame, partition_hash: str
+    ) -> None:
+        """Write columns of a partition into a temp folder then swap it in."""
+        partition_path = self._partition_path(month)
+        tmp_path = partition_path.with_name(partition_path.name + ".tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+
+        dtypes = {
+            _column_name(col): _save_column(tmp_path, _column_name(col), features[col])
+            for col in features.columns
+        }
+
+        meta = {
+            "n_rows": len(features),
+            "columns": list(dtypes),
+            "dtypes": dtypes,
+            "source_hash": partition_hash,
+        }
+        with open(Path(tmp_path, META_FILE), "w") as meta_file:
+            json.dump(meta, meta_file)
+
+        # the old partition is renamed aside, not removed, until the new one is in
+        old_path = partition_path.with_name(partition_path.name + ".old")
+        shutil.rmtree(old_path, ignore_errors=True)
+        if partition_path.exists():
+            partition_path.rename(old_path)
+        tmp_path.rename(partition_path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    def invalidate(self, months: list[str] | None = None) -> None:
+        """Remove partitions so they are recomputed on next update, all if None."""
+        for month in self.months() if months is None else months:
+            logger.info(f"Invalidating partition {month}")
+            shutil.rmtree(self._partition_path(month), ignore_errors=True)
+
+    def read(
+        self,
+        start: str | None = None,
+        end: str | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Assemble data between start and end months (inclusive).
+
+        Args:
+            start (str, optional): First month as YYYY-MM. Defaults to earliest.
+            end (str, optional): Last month as YYYY-MM. Defaults to latest.
+            columns (list[str], optional): Columns to read. Defaults to all.
+
+        Returns:
+            pd.DataFrame: Feature engineered data of the time window.
+        """
+        if columns is not None:
+            columns = [_column_name(col) for col in columns]
+
+        frames = []
+        for month in self.months():
+            if (start is not None and month < start) or (
+                end is not None and month > end
+            ):
+                continue
+
+            meta = self._read_meta(month)
+            partition_columns = meta["columns"] if columns is None else columns
+            partition_path = self._partition_path(month)
+            frames.append(
+                pd.DataFrame(
+                    {
+                        col: _load_column(partition_path, col, meta["dtypes"][col])
+                        for col in partition_columns
+                    }
+                )
+            )
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,331 @@
+"""Module for a persistent record key index over an append-only dataset."""
+
+import json
+import logging
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import data_model
+
+logger = logging.getLogger(__name__)
+COL = data_model.ColumnEnum
+
+ON_DUPLICATE = ["upsert", "skip"]
+
+
+@dataclass
+class KeyRun:
+    """Sorted unique keys of a range of updates with their rows and row hashes.
+
+    `first` and `last` are the sequence numbers of the updates merged into the run.
+    """
+
+    keys: np.ndarray
+    rows: np.ndarray
+    hashes: np.ndarray
+    first: int
+    last: int
+    saved: bool = False
+
+    def __len__(self) -> int:
+        """Number of keys in the run."""
+        return len(self.keys)
+
+    @property
+    def name(self) -> str:
+        """File name stem of the run."""
+        return f"run-{self.first:08d}-{self.last:08d}"
+
+    def find(self, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Sorted positions of keys and whether each key is in the run."""
+        position = np.searchsorted(self.keys, keys)
+        found = position < len(self.keys)
+        found[found] = self.keys[position[found]] == keys[found]
+        return position, found
+
+    @classmethod
+    def merge(cls, older: "KeyRun", newer: "KeyRun") -> "KeyRun":
+        """Merge two consecutive runs, keys of the newer run win."""
+        keys = np.concatenate([newer.keys, older.keys])
+        # the unique index is of the first occurrence, from the newer run
+        unique_keys, first = np.unique(keys, return_index=True)
+        rows = np.concatenate([newer.rows, older.rows])[first]
+        hashes = np.concatenate([newer.hashes, older.hashes])[first]
+        return cls(unique_keys, rows, hashes, older.first, newer.last)
+
+
+class KeyIndex:
+    """Log-structured index of record keys with the latest row and row hash of each.
+
+    Keys are kept in sorted runs and every update adds a run of only its batch
+    keys, so saving an ingest writes O(batch) rather than the whole index. A run
+    is merged into the previous one while that one is at most twice its size,
+    which keeps O(log n) runs and rewrites a key O(log n) times over all updates.
+    Lookups binary search the memory mapped runs newest first, O(batch log^2 n),
+    and never touch the stored data. `n_rows` counts every row written to the
+    dataset, including rows superseded by an upsert, `data_size` is the size in
+    bytes of the data file it indexes.
+    """
+
+    def __init__(
+        self,
+        runs: list[KeyRun] | None = None,
+        n_rows: int = 0,
+        data_size: int = 0,
+        n_keys: int = 0,
+    ) -> None:
+        """Initialize index from runs, oldest first."""
+        self.runs = [] if runs is None else runs
+        self.n_rows = n_rows
+        self.data_size = data_size
+        self.n_keys = n_keys
+
+    def __len__(self) -> int:
+        """Number of distinct keys."""
+        return self.n_keys
+
+    @classmethod
+    def from_data(cls, data: pd.DataFrame, key: str = COL.record_id) -> "KeyIndex":
+        """Build the index of stored data in row order, later rows win."""
+        keys = data[key].to_numpy(np.int64)
+        # reversed so the unique index is of the last occurrence
+        unique_keys, last = np.unique(keys[::-1], return_index=True)
+        rows = len(keys) - 1 - last
+        run = KeyRun(unique_keys, rows, hash_rows(data)[rows], 0, 0)
+        return cls([run], len(keys), n_keys=len(unique_keys))
+
+    def lookup(self, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and row hashes of keys, -1 and 0 for keys not in the index."""
+        keys = np.asarray(keys, dtype=np.int64)
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        hashes = np.zeros(len(keys), dtype=np.uint64)
+        pending = np.arange(len(keys))
+        for run in reversed(self.runs):
+            if not len(pending):
+                break
+            position, found = run.find(keys[pending])
+            rows[pending[found]] = run.rows[position[found]]
+            hashes[pending[found]] = run.hashes[position[found]]
+            pending = pending[~found]
+
+        return rows, hashes
+
+    def update(self, keys: np.ndarray, rows: np.ndarray, hashes: np.ndarray) -> None:
+        """Point unique keys at new rows with a new run of only these keys."""
+        keys = np.asarray(keys, dtype=np.int64)
+        self.n_keys += int((self.lookup(keys)[0] < 0).sum())
+
+        order = np.argsort(keys, kind="stable")
+        sequence = self.runs[-1].last + 1 if self.runs else 0
+        self.runs.append(
+            KeyRun(
+                keys[order],
+                np.asarray(rows, dtype=np.int64)[order],
+                np.asarray(hashes, dtype=np.uint64)[order],
+                sequence,
+                sequence,
+            )
+        )
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            newer = self.runs.pop()
+            self.runs.append(KeyRun.merge(self.runs.pop(), newer))
+
+    def current_rows(self) -> np.ndarray:
+        """Rows holding the latest copy of every key, in row order."""
+        runs = self.runs[::-1]
+        keys = np.concatenate([run.keys for run in runs] or [np.empty(0, np.int64)])
+        rows = np.concatenate([run.rows for run in runs] or [np.empty(0, np.int64)])
+        _, newest = np.unique(keys, return_index=True)
+        return np.sort(rows[newest])
+
+    def save(self, folder: str | Path) -> None:
+        """Save runs not yet saved and remove runs merged away.
+
+        A run is written as a (3, n) int64 array then its metadata json, the json
+        marks the run complete so a run interrupted while saving is ignored.
+        """
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        metadata = {
+            "n_rows": self.n_rows,
+            "data_size": self.data_size,
+            "n_keys": self.n_keys,
+        }
+        for run in self.runs:
+            if run.saved:
+                continue
+            run_data = np.stack([run.keys, run.rows, run.hashes.view(np.int64)])
+            tmp_path = Path(folder, f"tmp-{run.name}.npy")
+            np.save(tmp_path, run_data)
+            tmp_path.replace(Path(folder, run.name + ".npy"))
+            tmp_path = Path(folder, f"tmp-{run.name}.json")
+            tmp_path.write_text(json.dumps(metadata))
+            tmp_path.replace(Path(folder, run.name + ".json"))
+            run.saved = True
+
+        live = {run.name for run in self.runs}
+        for file_path in folder.iterdir():
+            if file_path.name.split(".")[0] not in live:
+                file_path.unlink()
+
+    @classmethod
+    def load(cls, folder: str | Path) -> "KeyIndex":
+        """Load the complete runs saved by `save`, memory mapped.
+
+        Runs left behind by an interrupted merge are covered by the merged run and
+        skipped.
+        """
+        ranges = []
+        for file_path in Path(folder).glob("run-*.json"):
+            _, first, last = file_path.stem.split("-")
+            ranges.append((int(first), int(last)))
+        ranges = [
+            (first, last)
+            for first, last in ranges
+            if not any(
+                other != (first, last) and other[0] <= first and last <= other[1]
+                for other in ranges
+            )
+        ]
+
+        runs = []
+        for first, last in sorted(ranges):
+            name = f"run-{first:08d}-{last:08d}"
+            run_data = np.load(Path(folder, name + ".npy"), mmap_mode="r")
+            runs.append(
+                KeyRun(
+                    run_data[0],
+                    run_data[1],
+                    run_data[2].view(np.uint64),
+                    first,
+                    last,
+                    saved=True,
+                )
+            )
+
+        if not runs:
+            return cls(data_size=-1)
+        metadata = json.loads(Path(folder, runs[-1].name + ".json").read_text())
+        return cls(runs, **metadata)
+
+
+def hash_rows(data: pd.DataFrame) -> np.ndarray:
+    """Hash row values as text, so rows read back from csv hash the same.
+
+    Missing values (None, NaN, NA) are hashed as an empty string, as written to csv.
+    """
+    text = data.astype(str).mask(data.isna(), "")
+    return pd.util.hash_pandas_object(text, index=False).to_numpy()
+
+
+def index_path(data_path: str | Path) -> Path:
+    """Index folder stored next to a dataset."""
+    data_path = Path(data_path)
+    return data_path.with_name(data_path.name + ".index")
+
+
+def load_index(data_path: str | Path, key: str = COL.record_id) -> KeyIndex:
+    """Load the index of a dataset, built from a single scan if it does not exist.
+
+    The data is appended before its index is saved. Data beyond the indexed size
+    is an interrupted ingest and is truncated, so it can be ingested again, data
+    of any other size is indexed again from a single scan.
+    """
+    folder = index_path(data_path)
+    data_size = Path(data_path).stat().st_size if Path(data_path).is_file() else 0
+    if folder.is_dir():
+        index = KeyIndex.load(folder)
+        if index.data_size == data_size:
+            return index
+
+        if 0 < index.data_size < data_size:
+            logger.warning(
+                f"Truncating {data_size - index.data_size} bytes of {data_path} "
+                "written by an interrupted ingest"
+            )
+            with open(data_path, "r+b") as f:
+                f.truncate(index.data_size)
+            return index
+
+        logger.warning(f"Key index of {data_path} is out of date, rebuilding it")
+        shutil.rmtree(folder)
+
+    if not Path(data_path).is_file():
+        return KeyIndex()
+
+    logger.info(f"Building key index of {data_path}")
+    index = KeyIndex.from_data(pd.read_csv(data_path, dtype=str), key=key)
+    index.data_size = data_size
+    index.save(folder)
+    return index
+
+
+def ingest(
+    data_path: str | Path,
+    batch: pd.DataFrame,
+    on_duplicate: str = "upsert",
+    key: str = COL.record_id,
+) -> pd.DataFrame:
+    """Append a batch to a csv dataset, deduplicated on the record key.
+
+    Only the batch keys are looked up in the index and only new or changed rows
+    are appended, the stored data is never read and the index only writes a run
+    of the batch keys, see `KeyIndex`. With "upsert" a changed
+    record is appended and the index points at the new row, with "skip" it is
+    dropped. Read the deduplicated data with `read_current`.
+
+    Returns:
+        pd.DataFrame: Rows appended to the dataset.
+    """
+    if on_duplicate not in ON_DUPLICATE:
+        raise NotImplementedError(
+            f"{on_duplicate} is not implemented, expected one of {ON_DUPLICATE}."
+        )
+
+    if Path(data_path).is_file():
+        columns = pd.read_csv(data_path, nrows=0).columns
+        missing = set(columns) - set(batch.columns)
+        if missing:
+            raise KeyError(
+                f"Columns {sorted(missing)} of {data_path} not in batch.",
+                f"Expected the followings from {list(batch.columns)}",
+            )
+        batch = batch[columns]
+
+    index = load_index(data_path, key=key)
+    # within a batch the last copy of a key wins
+    batch = batch.drop_duplicates(subset=key, keep="last")
+    hashes = hash_rows(batch)
+    rows, stored_hashes = index.lookup(batch[key])
+    keep = (rows < 0) | ((stored_hashes != hashes) & (on_duplicate == "upsert"))
+    batch, hashes = batch[keep], hashes[keep]
+    if batch.empty and Path(data_path).is_file():
+        logger.info(f"No new or changed records to ingest into {data_path}")
+        return batch
+
+    if Path(data_path).is_file():
+        batch.to_csv(data_path, mode="a", header=False, index=False)
+    else:
+        batch.to_csv(data_path, index=False)
+
+    rows = np.arange(index.n_rows, index.n_rows + len(batch))
+    index.update(batch[key].to_numpy(), rows, hashes)
+    index.n_rows += len(batch)
+    index.data_size = Path(data_path).stat().st_size
+    index.save(index_path(data_path))
+
+    logger.info(f"Ingested {len(batch)} records into {data_path}, {len(index)} keys")
+    return batch
+
+
+def read_current(data_path: str | Path, key: str = COL.record_id) -> pd.DataFrame:
+    """Read a dataset keeping only the latest row of every key."""
+    index = load_index(data_path, key=key)
+    data = pd.read_csv(data_path)
+    if len(data) == len(index):
+        return data
+    return data.iloc[index.current_rows()].reset_index(drop=True)
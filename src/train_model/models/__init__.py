@@ -1,8 +1,12 @@
 """Init file for models module."""
 
+from .gradient_boosting import HistGradientBoostingPredictor
 from .predictor import Predictor, SKLearnPredictor
+from .stacking import StackingPredictor
 
 __all__ = [
+    "HistGradientBoostingPredictor",
     "Predictor",
     "SKLearnPredictor",
+    "StackingPredictor",
 ]
@@ -0,0 +1,201 @@
+"""Gradient boosting models with native categorical support."""
+
+import logging
+
+import numpy as np
+import omegaconf
+import pandas as pd
+import sklearn
+from sklearn.ensemble import HistGradientBoostingRegressor
+from threadpoolctl import threadpool_limits
+
+from ..data_preprocessor import DEFAULT_PRECISION
+from .predictor import BIAS, SKLearnPredictor
+
+logger = logging.getLogger(__name__)
+
+# defaults for params not set in config
+HGB_DEFAULTS = {
+    "early_stopping": True,
+    "validation_fraction": 0.1,
+    "n_iter_no_change": 10,
+}
+# losses predicting the raw tree sum, so contributions add up to the prediction
+IDENTITY_LOSSES = ["squared_error", "absolute_error", "quantile"]
+
+
+def _in_bitsets(bitsets: np.ndarray, values: np.ndarray, rows: np.ndarray):
+    """Whether integer category values are set in the given rows of bitsets."""
+    # categories are cast to uint8 like sklearn's binned categories
+    values = values.astype(np.int64) % 256
+    return ((bitsets[rows, values // 32] >> (values % 32)) & 1).astype(bool)
+
+
+def _node_values(nodes: np.ndarray) -> np.ndarray:
+    """Expected output of every node, the count-weighted mean of its children.
+
+    sklearn only keeps shrunk values on leaves, internal nodes hold unshrunk
+    split values and the root 0. Nodes are stored depth first, so children
+    come after their parent and are filled in first going backwards.
+    """
+    value = nodes["value"].astype(np.float64)
+    count = nodes["count"].astype(np.float64)
+    for i in np.flatnonzero(~nodes["is_leaf"].astype(bool))[::-1]:
+        children = [nodes["left"][i], nodes["right"][i]]
+        value[i] = np.average(value[children], weights=count[children])
+    return value
+
+
+def _hist_tree_contributions(
+    tree, x: np.ndarray, known_cat_bitsets: np.ndarray, f_idx_map: np.ndarray
+) -> tuple[np.ndarray, float]:
+    """Saabas contributions of a fitted histogram tree for a batch of rows.
+
+    All rows descend one level per step, routed like sklearn's predict: missing
+    values, negative and unknown categories follow `missing_go_to_left`.
+    """
+    nodes = tree.nodes
+    value = _node_values(nodes)
+    is_leaf = nodes["is_leaf"].astype(bool)
+
+    contributions = np.zeros_like(x)
+    node = np.zeros(len(x), dtype=np.intp)
+    rows = np.arange(len(x))
+    while not is_leaf[node].all():
+        active = ~is_leaf[node]
+        row, parent = rows[active], node[active]
+        feature = nodes["feature_idx"][parent]
+        data = x[row, feature]
+
+        go_left = data <= nodes["num_threshold"][parent]
+        missing = np.isnan(data)
+        categorical = nodes["is_categorical"][parent].astype(bool) & ~missing
+        if categorical.any():
+            codes = np.maximum(data[categorical], 0)
+            in_left = _in_bitsets(
+                tree.raw_left_cat_bitsets,
+                codes,
+                nodes["bitset_idx"][parent][categorical],
+            )
+            known = _in_bitsets(
+                known_cat_bitsets, codes, f_idx_map[feature[categorical]]
+            )
+            go_left[categorical] = in_left
+            missing[categorical] = (data[categorical] < 0) | ~(in_left | known)
+
+        go_left = np.where(
+            missing, nodes["missing_go_to_left"][parent].astype(bool), go_left
+        )
+        child = np.where(go_left, nodes["left"][parent], nodes["right"][parent])
+        contributions[row, feature] += value[child] - value[parent]
+        node[row] = child
+
+    return contributions, value[0]
+
+
+class HistGradientBoostingPredictor(SKLearnPredictor):
+    """HistGradientBoostingRegressor on integer-coded categorical columns.
+
+    Categorical columns are integer codes, e.g. from the `ordinalencoder`
+    preprocessor, and split natively by the histogram trees instead of being one-hot
+    encoded. `categorical_features` in params lists the column names, which are
+    resolved to a mask at fit time so predict also works on arrays. Histograms are
+    built with OpenMP threads, limited to `n_threads` if given.
+
+    Example config:
+        predictor_path: train_model.models.HistGradientBoostingPredictor
+        model_object: sklearn.ensemble.HistGradientBoostingRegressor
+        params:
+          categorical_features: [town, flat_type, street_name]
+          max_iter: 500
+    """
+
+    def __init__(
+        self,
+        params: omegaconf.DictConfig,
+        model: sklearn.base.BaseEstimator = HistGradientBoostingRegressor,
+        precision: str = DEFAULT_PRECISION,
+        n_threads: int | None = None,
+    ):
+        """Initialize to ingest yaml config params, early stopping on by default."""
+        self.n_threads = n_threads
+        super().__init__(params, model, precision=precision)
+
+    def _initialize_model(self):
+        """Initialize the model with defaults, categorical columns set at fit."""
+        params = {**HGB_DEFAULTS, **self.params}
+        self.categorical_features = list(params.pop("categorical_features", []))
+        logger.debug(f"Initializing model with params {params}.")
+        self.model = self.model_obj(**params)
+
+    def _categorical_mask(self, x) -> np.ndarray | None:
+        """Resolve categorical column names of x into a boolean mask."""
+        if not self.categorical_features:
+            return None
+
+        if not isinstance(x, pd.DataFrame):
+            raise TypeError(
+                "Categorical features are given by name, fit on a dataframe."
+            )
+
+        missing = set(self.categorical_features) - set(x.columns)
+        if missing:
+            raise KeyError(
+                f"Categorical features {sorted(missing)} not in data.",
+                f"Expected the followings from {list(x.columns)}",
+            )
+        return x.columns.isin(self.categorical_features)
+
+    def fit(self, x, y):
+        """Fit with native categorical splits and early stopping."""
+        self.model.set_params(categorical_features=self._categorical_mask(x))
+        x = self._cast_features(x)
+        x = x.to_numpy() if isinstance(x, pd.DataFrame) else x
+
+        with threadpool_limits(limits=self.n_threads, user_api="openmp"):
+            self.model.fit(x, y)
+
+        if self.model.do_early_stopping_:
+            logger.info(f"Early stopped after {self.model.n_iter_} iterations.")
+
+    def explain(self, x) -> pd.DataFrame:
+        """Per-feature contributions of each prediction, see `SKLearnPredictor`.
+
+        Saabas path contributions summed over the boosted trees, internal node
+        values are the count-weighted means of their leaves. The bias is the
+        baseline plus the root values. Only losses predicting the raw tree sum
+        are supported, e.g. not poisson or gamma.
+        """
+        if self.model.loss not in IDENTITY_LOSSES:
+            raise NotImplementedError(
+                f"explain of {self.model.loss} loss is not implemented, "
+                f"expected one of {IDENTITY_LOSSES}."
+            )
+
+        x = self._cast_features(x)
+        columns = x.columns if isinstance(x, pd.DataFrame) else None
+        x = np.asarray(x, dtype=np.float64)
+
+        known_cat_bitsets, f_idx_map = (
+            self.model._bin_mapper.make_known_categories_bitsets()
+        )
+        contributions = np.zeros_like(x)
+        bias = float(np.ravel(self.model._baseline_prediction)[0])
+        for (tree,) in self.model._predictors:
+            tree_contributions, tree_bias = _hist_tree_contributions(
+                tree, x, known_cat_bitsets, f_idx_map
+            )
+            contributions += tree_contributions
+            bias += tree_bias
+
+        result = pd.DataFrame(contributions, columns=columns)
+        result[BIAS] = bias
+        return result
+
+    def predict(self, x) -> np.ndarray:
+        """Predict with the fitted trees."""
+        x = self._cast_features(x)
+        x = x.to_numpy() if isinstance(x, pd.DataFrame) else x
+
+        with threadpool_limits(limits=self.n_threads, user_api="openmp"):
+            return self.model.predict(x)
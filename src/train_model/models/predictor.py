@@ -2,16 +2,23 @@
 
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from pathlib import Path
 
 import numpy as np
 import omegaconf
+import pandas as pd
+import scipy.sparse
 import sklearn
 
+from ..data_preprocessor import DEFAULT_PRECISION, PRECISION
 from ..utils import utils
 
 logger = logging.getLogger(__name__)
 
+# column of explain holding the part of the prediction not attributed to a feature
+BIAS = "bias"
+
 
 class Predictor(ABC):
     """Defining methods for training pipeline."""
@@ -31,6 +38,56 @@ class Predictor(ABC):
         """Method to save the model as an object."""
         ...
 
+    def predict_chunks(self, x, chunk_size: int = 100_000) -> np.ndarray:
+        """Predict in chunks of rows, e.g. over a memory-mapped feature matrix.
+
+        Only a single chunk is paged into memory at a time.
+        """
+        ypred = np.empty(len(x), dtype=np.float64)
+        for start in range(0, len(x), chunk_size):
+            ypred[start : start + chunk_size] = self.predict(
+                x[start : start + chunk_size]
+            )
+
+        return ypred
+
+    def explain(self, x) -> pd.DataFrame:
+        """Per-feature contributions of each prediction, see `SKLearnPredictor`.
+
+        Returns one column per feature and a `bias` column, each row sums to the
+        prediction.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement explain.")
+
+
+def _tree_contributions(tree, x: np.ndarray) -> tuple[np.ndarray, float]:
+    """Saabas contributions of a fitted sklearn tree for a batch of rows.
+
+    Walking down the tree, every split moves the node value by the value of the
+    child minus the value of the parent, credited to the split feature. With the
+    decision path as a sparse (rows x nodes) indicator this is a single sparse
+    product with a (nodes x features) matrix of those moves.
+    """
+    structure = tree.tree_
+    value = structure.value[:, 0, 0]
+    n_nodes = structure.node_count
+
+    parent = np.full(n_nodes, -1)
+    for children in (structure.children_left, structure.children_right):
+        is_split = children >= 0
+        parent[children[is_split]] = np.flatnonzero(is_split)
+
+    child = np.flatnonzero(parent >= 0)
+    moves = scipy.sparse.csr_matrix(
+        (
+            value[child] - value[parent[child]],
+            (child, structure.feature[parent[child]]),
+        ),
+        shape=(n_nodes, x.shape[1]),
+    )
+    contributions = tree.decision_path(x) @ moves
+    return contributions.toarray(), value[0]
+
 
 class SKLearnPredictor(Predictor):
     """SKLearn related models Predictor implemented here.
@@ -42,10 +99,21 @@ class SKLearnPredictor(Predictor):
         self,
         params: omegaconf.DictConfig,
         model: sklearn.base.BaseEstimator,
+        precision: str = DEFAULT_PRECISION,
     ):
-        """Initialize to ingest yaml config params."""
+        """Initialize to ingest yaml config params.
+
+        precision casts features to the given dtype, e.g. "float32", before fit and
+        predict, the same dtype as the preprocessor outputs so no copy is made.
+        """
+        if PRECISION.get(precision) is None:
+            raise NotImplementedError(
+                f"{precision} precision is not implemented, "
+                f"expected one of {list(PRECISION)}."
+            )
         self.params = params
         self.model_obj = model
+        self.precision = precision
 
         self._initialize_model()
 
@@ -54,15 +122,85 @@ class SKLearnPredictor(Predictor):
         logger.debug("Initializing model with model and params.")
         self.model = self.model_obj(**self.params)
 
+    def _cast_features(self, x):
+        """Cast features to the configured precision, no copy if already cast."""
+        if isinstance(x, pd.DataFrame):
+            if (x.dtypes == self.precision).all():
+                return x
+            return x.astype(self.precision)
+
+        return np.asarray(x).astype(self.precision, copy=False)
+
     def fit(self, x, y):
-        """SKLearn's fit method."""
+        """SKLearn's fit method.
+
+        Feature means are kept on the model to centre linear model explanations.
+        """
+        x = self._cast_features(x)
         self.model.fit(x, y)
+        if hasattr(self.model, "coef_"):
+            # accumulate in float64 without a float64 copy of float32 features
+            self.model.feature_means_ = np.asarray(x).mean(axis=0, dtype=np.float64)
+
+    def fit_chunks(self, chunks: Iterable[tuple[np.ndarray, np.ndarray]]) -> None:
+        """Fit the model incrementally over (x, y) chunks with `partial_fit`.
+
+        Only supported for estimators implementing `partial_fit` such as SGDRegressor,
+        the only out-of-core training path. `fit` on a memory-mapped matrix pages
+        the whole matrix into memory.
+        """
+        if not hasattr(self.model, "partial_fit"):
+            raise NotImplementedError(
+                f"{self.model.__class__.__name__} does not implement partial_fit."
+            )
+
+        for x, y in chunks:
+            self.model.partial_fit(self._cast_features(x), y)
 
     def predict(self, x) -> np.ndarray:
         """SKLearn's predict method."""
-        ypred = self.model.predict(x)
+        ypred = self.model.predict(self._cast_features(x))
         return ypred
 
+    def explain(self, x) -> pd.DataFrame:
+        """Per-feature contributions of each prediction for a whole batch.
+
+        Linear models: coefficients times the features centred on the training
+        means, the bias is the prediction at the means. Tree models (decision trees,
+        random forests, extra trees): Saabas path contributions averaged over trees,
+        the bias is the mean root value. Histogram gradient boosting is explained
+        by `HistGradientBoostingPredictor`.
+        """
+        x = self._cast_features(x)
+        columns = x.columns if isinstance(x, pd.DataFrame) else None
+        x = np.asarray(x, dtype=np.float64)
+
+        if hasattr(self.model, "coef_"):
+            coef = np.ravel(self.model.coef_)
+            means = getattr(self.model, "feature_means_", np.zeros(x.shape[1]))
+            contributions = (x - means) * coef
+            bias = np.ravel(self.model.intercept_)[0] + means @ coef
+        elif hasattr(self.model, "tree_") or hasattr(self.model, "estimators_"):
+            trees = getattr(self.model, "estimators_", [self.model])
+            if not all(hasattr(t, "tree_") for t in trees):
+                raise NotImplementedError(
+                    f"{self.model.__class__.__name__} is not supported by explain."
+                )
+            contributions = np.zeros_like(x)
+            bias = 0.0
+            for tree in trees:
+                tree_contributions, tree_bias = _tree_contributions(tree, x)
+                contributions += tree_contributions / len(trees)
+                bias += tree_bias / len(trees)
+        else:
+            raise NotImplementedError(
+                f"{self.model.__class__.__name__} is not supported by explain."
+            )
+
+        result = pd.DataFrame(contributions, columns=columns)
+        result[BIAS] = bias
+        return result
+
     def save(self, save_path: str | Path) -> None:
         """Saving the model object as pickle file."""
         if isinstance(save_path, str):
@@ -73,3 +211,20 @@ class SKLearnPredictor(Predictor):
 
         m_file_path = Path(save_path, model_name)
         utils.save_object(self.model, m_file_path)
+
+    @classmethod
+    def load(
+        cls,
+        load_path: str | Path,
+        params: omegaconf.DictConfig,
+        model: sklearn.base.BaseEstimator,
+        **kwargs,
+    ) -> "SKLearnPredictor":
+        """Load a model saved by `save` from load_path folder."""
+        predictor = cls(params, model, **kwargs)
+        model_name = predictor.model.__class__.__name__.lower()
+        logger.debug(f"Loading model {model_name} from {load_path} folder.")
+
+        m_file_path = Path(load_path, model_name + ".pkl")
+        predictor.model = utils.load_object(m_file_path)
+        return predictor
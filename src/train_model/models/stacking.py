@@ -0,0 +1,228 @@
+"""Stacking ensemble of predictors blended by a meta-model."""
+
+import copy
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import omegaconf
+import pandas as pd
+import sklearn
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import KFold
+from threadpoolctl import threadpool_limits
+
+from ..data_preprocessor import DEFAULT_PRECISION
+from ..utils import utils
+from .predictor import Predictor, SKLearnPredictor
+
+logger = logging.getLogger(__name__)
+
+# defaults for params not set in config
+STACKING_DEFAULTS = {
+    "n_splits": 5,
+    "shuffle": True,
+    "random_state": 0,
+    "n_jobs": None,
+    "meta_params": {},
+}
+
+
+def _call_limited(n_threads: int, func, *args):
+    """Call func with OpenMP threads of the calling thread limited to n_threads."""
+    with threadpool_limits(limits=n_threads, user_api="openmp"):
+        return func(*args)
+
+
+def _take_rows(x, index: np.ndarray):
+    """Rows of a dataframe, array or sparse matrix by position."""
+    return x.iloc[index] if isinstance(x, pd.DataFrame) else x[index]
+
+
+class StackingPredictor(Predictor):
+    """Base predictors blended by a meta-model fitted on out-of-fold predictions.
+
+    Every base predictor is fitted on the same `n_splits` folds, so the meta-model
+    sees out-of-fold predictions of all base models for the same rows. The
+    (base model, fold) fits and the final refits on all rows run concurrently on
+    `n_jobs` threads, estimators release the GIL in their fitting routines. Fold
+    fits copy unfitted templates taken before any fit starts, never a base model
+    being refitted. At predict time base models also run concurrently. Each
+    concurrent task limits its OpenMP threads to its share of the cores, so e.g.
+    gradient boosting fits do not each start a thread per core.
+
+    Each base model has the same keys as the `model` config, `columns` optionally
+    selects the feature columns it is fitted on, e.g. one-hot columns for a linear
+    model and integer codes for gradient boosting from the same preprocessor.
+    `model` is the meta-model, fitted on base predictions in config order.
+
+    Example config:
+        predictor_path: train_model.models.StackingPredictor
+        model_object: sklearn.linear_model.LinearRegression
+        params:
+          n_splits: 5
+          n_jobs: 4
+          base_models:
+            - predictor_path: train_model.models.SKLearnPredictor
+              model_object: sklearn.linear_model.Ridge
+              params: {alpha: 1.0}
+            - predictor_path: train_model.models.HistGradientBoostingPredictor
+              model_object: sklearn.ensemble.HistGradientBoostingRegressor
+              params: {max_iter: 300}
+    """
+
+    def __init__(
+        self,
+        params: omegaconf.DictConfig,
+        model: sklearn.base.BaseEstimator = LinearRegression,
+        precision: str = DEFAULT_PRECISION,
+    ):
+        """Initialize to ingest yaml config params, base models are built unfitted."""
+        self.params = params
+        self.model_obj = model
+        self.precision = precision
+
+        self._initialize_model()
+
+    def _initialize_model(self):
+        """Initialize unfitted base predictors and the meta-model."""
+        params = {**STACKING_DEFAULTS, **self.params}
+        if not params.get("base_models"):
+            raise ValueError(f"{type(self).__name__} requires base_models in params.")
+
+        self.n_splits = params["n_splits"]
+        self.shuffle = params["shuffle"]
+        self.random_state = params["random_state"]
+        self.n_jobs = params["n_jobs"]
+
+        self.base_columns = []
+        self.base_predictors = []
+        for base in params["base_models"]:
+            predictor_cls = utils.load_func(base["predictor_path"])
+            self.base_predictors.append(
+                predictor_cls(
+                    base.get("params", {}),
+                    utils.load_func(base["model_object"]),
+                    precision=self.precision,
+                )
+            )
+            columns = base.get("columns")
+            self.base_columns.append(None if columns is None else list(columns))
+
+        self.meta_predictor = SKLearnPredictor(params["meta_params"], self.model_obj)
+
+    def _base_features(self, i: int, x):
+        """Feature columns of base model i."""
+        columns = self.base_columns[i]
+        if columns is None:
+            return x
+        if not isinstance(x, pd.DataFrame):
+            raise TypeError("Base model columns are given by name, use a dataframe.")
+        return x[columns]
+
+    def _n_threads(self, n_tasks: int) -> int:
+        """OpenMP threads of each of n_tasks running on the thread pool."""
+        n_cores = os.cpu_count() or 1
+        # the ThreadPoolExecutor default of max_workers
+        n_workers = self.n_jobs or min(32, n_cores + 4)
+        return max(1, n_cores // min(n_workers, n_tasks))
+
+    def _fit_predict(
+        self, i: int, template: Predictor, x, y, train_index, predict_index
+    ) -> np.ndarray:
+        """Fit a copy of the unfitted base model i on train rows, predict the others."""
+        predictor = copy.deepcopy(template)
+        x = self._base_features(i, x)
+        predictor.fit(_take_rows(x, train_index), y[train_index])
+        return predictor.predict(_take_rows(x, predict_index))
+
+    def _fit_base(self, i: int, x, y) -> None:
+        """Fit base model i on all rows."""
+        self.base_predictors[i].fit(self._base_features(i, x), y)
+
+    def fit(self, x, y):
+        """Fit the meta-model on out-of-fold predictions, then refit base models."""
+        y = np.asarray(y)
+        n_base = len(self.base_predictors)
+        kfold = KFold(
+            self.n_splits, shuffle=self.shuffle, random_state=self.random_state
+        )
+        folds = list(kfold.split(np.empty((len(y), 1))))
+
+        self.oof_predictions_ = np.empty((len(y), n_base), dtype=np.float64)
+        # copied before the refits below start mutating the base predictors
+        templates = copy.deepcopy(self.base_predictors)
+        n_threads = self._n_threads(n_base * (len(folds) + 1))
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+            oof = {
+                (i, k): executor.submit(
+                    _call_limited,
+                    n_threads,
+                    self._fit_predict,
+                    i,
+                    templates[i],
+                    x,
+                    y,
+                    *fold,
+                )
+                for i in range(n_base)
+                for k, fold in enumerate(folds)
+            }
+            refits = [
+                executor.submit(_call_limited, n_threads, self._fit_base, i, x, y)
+                for i in range(n_base)
+            ]
+
+            for (i, k), future in oof.items():
+                self.oof_predictions_[folds[k][1], i] = future.result()
+            for future in refits:
+                future.result()
+
+        self.meta_predictor.fit(self.oof_predictions_, y)
+        logger.info(
+            f"Fitted meta-model on out-of-fold predictions of {n_base} base models."
+        )
+
+    def predict_base(self, x) -> np.ndarray:
+        """Predictions of every base model, one column per base model."""
+        n_threads = self._n_threads(len(self.base_predictors))
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+            futures = [
+                executor.submit(
+                    _call_limited,
+                    n_threads,
+                    predictor.predict,
+                    self._base_features(i, x),
+                )
+                for i, predictor in enumerate(self.base_predictors)
+            ]
+            return np.column_stack([future.result() for future in futures])
+
+    def predict(self, x) -> np.ndarray:
+        """Blend concurrent base model predictions with the meta-model."""
+        return self.meta_predictor.predict(self.predict_base(x))
+
+    def save(self, save_path: str | Path) -> None:
+        """Save the whole ensemble as a single pickle file."""
+        if isinstance(save_path, str):
+            save_path = Path(save_path)
+
+        logger.debug(f"Saving stacking ensemble into {save_path} folder.")
+        utils.save_object(self, Path(save_path, type(self).__name__.lower()))
+
+    @classmethod
+    def load(
+        cls,
+        load_path: str | Path,
+        params: omegaconf.DictConfig | None = None,
+        model: sklearn.base.BaseEstimator | None = None,
+        **kwargs,
+    ) -> "StackingPredictor":
+        """Load an ensemble saved by `save` from load_path folder.
+
+        Takes the arguments of `SKLearnPredictor.load` so callers can load any
+        predictor alike, they are ignored as the pickle holds the whole ensemble.
+        """
+        return utils.load_object(Path(load_path, cls.__name__.lower() + ".pkl"))
@@ -0,0 +1,282 @@
+"""Module for a lightweight local DAG runner of pipeline stages."""
+
+import hashlib
+import json
+import logging
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import omegaconf
+
+from .utils import utils
+
+logger = logging.getLogger(__name__)
+
+# suffix of the file next to a stage's first output recording its config hash
+STAMP_SUFFIX = ".stage"
+
+
+class Stage:
+    """A pipeline step declaring the files it reads and writes.
+
+    `func` is called as `func(args, inputs, outputs, **kwargs)` and must write all
+    of `outputs`. Stages depend on the stages writing their inputs. `params` are
+    the dotted keys of `args` the stage reads, e.g. "sample", they are hashed with
+    the function and kwargs so that a config change re-runs the stage.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        inputs: list[str | Path] | None = None,
+        outputs: list[str | Path] | None = None,
+        kwargs: dict | None = None,
+        params: list[str] | None = None,
+    ) -> None:
+        """Initialize stage with its function and declared files."""
+        self.name = name
+        self.func = func
+        self.inputs = [Path(p) for p in inputs or []]
+        self.outputs = [Path(p) for p in outputs or []]
+        self.kwargs = kwargs or {}
+        self.params = list(params or [])
+
+    def __repr__(self) -> str:
+        """Stage name with its declared files."""
+        return f"Stage({self.name}, inputs={self.inputs}, outputs={self.outputs})"
+
+    @property
+    def stamp_path(self) -> Path | None:
+        """File recording the config hash of the last successful run."""
+        if not self.outputs:
+            return None
+        return Path(self.outputs[0].parent, f".{self.name}{STAMP_SUFFIX}")
+
+    def config_hash(self, args: omegaconf.DictConfig) -> str:
+        """Hash of the function, kwargs and resolved `params` of args."""
+        params = {}
+        for key in self.params:
+            value = omegaconf.OmegaConf.select(args, key)
+            if isinstance(value, omegaconf.Container):
+                value = omegaconf.OmegaConf.to_container(value, resolve=True)
+            params[key] = value
+
+        config = {
+            "func": f"{self.func.__module__}.{self.func.__qualname__}",
+            "kwargs": self.kwargs,
+            "params": params,
+        }
+        return hashlib.sha1(
+            json.dumps(config, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def stale_reason(self, args: omegaconf.DictConfig | None = None) -> str | None:
+        """Why the stage has to run based on its own files, None if up to date.
+
+        The config hash is only compared if args is given and a previous run
+        recorded one, outputs written outside the pipeline are trusted.
+        """
+        if not self.outputs:
+            return "no outputs declared"
+
+        missing = [p for p in self.outputs if not p.exists()]
+        if missing:
+            return f"missing output {missing[0]}"
+
+        missing = [p for p in self.inputs if not p.exists()]
+        if missing:
+            return f"missing input {missing[0]}"
+
+        newest_input = max((p.stat().st_mtime for p in self.inputs), default=None)
+        oldest_output = min(p.stat().st_mtime for p in self.outputs)
+        if newest_input is not None and newest_input > oldest_output:
+            return "inputs newer than outputs"
+
+        if (
+            args is not None
+            and self.stamp_path.is_file()
+            and self.stamp_path.read_text() != self.config_hash(args)
+        ):
+            return "config changed"
+
+        return None
+
+    def run(self, args: omegaconf.DictConfig) -> None:
+        """Run the stage function, check it wrote all outputs and record its hash."""
+        for p in self.outputs:
+            p.parent.mkdir(parents=True, exist_ok=True)
+
+        self.func(args, self.inputs, self.outputs, **self.kwargs)
+
+        missing = [p for p in self.outputs if not p.exists()]
+        if missing:
+            raise FileNotFoundError(f"Stage {self.name} did not write {missing}")
+
+        if self.stamp_path is not None:
+            self.stamp_path.write_text(self.config_hash(args))
+
+
+class Pipeline:
+    """DAG of stages, only stale stages run and independent stages run in parallel.
+
+    A stage is stale if forced, an output is missing, an input is newer than its
+    outputs, its config changed since its last run, or an upstream stage is stale.
+    """
+
+    def __init__(self, stages: list[Stage]) -> None:
+        """Initialize pipeline and resolve dependencies from declared files."""
+        self.stages = {s.name: s for s in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique.")
+
+        producers = {}
+        for stage in stages:
+            for p in stage.outputs:
+                if p in producers:
+                    raise ValueError(
+                        f"{p} is an output of both {producers[p]} and {stage.name}."
+                    )
+                producers[p] = stage.name
+
+        self.upstream = {
+            s.name: sorted({producers[p] for p in s.inputs if p in producers})
+            for s in stages
+        }
+        self.order = self._topological_order()
+
+    @classmethod
+    def from_config(cls, stages_cfg: omegaconf.DictConfig) -> "Pipeline":
+        """Build pipeline from config stages of `func`, `inputs`, `outputs`, `kwargs`.
+
+        `func` is the dotpath of the stage function, e.g. "train_model.stages.clean",
+        the optional `params` are the config keys the stage reads from args.
+        """
+        stages = []
+        for name, cfg in stages_cfg.items():
+            kwargs = cfg.get("kwargs")
+            if kwargs is not None:
+                kwargs = omegaconf.OmegaConf.to_container(kwargs, resolve=True)
+
+            stages.append(
+                Stage(
+                    name,
+                    utils.load_func(cfg.func),
+                    inputs=cfg.get("inputs"),
+                    outputs=cfg.get("outputs"),
+                    kwargs=kwargs,
+                    params=cfg.get("params"),
+                )
+            )
+        return cls(stages)
+
+    def _topological_order(self) -> list[str]:
+        """Order stages so every stage comes after its upstream stages."""
+        n_upstream = {name: len(up) for name, up in self.upstream.items()}
+        ready = [name for name, n in n_upstream.items() if n == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for downstream in self.downstream(name):
+                n_upstream[downstream] -= 1
+                if n_upstream[downstream] == 0:
+                    ready.append(downstream)
+
+        if len(order) != len(self.stages):
+            cycle = sorted(set(self.stages) - set(order))
+            raise ValueError(f"Stages {cycle} have cyclic dependencies.")
+        return order
+
+    def downstream(self, name: str) -> list[str]:
+        """Stages reading an output of the stage."""
+        return [s for s, up in self.upstream.items() if name in up]
+
+    def plan(
+        self,
+        force: list[str] | None = None,
+        args: omegaconf.DictConfig | None = None,
+    ) -> dict[str, str]:
+        """Stages that would run in execution order, with the reason to run.
+
+        Config changes are only detected if args is given.
+        """
+        force = set(force or [])
+        unknown = force - set(self.stages)
+        if unknown:
+            raise KeyError(
+                f"Unknown stages {sorted(unknown)} to force.",
+                f"Expected the followings from {self.order}",
+            )
+
+        stale = {}
+        for name in self.order:
+            if name in force:
+                stale[name] = "forced"
+                continue
+
+            stale_upstream = [up for up in self.upstream[name] if up in stale]
+            if stale_upstream:
+                stale[name] = f"upstream {stale_upstream[0]} runs"
+                continue
+
+            reason = self.stages[name].stale_reason(args)
+            if reason is not None:
+                stale[name] = reason
+
+        return stale
+
+    def run(
+        self,
+        args: omegaconf.DictConfig,
+        n_jobs: int = 1,
+        force: list[str] | None = None,
+        dry_run: bool = False,
+    ) -> list[str]:
+        """Run stale stages, a stage starts as soon as its upstream stages finish.
+
+        Args:
+            args (omegaconf.DictConfig): Config passed to every stage function.
+            n_jobs (int, optional): Stages to run concurrently. Defaults to 1.
+            force (list[str], optional): Stages to run even if up to date.
+            dry_run (bool, optional): Only log what would run. Defaults to False.
+
+        Returns:
+            list[str]: Stages run (or to run if dry_run) in completion order.
+        """
+        plan = self.plan(force, args)
+        for name in self.order:
+            status = f"run ({plan[name]})" if name in plan else "up to date"
+            logger.info(f"{'[dry run] ' if dry_run else ''}{name}: {status}")
+
+        if dry_run or not plan:
+            return list(plan)
+
+        done = []
+        pending = set(plan)
+        running = {}
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            while pending or running:
+                blocked = pending | set(running.values())
+                for name in [n for n in self.order if n in pending]:
+                    if not blocked.intersection(self.upstream[name]):
+                        pending.remove(name)
+                        future = executor.submit(self.stages[name].run, args)
+                        running[future] = name
+                        logger.info(f"Started stage {name}")
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception:
+                        logger.error(f"Stage {name} failed, cancelling pending stages")
+                        for other in running:
+                            other.cancel()
+                        raise
+                    done.append(name)
+                    logger.info(f"Finished stage {name}")
+
+        return done
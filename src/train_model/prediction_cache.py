@@ -0,0 +1,174 @@
+"""Module for an LRU prediction cache keyed on normalised input features."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from . import data_model, data_preprocessor
+from .models import Predictor
+from .registry import ModelBundle
+from .utils.sketches import hash_values
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = list(data_model.HDBFeatureData.model_fields)
+
+
+class CachedPredictor:
+    """Predict raw records through an LRU/TTL cache, computing only cache misses.
+
+    Records are normalised before keying and predicting, strings are stripped and
+    numbers rounded to `decimals`, so records sharing a key get the same prediction
+    whichever of them is cached first. Entries are evicted least recently used first
+    beyond `max_entries` and expire after `ttl` seconds. Setting a model with a
+    different version clears the cache.
+    """
+
+    def __init__(
+        self,
+        preprocessor: data_preprocessor.HdbDataPreprocessor,
+        predictor: Predictor,
+        version: str | None = None,
+        max_entries: int = 100_000,
+        ttl: float | None = None,
+        decimals: int = 2,
+    ) -> None:
+        """Initialize an empty cache in front of the preprocessor and predictor."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.decimals = decimals
+        self._entries: OrderedDict[int, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bundle = ModelBundle(version, preprocessor, predictor, {})
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def version(self) -> str | None:
+        """Model version of the cached predictions."""
+        return self._bundle.version
+
+    def set_model(
+        self,
+        preprocessor: data_preprocessor.HdbDataPreprocessor,
+        predictor: Predictor,
+        version: str | None,
+    ) -> None:
+        """Swap the model, cached predictions are dropped if the version changed."""
+        bundle = ModelBundle(version, preprocessor, predictor, {})
+        with self._lock:
+            if version != self.version:
+                logger.info(f"Clearing prediction cache for model version {version}")
+                self._entries.clear()
+            self._bundle = bundle
+
+    def clear(self) -> None:
+        """Drop all cached predictions."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Number of cached predictions."""
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Hit, miss and eviction counts of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def normalise(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Strip strings and round numbers of the feature columns."""
+        data = data.copy()
+        for col in [col for col in KEY_COLUMNS if col in data.columns]:
+            values = data[col]
+            if pd.api.types.is_numeric_dtype(values):
+                data[col] = values.round(self.decimals)
+            else:
+                data[col] = values.map(lambda v: v.strip() if isinstance(v, str) else v)
+
+        return data
+
+    def feature_keys(self, data: pd.DataFrame) -> np.ndarray:
+        """Hash feature columns of each normalised record."""
+        key_columns = [col for col in KEY_COLUMNS if col in data.columns]
+        keyed = {}
+        for col in key_columns:
+            values = data[col]
+            if pd.api.types.is_numeric_dtype(values):
+                keyed[col] = values.astype(np.float64)
+            else:
+                keyed[col] = values.astype(str)
+
+        return hash_values(pd.DataFrame(keyed, index=data.index))
+
+    def predict(self, data: pd.DataFrame) -> np.ndarray:
+        """Predict raw records, see `predict_with_version`."""
+        return self.predict_with_version(data)[1]
+
+    def predict_with_version(self, data: pd.DataFrame) -> tuple[str, np.ndarray]:
+        """Predict raw records, only records missing from the cache are computed.
+
+        Returns:
+            tuple[str, np.ndarray]: (version used, predictions)
+        """
+        data = self.normalise(data)
+        keys = self.feature_keys(data)
+        ypred = np.empty(len(keys), dtype=np.float64)
+        is_miss = np.zeros(len(keys), dtype=bool)
+
+        with self._lock:
+            bundle = self._bundle
+            now = time.monotonic()
+            for i, key in enumerate(keys.tolist()):
+                entry = self._entries.get(key)
+                if entry is None or entry[1] < now:
+                    is_miss[i] = True
+                    continue
+                self._entries.move_to_end(key)
+                ypred[i] = entry[0]
+
+            n_miss = int(is_miss.sum())
+            self.hits += len(keys) - n_miss
+            self.misses += n_miss
+
+        if not is_miss.any():
+            return bundle.version, ypred
+
+        # duplicated records within the batch are computed once
+        miss_keys, first_index, inverse = np.unique(
+            keys[is_miss], return_index=True, return_inverse=True
+        )
+        miss_positions = np.flatnonzero(is_miss)[first_index]
+        miss_pred = np.asarray(bundle.predict(data.iloc[miss_positions]))
+        ypred[is_miss] = miss_pred[inverse]
+
+        with self._lock:
+            # skip results of a model swapped out while computing
+            if bundle is self._bundle:
+                self._insert(miss_keys.tolist(), miss_pred.tolist())
+
+        return bundle.version, ypred
+
+    def _insert(self, keys: list[int], values: list[float]) -> None:
+        """Insert predictions and evict least recently used beyond max_entries."""
+        expiry = np.inf if self.ttl is None else time.monotonic() + self.ttl
+        for key, value in zip(keys, values):
+            self._entries[key] = (value, expiry)
+            self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
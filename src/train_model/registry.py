@@ -0,0 +1,272 @@
+"""Module for a local file-based registry of versioned model bundles."""
+
+import fcntl
+import json
+import logging
+import os
+import shutil
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import omegaconf
+import pandas as pd
+
+from . import data_cleaner, data_preprocessor
+from .models import Predictor
+from .utils import utils
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+LOCK_FILE = ".lock"
+METADATA_FILE = "metadata.json"
+
+
+def version_number(version: str) -> int:
+    """Number of a "v0001" style version."""
+    return int(version.lstrip("v"))
+
+
+class ModelBundle:
+    """Fitted preprocessor, predictor and metadata of a single model version."""
+
+    def __init__(
+        self,
+        version: str,
+        preprocessor: data_preprocessor.HdbDataPreprocessor,
+        predictor: Predictor,
+        metadata: dict[str, Any],
+    ) -> None:
+        """Initialize bundle with loaded artefacts."""
+        self.version = version
+        self.preprocessor = preprocessor
+        self.predictor = predictor
+        self.metadata = metadata
+        self.cleaner = data_cleaner.HdbDataCleaner()
+
+    def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Clean and feature engineer raw records for transform."""
+        data = self.cleaner.clean_data(data)
+        return self.preprocessor.feature_engineer(data)
+
+    def predict(self, data: pd.DataFrame) -> np.ndarray:
+        """Predict raw records end to end."""
+        features = self.preprocessor.transform_data(self.prepare(data))
+        return self.predictor.predict(features)
+
+    def explain(self, data: pd.DataFrame) -> tuple[np.ndarray, pd.DataFrame]:
+        """Predict raw records with contributions summed by input column.
+
+        Returns:
+            tuple[np.ndarray, pd.DataFrame]: (predictions, contributions)
+        """
+        features = self.preprocessor.transform_data(self.prepare(data))
+        contributions = self.predictor.explain(features)
+        return (
+            self.predictor.predict(features),
+            self.preprocessor.aggregate_contributions(contributions),
+        )
+
+
+class ModelRegistry:
+    """Versioned model bundles stored as folders with a json index.
+
+    Layout:
+        <root>/index.json                 {"versions": [...], "current": "v0002"}
+        <root>/<version>/preprocessor.pkl
+        <root>/<version>/predictor.pkl
+        <root>/<version>/metadata.json
+
+    Bundles are written into a temp folder and renamed, the index is replaced
+    atomically, so readers only ever see complete versions. A new version number
+    is claimed by exclusively creating its temp folder, and claims, renames and
+    index updates hold a file lock, so concurrent `register` calls never share a
+    version. Bundles are written outside the lock.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        """Initialize registry in root folder."""
+        if isinstance(root, str):
+            root = Path(root)
+
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _read_index(self) -> dict:
+        """Read the registry index."""
+        index_path = Path(self.root, INDEX_FILE)
+        if not index_path.is_file():
+            return {"versions": [], "current": None}
+
+        with open(index_path) as f:
+            return json.load(f)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the registry across processes."""
+        with open(Path(self.root, LOCK_FILE), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _claim_version(self) -> tuple[str, Path]:
+        """Claim the next free version by creating its temp folder exclusively.
+
+        Call under `_lock`, renames to the final folder hold it too. Temp folders
+        left by a failed register keep their version unused.
+        """
+        number = len(self.versions()) + 1
+        while True:
+            version = f"v{number:04d}"
+            tmp_path = Path(self.root, version + ".tmp")
+            if not Path(self.root, version).exists():
+                try:
+                    tmp_path.mkdir()
+                    return version, tmp_path
+                except FileExistsError:
+                    pass
+            number += 1
+
+    def _write_index(self, index: dict) -> None:
+        """Replace the registry index atomically."""
+        tmp_path = Path(self.root, INDEX_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, Path(self.root, INDEX_FILE))
+
+    def versions(self) -> list[str]:
+        """All registered versions, oldest first."""
+        return self._read_index()["versions"]
+
+    def current_version(self) -> str | None:
+        """Version currently activated for serving."""
+        return self._read_index()["current"]
+
+    def register(
+        self,
+        preprocessor: data_preprocessor.HdbDataPreprocessor,
+        predictor: Predictor,
+        metadata: dict[str, Any] | None = None,
+        activate: bool | None = None,
+    ) -> str:
+        """Store fitted artefacts as a new version.
+
+        Args:
+            preprocessor (HdbDataPreprocessor): Fitted preprocessor.
+            predictor (Predictor): Fitted predictor.
+            metadata (dict, optional): Extra metadata, e.g. metrics. Defaults to None.
+            activate (bool, optional): Make it the current version, None makes it
+                current unless a newer version already is. Defaults to None.
+
+        Returns:
+            str: The new version.
+        """
+        with self._lock():
+            version, tmp_path = self._claim_version()
+        try:
+            self._write_bundle(tmp_path, version, preprocessor, predictor, metadata)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        with self._lock():
+            tmp_path.rename(Path(self.root, version))
+            index = self._read_index()
+            # overlapping registers finish in any order, keep versions sorted
+            index["versions"] = sorted(
+                [*index["versions"], version], key=version_number
+            )
+            current = index["current"]
+            if activate is None:
+                activate = current is None or (
+                    version_number(version) > version_number(current)
+                )
+            if activate:
+                index["current"] = version
+            self._write_index(index)
+
+        logger.info(f"Registered model version {version} in {self.root}")
+        return version
+
+    def _write_bundle(
+        self,
+        tmp_path: Path,
+        version: str,
+        preprocessor: data_preprocessor.HdbDataPreprocessor,
+        predictor: Predictor,
+        metadata: dict[str, Any] | None,
+    ) -> None:
+        """Write fitted artefacts and metadata of a version into tmp_path."""
+        save_bundle(tmp_path, preprocessor, predictor, metadata, version=version)
+
+    def activate(self, version: str) -> None:
+        """Set the current version, e.g. to roll back."""
+        with self._lock():
+            index = self._read_index()
+            if version not in index["versions"]:
+                raise KeyError(
+                    f"Version {version} is not registered.",
+                    f"Expected the followings from {index['versions']}",
+                )
+
+            index["current"] = version
+            self._write_index(index)
+        logger.info(f"Activated model version {version}")
+
+    def load(self, version: str | None = None) -> ModelBundle:
+        """Load a version, the current version if None."""
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"No model version registered in {self.root}")
+
+        return load_bundle(Path(self.root, version), version=version)
+
+
+def save_bundle(
+    folder: str | Path,
+    preprocessor: data_preprocessor.HdbDataPreprocessor,
+    predictor: Predictor,
+    metadata: dict[str, Any] | None = None,
+    version: str | None = None,
+) -> None:
+    """Write fitted artefacts and metadata into a bundle folder.
+
+    A bundle is the layout of a registry version, the training pipeline writes
+    one per model and batch scoring reads them, see `load_bundle`.
+    """
+    Path(folder).mkdir(parents=True, exist_ok=True)
+    if not preprocessor._preprocessors:
+        preprocessor.load_preprocessors()
+
+    utils.save_object(preprocessor, Path(folder, "preprocessor"))
+    utils.save_object(predictor, Path(folder, "predictor"))
+
+    metadata = {
+        **(metadata or {}),
+        "version": version,
+        "created_at": datetime.now(UTC).isoformat(),
+        "predictor": type(predictor).__name__,
+        "preprocess": omegaconf.OmegaConf.to_container(
+            omegaconf.OmegaConf.create(preprocessor.params)
+        ),
+    }
+    with open(Path(folder, METADATA_FILE), "w") as f:
+        json.dump(metadata, f, indent=2, default=str)
+
+
+def load_bundle(folder: str | Path, version: str | None = None) -> ModelBundle:
+    """Load a bundle folder written by `save_bundle`."""
+    preprocessor = utils.load_object(Path(folder, "preprocessor.pkl"))
+    predictor = utils.load_object(Path(folder, "predictor.pkl"))
+    with open(Path(folder, METADATA_FILE)) as f:
+        metadata = json.load(f)
+
+    return ModelBundle(
+        version or metadata.get("version"), preprocessor, predictor, metadata
+    )
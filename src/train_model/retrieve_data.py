@@ -1,8 +1,14 @@
 """Module to retrieve the data from API."""
 
+import gzip
+import hashlib
+import json
 import logging
 import os
+from datetime import UTC, datetime
+from pathlib import Path
 from typing import Any
+from urllib.parse import parse_qs, urlparse
 
 import dotenv
 import requests
@@ -22,18 +28,160 @@ API_URL = os.getenv("API_URL")
 #     raise ValueError(error_msg)
 
 
-def get_single_response(api_url: str):
+class LandingZone:
+    """Local landing zone for raw API pages.
+
+    Page bodies are gzip compressed and content addressed, so a stored page is never
+    modified. An index entry per url keeps the latest page with its offset and the
+    ETag / Last-Modified headers used for conditional requests. Every completed
+    fetch records a run manifest of the entries it read, replay uses the latest.
+
+    Layout:
+        <root>/pages/<sha256 of body>.json.gz
+        <root>/index/<sha256 of url>.json
+        <root>/runs/<completion time>.json
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        """Initialize landing zone folders in root."""
+        if isinstance(root, str):
+            root = Path(root)
+
+        self.pages_path = Path(root, "pages")
+        self.index_path = Path(root, "index")
+        self.runs_path = Path(root, "runs")
+        self.pages_path.mkdir(parents=True, exist_ok=True)
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        self.runs_path.mkdir(parents=True, exist_ok=True)
+
+    def _index_file(self, url: str) -> Path:
+        """Index file of a url."""
+        return Path(self.index_path, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def get_entry(self, url: str) -> dict | None:
+        """Index entry of a url, None if the url was never fetched."""
+        index_file = self._index_file(url)
+        if not index_file.is_file():
+            return None
+
+        with open(index_file) as f:
+            return json.load(f)
+
+    def read_page(self, entry: dict) -> dict[str, Any]:
+        """Decompress and parse the page of an index entry."""
+        with gzip.open(Path(self.pages_path, entry["page"]), "rb") as f:
+            return json.loads(f.read())
+
+    def put(self, url: str, body: bytes, headers: dict[str, str]) -> dict:
+        """Store a page body and point the url index entry to it."""
+        page_name = hashlib.sha256(body).hexdigest() + ".json.gz"
+        page_file = Path(self.pages_path, page_name)
+        if not page_file.is_file():
+            _atomic_write(page_file, gzip.compress(body))
+
+        entry = {
+            "url": url,
+            "offset": _get_offset(url),
+            "page": page_name,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": datetime.now(UTC).isoformat(),
+        }
+        _atomic_write(self._index_file(url), json.dumps(entry).encode())
+        return entry
+
+    def entries(self) -> list[dict]:
+        """All index entries sorted by offset."""
+        entries = []
+        for index_file in self.index_path.glob("*.json"):
+            with open(index_file) as f:
+                entries.append(json.load(f))
+
+        return sorted(entries, key=lambda e: e["offset"])
+
+    def commit_run(self, entries: list[dict]) -> Path:
+        """Record the entries read by a completed fetch, in fetch order."""
+        completed_at = datetime.now(UTC)
+        run_file = Path(self.runs_path, completed_at.strftime("%Y%m%dT%H%M%S%fZ.json"))
+        run = {"completed_at": completed_at.isoformat(), "entries": entries}
+        _atomic_write(run_file, json.dumps(run).encode())
+        return run_file
+
+    def latest_run(self) -> list[dict] | None:
+        """Entries of the latest completed fetch, None if no fetch completed."""
+        run_files = sorted(self.runs_path.glob("*.json"))
+        if not run_files:
+            return None
+
+        with open(run_files[-1]) as f:
+            return json.load(f)["entries"]
+
+
+def _atomic_write(file_path: Path, content: bytes) -> None:
+    """Write content into a temp file and rename it so readers never see partials."""
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, file_path)
+
+
+def _get_offset(url: str) -> int:
+    """Offset query parameter of an api url, 0 if not present."""
+    offset = parse_qs(urlparse(url).query).get("offset", ["0"])
+    return int(offset[0])
+
+
+def get_single_response(api_url: str, headers: dict[str, str] | None = None):
     """Get a single api call response."""
-    response = requests.get(api_url)
+    response = requests.get(api_url, headers=headers)
 
     return response
 
 
-def get_multiple_offset_response(entry_number: int = 500) -> list[dict[str, Any]]:
-    """To call multiple api calls using offset."""
-    response = get_single_response(API_URL)
-
-    resp = response.json()
+def get_page(
+    api_url: str,
+    landing_zone: LandingZone | None = None,
+    run: list[dict] | None = None,
+) -> dict[str, Any]:
+    """Get a single api page as json, through the landing zone if provided.
+
+    Pages already in the landing zone are revalidated with a conditional request,
+    a 304 Not Modified response is served from the local copy. The index entry of
+    the page is appended to run if provided.
+    """
+    if landing_zone is None:
+        return get_single_response(api_url).json()
+
+    entry = landing_zone.get_entry(api_url)
+    headers = {}
+    if entry is not None:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = get_single_response(api_url, headers=headers)
+
+    if response.status_code == 304 and entry is not None:
+        logger.debug(f"{api_url} not modified, reading from landing zone")
+    else:
+        response.raise_for_status()
+        entry = landing_zone.put(api_url, response.content, response.headers)
+
+    if run is not None:
+        run.append(entry)
+    return landing_zone.read_page(entry)
+
+
+def get_multiple_offset_response(
+    entry_number: int = 500, landing_zone: LandingZone | None = None
+) -> list[data_model.HDBData]:
+    """To call multiple api calls using offset.
+
+    With a landing zone, the pages read are committed as a run once all are read.
+    """
+    run = []
+    resp = get_page(API_URL, landing_zone, run)
     resp = resp["result"]
 
     hdb_results = [data_model.HDBData(**r) for r in resp["records"]]
@@ -41,17 +189,38 @@ def get_multiple_offset_response(entry_number: int = 500) -> list[dict[str, Any]
     offset_records = resp.get("offset", 0)
 
     while offset_records < total_records:
-
-        logger.debug("Retrieving additional records", offset_records, total_records)
+        logger.debug(f"Retrieving additional records {offset_records}/{total_records}")
 
         next_api = BASE_URL + resp["_links"]["next"]
 
-        response = get_single_response(next_api)
-
-        resp = response.json()
+        resp = get_page(next_api, landing_zone, run)
         resp = resp["result"]
         offset_records = resp.get("offset")
 
         hdb_results.extend([data_model.HDBData(**r) for r in resp["records"]])
 
+    if landing_zone is not None:
+        landing_zone.commit_run(run)
+    return hdb_results
+
+
+def replay_landing_zone(landing_zone: LandingZone) -> list[data_model.HDBData]:
+    """Rebuild the raw dataset from the latest completed fetch, without api calls.
+
+    Landing zones without a completed run fall back to the latest page of every
+    url. Pages are deduplicated on their content, so overlapping urls serving the
+    same page are read once.
+    """
+    entries = landing_zone.latest_run()
+    if entries is None:
+        logger.warning("No completed fetch in landing zone, replaying every url.")
+        entries = landing_zone.entries()
+
+    entries = list({entry["page"]: entry for entry in entries}.values())
+    hdb_results = []
+    for entry in entries:
+        resp = landing_zone.read_page(entry)["result"]
+        hdb_results.extend([data_model.HDBData(**r) for r in resp["records"]])
+
+    logger.info(f"Replayed {len(hdb_results)} records from landing zone")
     return hdb_results
@@ -0,0 +1,173 @@
+"""Module for stratified sampling of chunked data in a single streaming pass."""
+
+import logging
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+from . import data_model
+
+logger = logging.getLogger(__name__)
+COL = data_model.ColumnEnum
+
+DEFAULT_STRATA = [COL.town, "flat_type", COL.year]
+# column of the random key of each row, lowest keys are sampled
+KEY = "_sample_key"
+
+
+def allocate(counts: pd.Series, n_rows: int) -> pd.Series:
+    """Split n_rows across strata in proportion to counts, by largest remainder.
+
+    Every stratum gets the floor of its quota, the rows left over go to the
+    strata with the largest fractional remainders, so allocations sum to n_rows.
+    """
+    n_rows = min(n_rows, int(counts.sum()))
+    quota = counts * n_rows / counts.sum()
+    allocation = np.floor(quota).astype(np.int64)
+    n_left = n_rows - int(allocation.sum())
+    # ties in remainder go to the larger stratum, then in stratum order
+    order = np.lexsort((-counts.to_numpy(), -(quota - allocation).to_numpy()))
+    allocation.iloc[order[:n_left]] += 1
+    return allocation
+
+
+def cap_allocation(
+    allocation: pd.Series, counts: pd.Series, available: pd.Series
+) -> pd.Series:
+    """Cap allocations at the rows available, moving the excess proportionally.
+
+    Rows a stratum cannot fill are re-allocated with `allocate` across the strata
+    with rows to spare, in proportion to their counts, until all fit.
+    """
+    allocation = allocation.copy()
+    while True:
+        capped = allocation.clip(upper=available)
+        n_short = int(allocation.sum()) - int(capped.sum())
+        spare = counts.where(available > capped, 0)
+        if n_short == 0 or spare.sum() == 0:
+            return capped
+        allocation = capped + allocate(spare, n_short)
+
+
+class StratifiedSampler:
+    """Fixed-size proportional stratified sample of data streamed in chunks.
+
+    Every row gets a uniform random key and a stratum sample is the rows with the
+    smallest keys, i.e. a uniform sample without replacement within the stratum.
+    Stratum sizes are only known after the last chunk, so rows with a key below
+    an adaptive threshold `oversample * n_rows / rows seen` are kept, about
+    `oversample` times the sample size. At the end each stratum's allocation
+    (largest remainder, see `allocate`) is filled with its lowest kept keys, a
+    stratum short of kept rows passes its excess on, see `cap_allocation`.
+    Missing strata values form their own strata.
+
+    Keys are drawn from a single seeded generator in row order, so the sample
+    only depends on the seed and the data, not on the chunk size.
+    """
+
+    def __init__(
+        self,
+        n_rows: int,
+        strata: list[str] | None = None,
+        seed: int = 0,
+        oversample: float = 2.0,
+    ) -> None:
+        """Initialize sampler for a sample of n_rows."""
+        if oversample < 1:
+            raise ValueError(f"oversample must be at least 1, got {oversample}.")
+
+        self.n_rows = n_rows
+        self.strata = list(DEFAULT_STRATA if strata is None else strata)
+        self.oversample = oversample
+        self.n_seen = 0
+        self.counts: pd.Series | None = None
+        self._rng = np.random.default_rng(seed)
+        self._kept: list[pd.DataFrame] = []
+        self._n_kept = 0
+
+    @property
+    def threshold(self) -> float:
+        """Keys below the threshold are kept."""
+        if self.n_seen == 0:
+            return 1.0
+        return min(1.0, self.oversample * self.n_rows / self.n_seen)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Count the strata of a chunk and keep its rows with keys below threshold."""
+        missing = set(self.strata) - set(chunk.columns)
+        if missing:
+            raise KeyError(
+                f"Strata columns {sorted(missing)} not in data.",
+                f"Expected the followings from {list(chunk.columns)}",
+            )
+
+        keys = self._rng.random(len(chunk))
+        self.n_seen += len(chunk)
+        chunk_counts = chunk.groupby(self.strata, dropna=False).size()
+        if self.counts is None:
+            self.counts = chunk_counts
+        else:
+            # groupby sorts missing keys last, index alignment cannot order them
+            self.counts = (
+                pd.concat([self.counts, chunk_counts])
+                .groupby(level=list(range(len(self.strata))), dropna=False)
+                .sum()
+            )
+
+        keep = keys < self.threshold
+        self._kept.append(chunk.loc[keep].assign(**{KEY: keys[keep]}))
+        self._n_kept += int(keep.sum())
+
+        # the threshold only decreases, prune once kept rows double
+        if self._n_kept > 2 * self.oversample * self.n_rows:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Drop kept rows whose keys are no longer below the threshold."""
+        kept = pd.concat(self._kept)
+        kept = kept.loc[kept[KEY] < self.threshold]
+        self._kept = [kept]
+        self._n_kept = len(kept)
+
+    def sample(self) -> pd.DataFrame:
+        """Stratified sample of all rows seen, in the original row order."""
+        if not self._kept:
+            return pd.DataFrame()
+
+        self._prune()
+        kept = self._kept[0].sort_values(KEY, kind="stable")
+        # group keys normalise missing values like the counts, None and NaN match
+        grouped = kept.groupby(self.strata, dropna=False)
+        rank = grouped.cumcount().to_numpy()
+        available = grouped.size().reindex(self.counts.index, fill_value=0)
+
+        # a stratum with fewer kept rows than its allocation is filled from others
+        allocation = allocate(self.counts, self.n_rows)
+        capped = cap_allocation(allocation, self.counts, available)
+        n_moved = int((allocation - capped).clip(lower=0).sum())
+        if n_moved > 0:
+            logger.warning(f"{n_moved} sample rows allocated outside their stratum.")
+
+        stratum_allocation = capped.reindex(grouped.size().index).to_numpy()
+        selected = rank < stratum_allocation[grouped.ngroup().to_numpy()]
+
+        sample = kept.loc[selected].drop(columns=KEY).sort_index(kind="stable")
+        logger.info(
+            f"Sampled {len(sample)} of {self.n_seen} rows "
+            f"across {len(self.counts)} strata."
+        )
+        return sample
+
+
+def sample_chunks(
+    chunks: Iterable[pd.DataFrame],
+    n_rows: int,
+    strata: list[str] | None = None,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Stratified sample of n_rows from chunks in a single pass."""
+    sampler = StratifiedSampler(n_rows, strata=strata, seed=seed)
+    for chunk in chunks:
+        sampler.update(chunk)
+    return sampler.sample()
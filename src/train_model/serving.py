@@ -0,0 +1,324 @@
+"""Module to serve predictions with zero-downtime model hot swaps."""
+
+import io
+import logging
+import threading
+import zipfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from . import data_model
+from .drift import DriftMonitor
+from .prediction_cache import CachedPredictor
+from .registry import ModelBundle, ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+NPZ = "application/x-npz"
+# malformed bodies, arrow errors subclass ValueError or TypeError
+DECODE_ERRORS = (ValueError, TypeError, EOFError, OSError, zipfile.BadZipFile)
+
+
+class ModelService:
+    """Serve the current registry version and hot swap new versions.
+
+    A background thread polls the registry index. A new version is loaded and
+    pre-warmed with `warmup_data` off the request path, then swapped in with a
+    single reference assignment. Requests in flight keep the bundle they started
+    with, so no request fails or waits on a deploy.
+
+    With `cache_size` > 0 predictions are served through a `CachedPredictor`,
+    which is cleared whenever a new version is swapped in.
+
+    With `drift_interval` set, scored batches are observed by a `DriftMonitor`
+    against the fit time reference of the serving version, scored every
+    `drift_interval` seconds in the background.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        poll_interval: float = 5.0,
+        warmup_data: pd.DataFrame | None = None,
+        cache_size: int = 0,
+        cache_ttl: float | None = None,
+        drift_interval: float | None = None,
+    ) -> None:
+        """Initialize service with the registry to watch."""
+        self.registry = registry
+        self.poll_interval = poll_interval
+        self.warmup_data = warmup_data
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache: CachedPredictor | None = None
+        self.drift_interval = drift_interval
+        self.drift: DriftMonitor | None = None
+        self._bundle: ModelBundle | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def bundle(self) -> ModelBundle:
+        """Bundle currently serving requests."""
+        if self._bundle is None:
+            self.refresh()
+        return self._bundle
+
+    @property
+    def version(self) -> str:
+        """Version currently serving requests."""
+        return self.bundle.version
+
+    def refresh(self) -> bool:
+        """Load, pre-warm and swap in the current registry version if it changed.
+
+        Returns:
+            bool: True if a new version was swapped in.
+        """
+        version = self.registry.current_version()
+        if self._bundle is not None and self._bundle.version == version:
+            return False
+
+        bundle = self.registry.load(version)
+        if self.warmup_data is not None:
+            bundle.predict(self.warmup_data)
+
+        previous = None if self._bundle is None else self._bundle.version
+        self._bundle = bundle
+        if self.cache_size > 0:
+            self._set_cache_model(bundle)
+        if self.drift_interval is not None:
+            self._set_drift_monitor(bundle)
+        logger.info(f"Swapped model version {previous} -> {bundle.version}")
+        return True
+
+    def _set_cache_model(self, bundle: ModelBundle) -> None:
+        """Point the prediction cache at the bundle, clearing stale predictions."""
+        if self.cache is None:
+            self.cache = CachedPredictor(
+                bundle.preprocessor,
+                bundle.predictor,
+                version=bundle.version,
+                max_entries=self.cache_size,
+                ttl=self.cache_ttl,
+            )
+        else:
+            self.cache.set_model(bundle.preprocessor, bundle.predictor, bundle.version)
+
+    def _set_drift_monitor(self, bundle: ModelBundle) -> None:
+        """Monitor drift against the reference of the bundle, if it has one."""
+        previous, self.drift = self.drift, None
+        if previous is not None:
+            previous.stop()
+
+        reference = getattr(bundle.preprocessor, "drift_reference", None)
+        if reference is None:
+            logger.warning(f"No drift reference in version {bundle.version}")
+            return
+
+        self.drift = DriftMonitor(
+            reference, interval=self.drift_interval, prepare=bundle.cleaner.clean_data
+        )
+        self.drift.start()
+
+    def _watch(self) -> None:
+        """Poll the registry until stopped, errors keep the current version."""
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Failed to load new model version, keeping current")
+
+    def start(self) -> None:
+        """Load the current version and start watching the registry."""
+        self.refresh()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching the registry."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.drift is not None:
+            self.drift.stop()
+
+    def explain(self, data: pd.DataFrame) -> tuple[str, np.ndarray, pd.DataFrame]:
+        """Predict raw records with per-column contributions, bypassing the cache.
+
+        Returns:
+            tuple[str, np.ndarray, pd.DataFrame]: (version used, predictions,
+                contributions)
+        """
+        bundle = self.bundle
+        return bundle.version, *bundle.explain(data)
+
+    def predict(self, data: pd.DataFrame) -> tuple[str, np.ndarray]:
+        """Predict raw records with a consistent bundle.
+
+        Returns:
+            tuple[str, np.ndarray]: (version used, predictions)
+        """
+        bundle = self.bundle
+        if self.cache is not None:
+            version, ypred = self.cache.predict_with_version(data)
+        else:
+            version, ypred = bundle.version, bundle.predict(data)
+
+        if self.drift is not None:
+            self.drift.observe(data)
+        return version, ypred
+
+
+def read_warmup_data(file_path: str | None, n_rows: int = 100) -> pd.DataFrame | None:
+    """First n_rows raw records of a csv to pre-warm new versions with.
+
+    Returns None, so new versions are swapped in cold, if file_path is not set or
+    the file does not exist.
+    """
+    if not file_path:
+        return None
+    if not Path(file_path).is_file():
+        logger.warning(f"Warmup file {file_path} not found, versions load cold.")
+        return None
+
+    return pd.read_csv(file_path, nrows=n_rows)
+
+
+def records_to_frame(records: list[data_model.HDBFeatureData]) -> pd.DataFrame:
+    """Convert validated records into a dataframe."""
+    return pd.DataFrame([r.model_dump() for r in records])
+
+
+def decode_batch(body: bytes, content_type: str) -> pd.DataFrame:
+    """Decode an Arrow IPC stream or npz body into a dataframe of columns.
+
+    Arrow string columns stay arrow-backed and numeric columns are zero-copy
+    numpy views, so no per-row python objects are created. Arrow requires the
+    optional `pyarrow` dependency, npz string columns are converted to objects.
+    A malformed body raises a 400 error.
+    """
+    if content_type not in (ARROW_STREAM, NPZ):
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported content type {content_type}, "
+            f"use {ARROW_STREAM} or {NPZ}",
+        )
+
+    try:
+        if content_type == ARROW_STREAM:
+            import pyarrow as pa
+
+            table = pa.ipc.open_stream(body).read_all()
+            return table.to_pandas(
+                types_mapper=lambda t: (
+                    pd.ArrowDtype(t)
+                    if pa.types.is_string(t) or pa.types.is_large_string(t)
+                    else None
+                )
+            )
+
+        with np.load(io.BytesIO(body), allow_pickle=False) as arrays:
+            return pd.DataFrame({col: arrays[col] for col in arrays.files}, copy=False)
+    except DECODE_ERRORS as e:
+        raise HTTPException(
+            status_code=400, detail=f"Malformed {content_type} body: {e}"
+        ) from e
+
+
+def encode_predictions(ypred: np.ndarray, content_type: str) -> bytes:
+    """Encode predictions as a single `prediction` column in the request format."""
+    sink = io.BytesIO()
+    if content_type == ARROW_STREAM:
+        import pyarrow as pa
+
+        table = pa.table({"prediction": np.asarray(ypred, dtype=np.float64)})
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        np.savez(sink, prediction=np.asarray(ypred, dtype=np.float64))
+
+    return sink.getvalue()
+
+
+def create_app(service: ModelService) -> FastAPI:
+    """Create the prediction api for a model service.
+
+    The service starts watching the registry on startup and stops on shutdown.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        service.start()
+        yield
+        service.stop()
+
+    app = FastAPI(title="HDB resale price prediction", lifespan=lifespan)
+
+    @app.get("/health")
+    def health() -> dict:
+        status = {"status": "ok", "version": service.version}
+        if service.cache is not None:
+            status["cache"] = service.cache.stats()
+        return status
+
+    @app.get("/drift")
+    def drift() -> dict:
+        """Latest drift scores per column, empty until the first interval."""
+        if service.drift is None:
+            raise HTTPException(status_code=404, detail="Drift monitoring is off")
+        return {
+            "version": service.version,
+            "n_dropped": service.drift.n_dropped,
+            "n_failed": service.drift.n_failed,
+            "scores": service.drift.latest_scores.to_dict(orient="records"),
+        }
+
+    @app.post("/predict")
+    def predict(records: list[data_model.HDBFeatureData]) -> dict:
+        version, ypred = service.predict(records_to_frame(records))
+        return {"version": version, "predictions": ypred.tolist()}
+
+    @app.post("/explain")
+    def explain(records: list[data_model.HDBFeatureData]) -> dict:
+        version, ypred, contributions = service.explain(records_to_frame(records))
+        return {
+            "version": version,
+            "predictions": ypred.tolist(),
+            "contributions": contributions.to_dict(orient="records"),
+        }
+
+    @app.post("/predict/batch")
+    async def predict_batch(request: Request) -> Response:
+        """Predict a columnar Arrow IPC or npz batch, the version is a header."""
+        content_type = request.headers.get("content-type", "").split(";")[0]
+        data = decode_batch(await request.body(), content_type)
+        invalid_errors = (ValueError, TypeError)
+        if content_type == ARROW_STREAM:
+            import pyarrow as pa
+
+            # e.g. arrow kernels missing for a wrongly typed column
+            invalid_errors += (pa.ArrowException,)
+
+        try:
+            version, ypred = await run_in_threadpool(service.predict, data)
+        except KeyError as e:
+            raise HTTPException(status_code=422, detail=f"Missing column {e}") from e
+        except invalid_errors as e:
+            raise HTTPException(status_code=422, detail=f"Invalid batch: {e}") from e
+
+        return Response(
+            content=encode_predictions(ypred, content_type),
+            media_type=content_type,
+            headers={"X-Model-Version": version},
+        )
+
+    return app
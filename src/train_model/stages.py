@@ -0,0 +1,282 @@
+"""Stage functions of the training pipeline, run by `pipeline.Pipeline`.
+
+Every stage is called as `stage(args, inputs, outputs, **kwargs)` with the paths
+declared in the pipeline config, reads only `inputs` and writes all `outputs`.
+"""
+
+import json
+import logging
+import shutil
+from pathlib import Path
+
+import omegaconf
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from . import (
+    data_cleaner,
+    data_model,
+    data_preprocessor,
+    data_validator,
+    key_index,
+    registry,
+    retrieve_data,
+    sampler,
+)
+from .evaluator import Evaluator
+from .utils import utils
+
+logger = logging.getLogger(__name__)
+
+COL = data_model.ColumnEnum
+
+
+def retrieve(args: omegaconf.DictConfig, inputs: list[Path], outputs: list[Path]):
+    """Retrieve raw data from the api, or replay the landing zone if configured.
+
+    Records are upserted into the raw data on their record key.
+    """
+    landing_zone = retrieve_data.LandingZone(args.landing_folder)
+    if args.replay:
+        hdb_data = retrieve_data.replay_landing_zone(landing_zone)
+    else:
+        hdb_data = retrieve_data.get_multiple_offset_response(
+            args.api_entry_call, landing_zone=landing_zone
+        )
+
+    data = pd.DataFrame([d.model_dump() for d in hdb_data])
+    key_index.ingest(outputs[0], data, on_duplicate=args.get("on_duplicate", "upsert"))
+
+
+def clean(args: omegaconf.DictConfig, inputs: list[Path], outputs: list[Path]):
+    """Clean the latest copy of every raw record."""
+    data = data_cleaner.HdbDataCleaner().clean_data(key_index.read_current(inputs[0]))
+    data.to_csv(outputs[0], index=False)
+
+
+def validate(args: omegaconf.DictConfig, inputs: list[Path], outputs: list[Path]):
+    """Write the validation report of cleaned data, raise if configured to fail.
+
+    A failing report is written next to the output as `<name>.failed.csv` and the
+    output is removed, so stages reading the report never run on invalid data.
+    """
+    report = data_validator.HdbDataValidator(args.validate).validate_chunks(
+        pd.read_csv(inputs[0], chunksize=100_000)
+    )
+
+    if args.validate.get("fail_on_error") and not report["passed"].all():
+        outputs[0].unlink(missing_ok=True)
+        report.to_csv(outputs[0].with_suffix(".failed.csv"), index=False)
+        raise ValueError(f"Cleaned data failed validation\n{report[~report['passed']]}")
+
+    report.to_csv(outputs[0], index=False)
+
+
+def sample(args: omegaconf.DictConfig, inputs: list[Path], outputs: list[Path]):
+    """Stratified sample of cleaned data in one streaming pass, see `sampler`.
+
+    Copies the cleaned data if `sample.n_rows` is not set. The validation report
+    is a second input only so that sampling, and all training, waits on it.
+    """
+    config = args.get("sample") or {}
+    if config.get("n_rows") is None:
+        shutil.copyfile(inputs[0], outputs[0])
+        return
+
+    data = sampler.sample_chunks(
+        pd.read_csv(inputs[0], chunksize=config.get("chunk_size", 100_000)),
+        config.get("n_rows"),
+        strata=config.get("strata"),
+        seed=config.get("seed", 0),
+    )
+    data.to_csv(outputs[0], index=False)
+
+
+def feature_engineer(
+    args: omegaconf.DictConfig, inputs: list[Path], outputs: list[Path]
+):
+    """Feature engineer cleaned data."""
+    preprocessor = data_preprocessor.HdbDataPreprocessor(
+        args.preprocess,
+        args.model_folder,
+        precision=args.get("precision", data_preprocessor.DEFAULT_PRECISION),
+    )
+    data = preprocessor.feature_engineer(pd.read_csv(inputs[0]))
+    data.to_csv(outputs[0], index=False)
+
+
+def split(
+    args: omegaconf.DictConfig,
+    inputs: list[Path],
+    outputs: list[Path],
+    test_size: float = 0.2,
+    random_state: int = 0,
+):
+    """Split feature engineered data into train and test files."""
+    train, test = train_test_split(
+        pd.read_csv(inputs[0]), test_size=test_size, random_state=random_state
+    )
+    train.to_csv(outputs[0], index=False)
+    test.to_csv(outputs[1], index=False)
+
+
+def preprocess(args: omegaconf.DictConfig, inputs: list[Path], outputs: list[Path]):
+    """Fit preprocessors on train data and save the fitted preprocessor object."""
+    preprocessor = data_preprocessor.HdbDataPreprocessor(
+        args.preprocess,
+        outputs[0].parent,
+        precision=args.get("precision", data_preprocessor.DEFAULT_PRECISION),
+        drift_columns=args.get("drift_columns"),
+    )
+    preprocessor.fit_preprocessors(pd.read_csv(inputs[0]))
+    utils.save_object(preprocessor, outputs[0])
+
+
+def train(
+    args: omegaconf.DictConfig,
+    inputs: list[Path],
+    outputs: list[Path],
+    model: dict | None = None,
+):
+    """Fit a predictor on transformed train data and save it as a model bundle.
+
+    inputs are the train data and the fitted preprocessor, model has the same keys
+    as the `model` config and defaults to it. The bundle is written into the folder
+    of the predictor output, see `registry.save_bundle`, so it can be batch scored
+    or registered as is.
+    """
+    model = omegaconf.DictConfig(model or args.model)
+    data = pd.read_csv(inputs[0])
+    preprocessor = utils.load_object(inputs[1])
+
+    predictor_cls = utils.load_func(model.predictor_path)
+    predictor = predictor_cls(
+        model.params,
+        utils.load_func(model.model_object),
+        precision=args.get("precision", data_preprocessor.DEFAULT_PRECISION),
+    )
+    y = data[COL.resale_price]
+    predictor.fit(preprocessor.transform_data(data, y=y), y)
+    registry.save_bundle(
+        outputs[0].parent,
+        preprocessor,
+        predictor,
+        {"model": omegaconf.OmegaConf.to_container(model, resolve=True)},
+    )
+
+
+def evaluate(
+    args: omegaconf.DictConfig,
+    inputs: list[Path],
+    outputs: list[Path],
+    metrics: list[str] | None = None,
+):
+    """Evaluate a predictor on test data and save the metrics as json.
+
+    inputs are the test data, the fitted preprocessor and the predictor.
+    """
+    data = pd.read_csv(inputs[0])
+    preprocessor = utils.load_object(inputs[1])
+    predictor = utils.load_object(inputs[2])
+
+    evaluator = Evaluator(metrics or ["sklearn.metrics.root_mean_squared_error"])
+    ypred = predictor.predict(preprocessor.transform_data(data))
+    evaluator.evaluate(ypred, data[COL.resale_price])
+
+    with open(outputs[0], "w") as f:
+        json.dump({k: float(v) for k, v in evaluator.metrics.items()}, f, indent=2)
+
+
+def report(args: omegaconf.DictConfig, inputs: list[Path], outputs: list[Path]):
+    """Collect metrics of all models into a single table, one row per model.
+
+    Models are named by the folder of their metrics file.
+    """
+    rows = {}
+    for metrics_path in inputs:
+        with open(metrics_path) as f:
+            rows[metrics_path.parent.name] = json.load(f)
+
+    result = pd.DataFrame.from_dict(rows, orient="index").rename_axis("model")
+    result.to_csv(outputs[0])
+    logger.info(f"Model report\n{result}")
+
+
+def best_model(
+    report_path: Path, metric: str, greater_is_better: bool = False
+) -> tuple[str, float]:
+    """Name and score of the best model of a report."""
+    scores = pd.read_csv(report_path, index_col="model")[metric]
+    best = scores.idxmax() if greater_is_better else scores.idxmin()
+    return best, float(scores[best])
+
+
+def register(
+    args: omegaconf.DictConfig,
+    inputs: list[Path],
+    outputs: list[Path],
+    metric: str = "root_mean_squared_error",
+    greater_is_better: bool = False,
+):
+    """Register the bundle of the best model of the report for serving.
+
+    inputs are the report and the predictor of every model in it, a model is the
+    folder of its predictor. The registered version is written to the json output.
+    """
+    best, score = best_model(inputs[0], metric, greater_is_better)
+    folders = {path.parent.name: path.parent for path in inputs[1:]}
+    if best not in folders:
+        raise KeyError(
+            f"Model {best} of the report has no predictor input.",
+            f"Expected the followings from {list(folders)}",
+        )
+
+    bundle = registry.load_bundle(folders[best])
+    version = registry.ModelRegistry(args.serve.registry_folder).register(
+        bundle.preprocessor,
+        bundle.predictor,
+        metadata={**bundle.metadata, "name": best, metric: score},
+    )
+    with open(outputs[0], "w") as f:
+        json.dump({"model": best, "version": version, metric: score}, f, indent=2)
+
+
+def confirm(
+    args: omegaconf.DictConfig,
+    inputs: list[Path],
+    outputs: list[Path],
+    models: dict[str, dict],
+    metric: str = "root_mean_squared_error",
+    greater_is_better: bool = False,
+    test_size: float = 0.2,
+    random_state: int = 0,
+    metrics: list[str] | None = None,
+):
+    """Refit the best model of the report on full cleaned data and evaluate it.
+
+    inputs are the full cleaned data and the report, models maps report model
+    names to their model config. Feature engineering, split, preprocessing,
+    training and evaluation are re-run into the folder of the metrics output.
+    """
+    best, score = best_model(inputs[1], metric, greater_is_better)
+    logger.info(f"Confirming {best} with {metric} {score} on full data.")
+
+    folder = outputs[0].parent
+    folder.mkdir(parents=True, exist_ok=True)
+    features, train_file, test_file = (
+        folder / "features.csv",
+        folder / "train.csv",
+        folder / "test.csv",
+    )
+    preprocessor, predictor = folder / "preprocessor.pkl", folder / "predictor.pkl"
+
+    feature_engineer(args, [inputs[0]], [features])
+    split(args, [features], [train_file, test_file], test_size, random_state)
+    preprocess(args, [train_file], [preprocessor])
+    train(args, [train_file, preprocessor], [predictor], model=models[best])
+    evaluate(args, [test_file, preprocessor, predictor], outputs, metrics=metrics)
+
+    with open(outputs[0]) as f:
+        result = json.load(f)
+    with open(outputs[0], "w") as f:
+        json.dump({"model": best, **result}, f, indent=2)
@@ -0,0 +1,49 @@
+"""Shared fixtures of the train_model tests."""
+
+import omegaconf
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+import train_model as tm
+
+
+@pytest.fixture
+def raw_data():
+    """Dataframe fixture of raw records."""
+    df = pd.DataFrame(
+        {
+            "town": ["A", "B", "C", "D", "E", "F"],
+            "storey_range": [
+                "01 TO 03",
+                "10 TO 12",
+                "07 TO 09",
+                "04 TO 06",
+                "10 TO 12",
+                "01 TO 03",
+            ],
+            "floor_area_sqm": [60.0, 70.0, 80.0, 90.0, 60.0, 100.0],
+            "remaining_lease": [49, 50, 51, 90, 60, 45],
+            "resale_price": [300.0, 350.0, 400.0, 420.0, 310.0, 500.0],
+        }
+    )
+    return df
+
+
+@pytest.fixture
+def fitted(raw_data, tmp_path):
+    """Fitted preprocessor and predictor on raw_data."""
+    params = omegaconf.DictConfig(
+        {
+            "standardscaler": {"columns": ["floor_area_sqm", "storey_area_ratio"]},
+            "onehotencoder": {"columns": ["lease_less_than_50_yrs"]},
+        }
+    )
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(params, tmp_path)
+    data = tm.data_cleaner.HdbDataCleaner().clean_data(raw_data.copy())
+    data = preprocessor.feature_engineer(data)
+    preprocessor.fit_preprocessors(data)
+
+    predictor = tm.models.SKLearnPredictor({}, LinearRegression)
+    predictor.fit(preprocessor.transform_data(data), data["resale_price"])
+    return preprocessor, predictor
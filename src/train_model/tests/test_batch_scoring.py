@@ -0,0 +1,133 @@
+"""Test module for batch scoring."""
+
+import omegaconf
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+import train_model as tm
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Config yaml mock for batch scoring."""
+    config = {
+        "model_folder": str(tmp_path),
+        "batch_predict": {"model_folder": str(tmp_path / "bundle")},
+        "preprocess": {
+            "standardscaler": {"columns": ["floor_area_sqm", "storey_area_ratio"]},
+            "onehotencoder": {"columns": ["lease_less_than_50_yrs"]},
+        },
+        "model": {
+            "predictor_path": "train_model.models.SKLearnPredictor",
+            "model_object": "sklearn.linear_model.LinearRegression",
+            "params": {"fit_intercept": True},
+        },
+    }
+    return omegaconf.DictConfig(config)
+
+
+@pytest.fixture
+def data():
+    """Dataframe fixture of cleaned data."""
+    df = pd.DataFrame(
+        {
+            "town": ["A", "B", "C", "D", "E", "F", "G"],
+            "storey_to": [4, 12, 9, 9, 12, 3, 6],
+            "floor_area_sqm": [60, 70, 80, 90, 60, 100, 110],
+            "remaining_lease": [49, 50, 51, 90, 60, 45, 70],
+            "resale_price": [300.0, 350.0, 400.0, 420.0, 310.0, 500.0, 520.0],
+        }
+    )
+    return df
+
+
+@pytest.fixture
+def input_file(config, data, tmp_path):
+    """Save fitted artefacts and return the csv file to score."""
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        config.preprocess, config.model_folder
+    )
+    fe_data = preprocessor.feature_engineer(data.copy())
+    preprocessor.fit_preprocessors(fe_data)
+
+    predictor = tm.models.SKLearnPredictor(config.model.params, LinearRegression)
+    predictor.fit(preprocessor.transform_data(fe_data), fe_data["resale_price"])
+    tm.registry.save_bundle(config.batch_predict.model_folder, preprocessor, predictor)
+
+    input_file = tmp_path / "to_score.csv"
+    data.to_csv(input_file, index=False)
+    return input_file
+
+
+@pytest.mark.parametrize("n_workers", [0, 2])
+def test_score_file_csv(config, input_file, tmp_path, n_workers):
+    """Test scoring in chunks keeps input order and writes all rows."""
+    output_file = tmp_path / "predictions.csv"
+    n_rows = tm.batch_scoring.score_file(
+        config,
+        input_file,
+        output_file,
+        chunk_size=3,
+        n_workers=n_workers,
+        id_columns=["town"],
+    )
+    result = pd.read_csv(output_file)
+
+    preprocessor, predictor = tm.batch_scoring.load_artefacts(config)
+    expected = tm.batch_scoring.score_chunk(
+        pd.read_csv(input_file), preprocessor, predictor
+    )
+
+    assert n_rows == 7
+    assert result["town"].tolist() == ["A", "B", "C", "D", "E", "F", "G"]
+    assert result["prediction"].to_numpy() == pytest.approx(expected)
+
+
+def test_score_file_parquet(config, input_file, tmp_path):
+    """Test scoring into a parquet file."""
+    pytest.importorskip("pyarrow")
+    output_file = tmp_path / "predictions.parquet"
+    tm.batch_scoring.score_file(config, input_file, output_file, chunk_size=3)
+
+    result = pd.read_parquet(output_file)
+    assert result.shape == (7, 1)
+
+
+def test_score_file_stacking(config, data, tmp_path):
+    """Test a stacking ensemble is loaded from its bundle and scores like in memory."""
+    config.model = {
+        "predictor_path": "train_model.models.StackingPredictor",
+        "model_object": "sklearn.linear_model.LinearRegression",
+        "params": {
+            "n_splits": 2,
+            "base_models": [
+                {
+                    "predictor_path": "train_model.models.SKLearnPredictor",
+                    "model_object": "sklearn.linear_model.Ridge",
+                },
+                {
+                    "predictor_path": "train_model.models.SKLearnPredictor",
+                    "model_object": "sklearn.tree.DecisionTreeRegressor",
+                    "params": {"max_depth": 2},
+                },
+            ],
+        },
+    }
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        config.preprocess, config.model_folder
+    )
+    fe_data = preprocessor.feature_engineer(data.copy())
+    preprocessor.fit_preprocessors(fe_data)
+    features = preprocessor.transform_data(fe_data)
+
+    predictor = tm.models.StackingPredictor(config.model.params, LinearRegression)
+    predictor.fit(features, fe_data["resale_price"])
+    tm.registry.save_bundle(config.batch_predict.model_folder, preprocessor, predictor)
+
+    input_file, output_file = tmp_path / "to_score.csv", tmp_path / "predictions.csv"
+    data.to_csv(input_file, index=False)
+    tm.batch_scoring.score_file(config, input_file, output_file, chunk_size=3)
+
+    result = pd.read_csv(output_file)
+    assert result["prediction"].to_numpy() == pytest.approx(predictor.predict(features))
@@ -0,0 +1,99 @@
+"""Test module for compiled config snapshots."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import omegaconf
+import pytest
+
+import train_model as tm
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    """Snapshot of the shipped config compiled with overrides."""
+    snapshot_path = tmp_path / "snapshot.json"
+    tm.config_snapshot.compile_snapshot(
+        snapshot_path, ["batch_predict.n_workers=8", "precision=float32"]
+    )
+    return snapshot_path
+
+
+def test_compile_snapshot(snapshot_path):
+    """Test the snapshot is resolved with overrides applied."""
+    with open(snapshot_path) as f:
+        snapshot = json.load(f)
+
+    assert snapshot["batch_predict"]["n_workers"] == 8
+    assert snapshot["precision"] == "float32"
+    assert "defaults" not in snapshot
+    # interpolations are resolved at compile time
+    train_linear = snapshot["pipeline"]["stages"]["train_linear"]
+    assert train_linear["kwargs"]["model"] == snapshot["model"]
+
+
+def test_load_snapshot_is_frozen(snapshot_path):
+    """Test a loaded snapshot is read-only and rejects unknown keys."""
+    config = tm.config_snapshot.load_snapshot(snapshot_path)
+    assert config.batch_predict.n_workers == 8
+
+    with pytest.raises(omegaconf.errors.ReadonlyConfigError):
+        config.batch_predict.n_workers = 1
+    with pytest.raises(omegaconf.errors.ConfigAttributeError):
+        _ = config.not_in_config
+
+
+@pytest.mark.parametrize(
+    "override,error",
+    [
+        ("batch_predict.n_workers=many", omegaconf.ValidationError),
+        ("precision=float16", ValueError),
+        ("+unknown_key=1", omegaconf.errors.ConfigKeyError),
+    ],
+)
+def test_compile_snapshot_validates(tmp_path, override, error):
+    """Test overrides are validated against the schema at compile time."""
+    with pytest.raises(error):
+        tm.config_snapshot.compile_snapshot(tmp_path / "snapshot.json", [override])
+
+    assert not (tmp_path / "snapshot.json").exists()
+
+
+def test_run_entry_point(snapshot_path):
+    """Test entry points run from the snapshot only if given."""
+    calls = []
+
+    def run(args):
+        calls.append(args.precision)
+
+    def hydra_main():
+        calls.append("hydra")
+
+    tm.config_snapshot.run_entry_point(run, hydra_main, ["job.py"])
+    tm.config_snapshot.run_entry_point(
+        run, hydra_main, ["job.py", "--snapshot", str(snapshot_path)]
+    )
+    assert calls == ["hydra", "float32"]
+
+    with pytest.raises(ValueError):
+        tm.config_snapshot.run_entry_point(
+            run, hydra_main, ["job.py", "--snapshot", str(snapshot_path), "replay=true"]
+        )
+
+
+def test_snapshot_start_skips_heavy_imports():
+    """Test loading a snapshot imports neither sklearn, fastapi nor hydra."""
+    code = (
+        "import sys, train_model as tm; tm.config_snapshot.load_snapshot; "
+        "print(sorted({'sklearn', 'fastapi', 'hydra', 'matplotlib'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={"PYTHONPATH": str(Path(tm.__file__).parents[1])},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
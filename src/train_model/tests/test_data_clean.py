@@ -1,5 +1,6 @@
 """Test module for data cleaner."""
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -29,3 +30,74 @@ def test_fe_storey_range(data):
     assert COL.storey_from in cleaned_data.columns
     assert COL.storey_to in cleaned_data.columns
     assert cleaned_data[COL.storey_from].tolist() == ["1", "9", "11", "22", "14"]
+
+
+@pytest.fixture
+def api_data():
+    """Dataframe fixture with remaining lease and month as returned by the api."""
+    df = pd.DataFrame(
+        {
+            "storey_range": ["01 TO 03"] * 6,
+            "remaining_lease": [
+                "61 years 04 months",
+                "61 years 04 months",
+                "70 years",
+                "1 year 1 month",
+                70,
+                None,
+            ],
+            "month": ["2017-01", "2017-12", "2017-01", "2020-5", None, "2017-13"],
+        }
+    )
+    return df
+
+
+def test_parse_remaining_lease(api_data):
+    """Test remaining lease text and numbers are parsed into months and years."""
+    cleaned_data = tm.data_cleaner.HdbDataCleaner().clean_data(api_data)
+
+    months = cleaned_data[COL.remaining_lease_months]
+    assert months.iloc[:5].tolist() == [736, 736, 840, 13, 840]
+    assert months.isna().iloc[5]
+    assert cleaned_data[COL.remaining_lease].iloc[2] == 70.0
+
+
+def test_parse_month(api_data):
+    """Test "YYYY-MM" months are parsed into year, month and period."""
+    cleaned_data = tm.data_cleaner.HdbDataCleaner().clean_data(api_data)
+
+    assert cleaned_data[COL.year].tolist()[:4] == [2017, 2017, 2017, 2020]
+    assert cleaned_data[COL.month_of_year].tolist()[:4] == [1, 12, 1, 5]
+    period = cleaned_data[COL.month_period]
+    assert period.iloc[1] - period.iloc[0] == 11
+    assert period.iloc[3] - period.iloc[0] == 40
+    # missing and invalid months are missing
+    assert period.isna().tolist()[4:] == [True, True]
+
+
+def test_parse_unique_maps_distinct_values():
+    """Test the parser is only called on distinct values."""
+    calls = []
+
+    def parser(uniques):
+        calls.append(len(uniques))
+        return pd.DataFrame({"length": uniques.str.len()})
+
+    values = pd.Series(["a", "bb", "a", None, "bb"])
+    parsed = tm.data_cleaner.parse_unique(values, parser)
+
+    assert calls == [2]
+    assert parsed["length"].tolist()[:3] == [1.0, 2.0, 1.0]
+    assert parsed["length"].isna().iloc[3]
+
+
+def test_clean_data_keeps_input(api_data):
+    """Test cleaning returns new columns without changing or copying the input."""
+    original = api_data.copy()
+    cleaned = tm.data_cleaner.HdbDataCleaner().clean_data(api_data)
+
+    pd.testing.assert_frame_equal(api_data, original)
+    assert COL.remaining_lease_months in cleaned.columns
+    assert np.shares_memory(
+        cleaned[COL.storey_range].to_numpy(), api_data[COL.storey_range].to_numpy()
+    )
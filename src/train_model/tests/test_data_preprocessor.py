@@ -1,7 +1,9 @@
 """Test module for data preprocessor."""
 
+import tracemalloc
 from pathlib import Path
 
+import numpy as np
 import omegaconf
 import pandas as pd
 import pytest
@@ -143,3 +145,171 @@ def test_fe_lease_less_than_50_yrs(config, data):
     assert cleaned_data[COL.lease_less_than_50_yrs].values[0]
     assert not cleaned_data[COL.lease_less_than_50_yrs].values[1]
     assert not cleaned_data[COL.lease_less_than_50_yrs].values[2]
+
+
+def test_preprocessor_transform_data_float32(config, data):
+    """Test float32 precision keeps transformed data and indicators compact."""
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        config.preprocessor, config.save_path, precision="float32"
+    )
+    preprocessor.fit_preprocessors(data)
+    dataframe = preprocessor.transform_data(data)
+
+    assert preprocessor._preprocessors[1].dtype == np.uint8
+    assert (dataframe.dtypes == np.float32).all()
+    assert dataframe.shape == (5, 9)
+
+
+def test_preprocessor_invalid_precision(config):
+    """Test preprocessor raises error for unsupported precision."""
+    with pytest.raises(NotImplementedError):
+        tm.data_preprocessor.HdbDataPreprocessor(
+            config.preprocessor, config.save_path, precision="float16"
+        )
+
+
+def test_preprocessor_transform_data_into_out_buffer(config, data):
+    """Test transform writes into a preallocated buffer reused across batches."""
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        config.preprocessor, config.save_path
+    )
+    preprocessor.fit_preprocessors(data)
+    expected = preprocessor.transform_data(data)
+
+    buffer = np.full((5, 9), np.nan)
+    dataframe = preprocessor.transform_data(data, out=buffer)
+
+    assert np.shares_memory(dataframe.to_numpy(), buffer)
+    assert dataframe.columns.tolist() == expected.columns.tolist()
+    np.testing.assert_array_equal(buffer, expected.to_numpy())
+
+    with pytest.raises(ValueError):
+        preprocessor.transform_data(data, out=np.empty((4, 9)))
+
+
+def test_preprocessor_ordinalencoder(config, data):
+    """Test ordinal encoder integer codes categories, unknown values as missing."""
+    params = omegaconf.DictConfig(
+        {"ordinalencoder": {"columns": ["Column2", "Column3"]}}
+    )
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        params, config.save_path, precision="float32"
+    )
+    preprocessor.fit_preprocessors(data)
+    assert Path(config.save_path, "ordinalencoder.pkl").is_file()
+
+    new_data = data.assign(Column2=["A", "B", "C", "D", "Z"])
+    result = preprocessor.transform_data(new_data)
+    assert list(result.columns) == ["Column2", "Column3"]
+    assert result["Column2"].tolist()[:4] == [0, 1, 2, 3]
+    assert np.isnan(result["Column2"].iloc[4])
+    assert result["Column3"].tolist() == [0, 0, 1, 1, 0]
+
+
+def test_preprocessor_aggregate_contributions(config, data):
+    """Test one-hot contributions are summed back to their input column."""
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        config.preprocessor, config.save_path
+    )
+    preprocessor.fit_preprocessors(data)
+    features = preprocessor.transform_data(data)
+    contributions = features.assign(bias=1.0)
+
+    result = preprocessor.aggregate_contributions(contributions)
+    assert list(result.columns) == [
+        "floor_area_sqm",
+        "storey_to",
+        "Column2",
+        "Column3",
+        "bias",
+    ]
+    # one indicator set per categorical column and row
+    assert (result["Column2"] == 1).all()
+    np.testing.assert_allclose(result["storey_to"], features["storey_to"])
+
+
+@pytest.mark.parametrize(
+    "params,origins",
+    [
+        ({}, ["Column2"] * 5 + ["Column3"] * 2),
+        ({"drop": "first"}, ["Column2"] * 4 + ["Column3"]),
+        ({"min_frequency": 2}, ["Column2"] + ["Column3"] * 2),
+    ],
+)
+def test_preprocessor_feature_origins(config, data, params, origins):
+    """Test one-hot outputs map to their column with dropped or rare categories."""
+    config.preprocessor.onehotencoder.params = params
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        config.preprocessor, config.save_path
+    )
+    preprocessor.fit_preprocessors(data)
+
+    assert list(preprocessor.get_feature_origins()) == [
+        "floor_area_sqm",
+        "storey_to",
+        *origins,
+    ]
+
+
+def test_feature_engineer_keeps_input(config, data):
+    """Test feature engineering does not change the input."""
+    original = data.copy()
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        config.preprocessor, config.save_path
+    )
+    engineered = preprocessor.feature_engineer(data)
+
+    pd.testing.assert_frame_equal(data, original)
+    assert COL.storey_area_ratio.name in engineered.columns
+
+
+@pytest.fixture
+def large_raw_data():
+    """Raw records as returned by the api, large enough to measure memory."""
+    rng = np.random.default_rng(0)
+    n_rows = 100_000
+    storey_from = rng.integers(0, 10, n_rows) * 3 + 1
+    months = [f"{y}-{m:02d}" for y in range(2015, 2024) for m in range(1, 13)]
+    leases = [f"{y} years {m:02d} months" for y in range(45, 99) for m in range(12)]
+    return pd.DataFrame(
+        {
+            "month": rng.choice(months, n_rows),
+            "town": rng.choice(["ANG MO KIO", "BEDOK", "TAMPINES"], n_rows),
+            "storey_range": [f"{s:02d} TO {s + 2:02d}" for s in storey_from],
+            "floor_area_sqm": rng.uniform(40, 150, n_rows),
+            "remaining_lease": rng.choice(leases, n_rows),
+            "resale_price": rng.uniform(2e5, 9e5, n_rows),
+        }
+    )
+
+
+def test_clean_to_transform_peak_memory(tmp_path, large_raw_data):
+    """Test the clean to transform chain stays under a multiple of the input size."""
+    params = omegaconf.DictConfig(
+        {
+            "standardscaler": {
+                "columns": ["floor_area_sqm", "remaining_lease", "storey_area_ratio"]
+            },
+            "onehotencoder": {"columns": ["town", "lease_less_than_50_yrs"]},
+        }
+    )
+    cleaner = tm.data_cleaner.HdbDataCleaner()
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(params, tmp_path)
+    preprocessor.fit_preprocessors(
+        preprocessor.feature_engineer(cleaner.clean_data(large_raw_data))
+    )
+    original = large_raw_data.copy()
+    input_size = large_raw_data.memory_usage(deep=True).sum()
+
+    tracemalloc.start()
+    try:
+        features = preprocessor.transform_data(
+            preprocessor.feature_engineer(cleaner.clean_data(large_raw_data))
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert features.shape == (len(large_raw_data), 8)
+    assert peak < 1.5 * input_size
+    pd.testing.assert_frame_equal(large_raw_data, original)
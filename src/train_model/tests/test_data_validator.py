@@ -0,0 +1,85 @@
+"""Test module for data validator."""
+
+import omegaconf
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+
+@pytest.fixture
+def config():
+    """Config yaml mock for validator."""
+    config = {
+        "ranges": {"floor_area_sqm": [20, 200], "resale_price": [5000, 2000000]},
+        "domains": {"flat_type": ["3 ROOM", "4 ROOM"]},
+        "max_null_rate": {"town": 0.25},
+        "ordered": [["storey_from", "storey_to"]],
+        "unique_key": ["town", "floor_area_sqm"],
+    }
+    return omegaconf.DictConfig(config)
+
+
+@pytest.fixture
+def data():
+    """Dataframe fixture with a single violation per check."""
+    df = pd.DataFrame(
+        {
+            "town": ["A", "B", None, "D", "B"],
+            "flat_type": ["3 ROOM", "4 ROOM", "3 ROOM", "9 ROOM", "4 ROOM"],
+            "floor_area_sqm": [60, 70, 10, 90, 70],
+            "resale_price": [300000, 350000, 400000, 420000, "abc"],
+            "storey_from": ["1", "10", "4", "7", "1"],
+            "storey_to": ["3", "12", "6", "9", "3"],
+        }
+    )
+    return df
+
+
+def get_violations(report: pd.DataFrame, check: str) -> int:
+    """Get violation count of a check from report."""
+    return report.loc[report["check"] == check, "n_violations"].sum()
+
+
+def test_validator_report(config, data):
+    """Test validator counts violations per check."""
+    validator = tm.data_validator.HdbDataValidator(config)
+    report = validator.validate(data)
+
+    assert get_violations(report, "ranges") == 2
+    assert get_violations(report, "domains") == 1
+    assert get_violations(report, "max_null_rate") == 1
+    assert get_violations(report, "ordered") == 0
+    assert get_violations(report, "unique_key") == 1
+    assert report.set_index("check").loc["max_null_rate", "passed"]
+    assert not report["passed"].all()
+
+
+def test_validator_chunks_same_as_single_pass(config, data):
+    """Test chunked validation merges counts and duplicate keys across chunks."""
+    validator = tm.data_validator.HdbDataValidator(config)
+    report = validator.validate(data)
+    chunked_report = validator.validate_chunks([data.iloc[:2], data.iloc[2:]])
+
+    pd.testing.assert_frame_equal(report, chunked_report)
+
+
+def test_unique_key_independent_of_chunk_dtype():
+    """Test duplicate keys are found across chunks read with different dtypes."""
+    config = omegaconf.DictConfig({"unique_key": ["record_id"]})
+    validator = tm.data_validator.HdbDataValidator(config)
+    chunks = [
+        pd.DataFrame({"record_id": [1, 2]}),
+        pd.DataFrame({"record_id": [2.0, None]}),
+        pd.DataFrame({"record_id": ["1", "3"]}),
+    ]
+
+    report = validator.validate_chunks(chunks)
+    assert get_violations(report, "unique_key") == 2
+
+
+def test_validator_invalid_check(config):
+    """Test validator raises error for unknown checks."""
+    config.not_a_check = {}
+    with pytest.raises(NotImplementedError):
+        tm.data_validator.HdbDataValidator(config)
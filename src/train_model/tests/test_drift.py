@@ -0,0 +1,162 @@
+"""Test module for drift monitoring."""
+
+import threading
+
+import numpy as np
+import omegaconf
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+
+@pytest.fixture
+def reference_data():
+    """Dataframe fixture of numeric and categorical columns with missing values."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "floor_area_sqm": rng.normal(90, 20, 5_000),
+            "town": rng.choice(["A", "B", "C"], 5_000, p=[0.5, 0.3, 0.2]),
+        }
+    )
+    df.loc[:9, "floor_area_sqm"] = np.nan
+    return df
+
+
+def test_reference_proportions(reference_data):
+    """Test reference buckets sum to one with missing values in the last bucket."""
+    reference = tm.drift.DriftReference.from_data(reference_data, bins=10)
+
+    numeric = reference.columns["floor_area_sqm"]
+    assert len(numeric["edges"]) == 9
+    assert np.isclose(sum(numeric["proportions"]), 1.0)
+    assert np.isclose(numeric["proportions"][-1], 10 / 5_000)
+
+    categorical = reference.columns["town"]
+    assert categorical["categories"] == ["A", "B", "C"]
+    assert np.isclose(categorical["proportions"][0], 0.5, atol=0.02)
+
+
+def test_scores_same_and_shifted(reference_data):
+    """Test psi is near zero on reference data and high on shifted data."""
+    reference = tm.drift.DriftReference.from_data(reference_data)
+    shifted = reference_data.assign(
+        floor_area_sqm=reference_data["floor_area_sqm"] + 30, town="D"
+    )
+
+    def counts(data):
+        return {
+            col: reference.bucket_counts(sketch, data[col])
+            for col, sketch in reference.columns.items()
+        }
+
+    same = reference.scores(counts(reference_data)).set_index("column")
+    assert (same["psi"] < 0.01).all()
+    assert same.loc["floor_area_sqm", "ks"] < 0.01
+
+    drifted = reference.scores(counts(shifted)).set_index("column")
+    assert (drifted["psi"] > 0.2).all()
+    assert drifted.loc["floor_area_sqm", "ks"] > 0.5
+    assert np.isnan(drifted.loc["town", "ks"])
+
+
+def test_monitor_score_window(reference_data):
+    """Test monitor scores queued batches and rolls its window."""
+    reference = tm.drift.DriftReference.from_data(reference_data)
+    monitor = tm.drift.DriftMonitor(reference, n_windows=1, threshold=0.2)
+
+    monitor.observe(reference_data.assign(town="D"))
+    scores = monitor.score().set_index("column")
+    assert scores.loc["town", "drifted"]
+    assert not scores.loc["floor_area_sqm", "drifted"]
+    assert scores.loc["town", "n_rows"] == len(reference_data)
+
+    # the drifted batch drops out of the single bucket window
+    monitor.observe(reference_data)
+    assert not monitor.score()["drifted"].any()
+
+
+def test_monitor_prepares_batches(reference_data):
+    """Test batches are prepared into the fit data form before counting."""
+    reference = tm.drift.DriftReference.from_data(reference_data)
+    monitor = tm.drift.DriftMonitor(
+        reference, prepare=lambda data: data.assign(floor_area_sqm=data["area"] / 10)
+    )
+
+    monitor.update(reference_data.assign(area=reference_data["floor_area_sqm"] * 10))
+    assert not monitor.score()["drifted"].any()
+
+
+def test_monitor_drops_when_full(reference_data):
+    """Test observe never blocks and counts dropped batches."""
+    reference = tm.drift.DriftReference.from_data(reference_data)
+    monitor = tm.drift.DriftMonitor(reference, max_queue=2)
+
+    for _ in range(5):
+        monitor.observe(reference_data)
+
+    assert monitor.n_dropped == 3
+    assert monitor.score()["n_rows"].eq(2 * len(reference_data)).all()
+
+
+def test_monitor_skips_failing_batches(reference_data):
+    """Test unparsable values count as missing and failing batches are skipped."""
+
+    def prepare(data):
+        if "bad" in data:
+            raise ValueError("cannot clean batch")
+        return data
+
+    reference = tm.drift.DriftReference.from_data(reference_data)
+    monitor = tm.drift.DriftMonitor(reference, prepare=prepare)
+
+    text = reference_data.assign(floor_area_sqm="unknown")
+    counts = reference.bucket_counts(
+        reference.columns["floor_area_sqm"], text["floor_area_sqm"]
+    )
+    assert counts[-1] == len(text)
+
+    monitor.observe(reference_data.assign(bad=1))
+    monitor.observe(reference_data)
+    scores = monitor.score().set_index("column")
+    assert monitor.n_failed == 1
+    assert (scores["n_rows"] == len(reference_data)).all()
+
+
+def test_monitor_background_thread(reference_data):
+    """Test the background thread scores every interval and stops."""
+    reference = tm.drift.DriftReference.from_data(reference_data)
+    monitor = tm.drift.DriftMonitor(reference, interval=0.01, n_windows=10_000)
+    scored = threading.Event()
+    score = monitor.score
+    monitor.score = lambda: (score(), scored.set())[0]
+
+    monitor.start()
+    monitor.observe(reference_data)
+    assert scored.wait(timeout=5)
+    monitor.stop()
+
+    # rows counted by the thread or still queued are all in the window
+    assert (monitor.score()["n_rows"] == len(reference_data)).all()
+    assert monitor._thread is None
+
+
+def test_preprocessor_saves_reference(reference_data, tmp_path):
+    """Test fit sketches the drift reference, saved and loaded with preprocessors."""
+    params = omegaconf.DictConfig(
+        {
+            "standardscaler": {"columns": ["floor_area_sqm"]},
+            "onehotencoder": {"columns": ["town"]},
+        }
+    )
+    data = reference_data.fillna(90.0)
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        params, tmp_path, drift_columns=["town", "not_in_data"]
+    )
+    preprocessor.fit_preprocessors(data)
+    assert list(preprocessor.drift_reference.columns) == ["town"]
+
+    loaded = tm.data_preprocessor.HdbDataPreprocessor(params, tmp_path)
+    loaded.load_preprocessors()
+    assert loaded.drift_reference.columns == preprocessor.drift_reference.columns
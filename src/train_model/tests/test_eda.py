@@ -0,0 +1,102 @@
+"""Test module for pre-aggregated eda plotting."""
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+mpl.use("Agg")
+
+
+@pytest.fixture
+def data():
+    """Dataframe fixture with a numeric and categorical column."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "floor_area_sqm": rng.uniform(30, 150, 10_000),
+            "town": rng.choice(["A", "B", "C"], 10_000),
+        }
+    )
+    return df
+
+
+@pytest.fixture
+def profile(data):
+    """Profile fixture of data."""
+    chunks = tm.feature_matrix.iter_dataframe_chunks(data, 3_000)
+    return tm.utils.profiler.profile_chunks(chunks)
+
+
+def test_aggregate_histogram(data):
+    """Test chunk-wise histogram matches np.histogram."""
+    chunks = tm.feature_matrix.iter_dataframe_chunks(data, 3_000)
+    counts, edges = tm.utils.eda.aggregate_histogram(
+        chunks, "floor_area_sqm", value_range=(30, 150), bins=10
+    )
+    expected_counts, expected_edges = np.histogram(
+        data["floor_area_sqm"], bins=10, range=(30, 150)
+    )
+
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_array_equal(edges, expected_edges)
+
+
+def test_box_stats_from_profile(data, profile):
+    """Test box statistics from the t-digest are close to exact quartiles."""
+    stats = tm.utils.eda.box_stats_from_profile(
+        profile.columns["floor_area_sqm"], "floor_area_sqm"
+    )
+    q1, med, q3 = data["floor_area_sqm"].quantile([0.25, 0.5, 0.75])
+
+    assert stats["q1"] == pytest.approx(q1, rel=0.01)
+    assert stats["med"] == pytest.approx(med, rel=0.01)
+    assert stats["q3"] == pytest.approx(q3, rel=0.01)
+    assert stats["whislo"] >= data["floor_area_sqm"].min()
+
+
+def test_plot_with_pre_aggregated_inputs(data, profile):
+    """Test plotting functions accept pre-aggregated inputs without data."""
+    hist = np.histogram(data["floor_area_sqm"], bins=10)
+    axe = tm.utils.eda.plot_single_numeric_hist(None, "floor_area_sqm", hist=hist)
+    assert axe.get_title() == "Distribution of floor_area_sqm"
+    plt.close("all")
+
+    axe = tm.utils.eda.plot_cat_distribution(
+        None, "town", counts=profile.columns["town"].top(60)
+    )
+    assert len(axe.patches) == 3
+    plt.close("all")
+
+    counts = pd.Series(np.arange(70, 0, -1), index=[f"c{i}" for i in range(70)])
+    assert (
+        tm.utils.eda.plot_cat_distribution(None, "town", counts=counts[:60]) is not None
+    )
+    plt.close("all")
+    assert (
+        tm.utils.eda.plot_cat_distribution(
+            None, "town", counts=counts[:60], n_categories=70
+        )
+        is None
+    )
+    axe = tm.utils.eda.plot_cat_distribution(
+        None, "town", counts=counts[:5], n_categories=40
+    )
+    assert axe.get_title() == "count of town (top 5 of 40)"
+    plt.close("all")
+
+    axes = tm.utils.eda.eda_for_single_numeric_profile(
+        profile, "floor_area_sqm", hist=hist, edit_plot=True
+    )
+    assert len(axes) == 2
+    plt.close("all")
+
+    axes = tm.utils.eda.eda_for_single_numeric_profile(
+        profile, "floor_area_sqm", edit_plot=True
+    )
+    assert len(axes) == 1
+    assert len(plt.gcf().axes) == 1
+    plt.close("all")
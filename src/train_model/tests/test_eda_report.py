@@ -0,0 +1,86 @@
+"""Test module for the headless eda report."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+
+@pytest.fixture
+def data():
+    """Dataframe fixture with numeric, categorical and missing values."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "floor_area_sqm": rng.uniform(30, 150, 1_000),
+            "town": rng.choice(["A", "B", "C"], 1_000),
+            "remaining_lease": rng.integers(40, 99, 1_000).astype(float),
+        }
+    )
+    df.loc[:9, "remaining_lease"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("report_format", ["markdown", "html"])
+def test_write_report(data, tmp_path, report_format):
+    """Test the report has a section and figure for every column."""
+    report_path = tm.utils.eda_report.write_report(
+        data, tmp_path, report_format=report_format
+    )
+    report = report_path.read_text()
+
+    figures = sorted(p.name for p in (tmp_path / "figures").glob("*.png"))
+    assert len(figures) == 3
+    for col in data.columns:
+        assert col in report
+    if report_format == "markdown":
+        for figure in figures:
+            assert f"figures/{figure}" in report
+    else:
+        assert "figures/" not in report
+        assert report.count('src="data:image/png;base64,') == 3
+    assert "10" in report
+
+
+def test_report_empty_columns(data, tmp_path):
+    """Test columns without any value render a no data section."""
+    data["all_null"] = None
+    for frame in [data, data.iloc[:0]]:
+        report = tm.utils.eda_report.write_report(frame, tmp_path).read_text()
+        assert "## all_null" in report
+
+
+def test_report_reuses_unchanged_figures(data, tmp_path):
+    """Test only columns with changed data are re-rendered."""
+    tm.utils.eda_report.write_report(data, tmp_path)
+    figures = {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("figures/*.png")}
+
+    data["town"] = data["town"].str.lower()
+    report = tm.utils.eda_report.write_report(data, tmp_path).read_text()
+    new_figures = {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("figures/*.png")}
+
+    # only town is rendered again, into a new figure
+    added = set(new_figures) - set(figures)
+    assert len(added) == 1
+    assert next(iter(added)).startswith("town-")
+    assert all(new_figures[name] == mtime for name, mtime in figures.items())
+    referenced = {name for name in new_figures if f"figures/{name}" in report}
+    assert len(referenced) == 3
+    assert added <= referenced
+
+
+def test_report_process_pool(data, tmp_path):
+    """Test rendering across processes gives the same report."""
+    serial = tm.utils.eda_report.write_report(data, tmp_path / "serial").read_text()
+    parallel = tm.utils.eda_report.write_report(
+        data, tmp_path / "parallel", n_workers=2
+    ).read_text()
+
+    assert serial == parallel
+
+
+def test_report_unknown_format(data, tmp_path):
+    """Test an unknown report format raises."""
+    with pytest.raises(NotImplementedError):
+        tm.utils.eda_report.write_report(data, tmp_path, report_format="pdf")
@@ -0,0 +1,99 @@
+"""Test module for high-cardinality encoders."""
+
+import numpy as np
+import omegaconf
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+
+@pytest.fixture
+def data():
+    """Dataframe fixture with high cardinality columns and a target."""
+    rng = np.random.default_rng(0)
+    street = rng.integers(0, 300, 3000)
+    df = pd.DataFrame(
+        {
+            "street_name": [f"STREET {s}" for s in street],
+            "block": rng.integers(1, 50, 3000).astype(str),
+            "resale_price": street * 1000.0 + rng.normal(0, 100, 3000),
+        }
+    )
+    return df
+
+
+def test_hashing_encoder_fixed_width(data):
+    """Test hashing encoder output width is fixed and deterministic."""
+    encoder = tm.encoders.HashingEncoder(n_features=16)
+    x = data[["street_name", "block"]]
+    result = encoder.fit(x).transform(x)
+
+    assert result.shape == (len(data), 16)
+    assert np.abs(result).sum(axis=1).max() <= 2
+    assert (encoder.transform(x) != result).nnz == 0
+    assert encoder.get_feature_names_out()[0] == "hashingencoder0"
+
+    unseen = encoder.transform(pd.DataFrame({"street_name": ["NEW"], "block": ["1"]}))
+    assert unseen.shape == (1, 16)
+
+
+def test_mean_target_encoder(data):
+    """Test target means are smoothed and unseen values get the global mean."""
+    encoder = tm.encoders.MeanTargetEncoder(smoothing=0.0)
+    x = data[["street_name"]]
+    encoder.fit(x, data["resale_price"])
+
+    expected = data.groupby("street_name")["resale_price"].mean()
+    result = encoder.transform(x)[:, 0]
+    np.testing.assert_allclose(result, data["street_name"].map(expected))
+
+    unseen = encoder.transform(pd.DataFrame({"street_name": ["NEW", None]}))
+    np.testing.assert_allclose(unseen[:, 0], data["resale_price"].mean())
+
+    with pytest.raises(ValueError):
+        encoder.fit(x, None)
+
+
+def test_mean_target_encoder_cross_fit(data):
+    """Test cross fitting encodes each row without its own target."""
+    encoder = tm.encoders.MeanTargetEncoder(n_splits=5, smoothing=0.0)
+    x = data[["street_name"]]
+    y = data["resale_price"]
+    encoder.fit(x, y)
+    fitted = encoder.transform(x)
+    oof = encoder.cross_fit_transform(x, y)
+
+    # brute force out of fold means
+    folds = np.empty(len(data), dtype=int)
+    kfold = tm.encoders.KFold(5, shuffle=True, random_state=0)
+    for i, (_, index) in enumerate(kfold.split(y)):
+        folds[index] = i
+    row = 0
+    other = (folds != folds[row]) & (data["street_name"] == data["street_name"][row])
+    assert oof[row, 0] == pytest.approx(y[other].mean())
+
+    np.testing.assert_allclose(encoder.transform(x), fitted)
+    assert not np.allclose(oof, fitted)
+
+
+def test_preprocessor_with_encoders(data, tmp_path):
+    """Test encoders fit with params and target, save and load in the preprocessor."""
+    params = omegaconf.DictConfig(
+        {
+            "hashingencoder": {"columns": ["block"], "params": {"n_features": 8}},
+            "meantargetencoder": {"columns": ["street_name"]},
+        }
+    )
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(params, tmp_path)
+    preprocessor.fit_preprocessors(data)
+    result = preprocessor.transform_data(data)
+    train_result = preprocessor.transform_data(data, y=data["resale_price"])
+
+    assert result.shape == (len(data), 9)
+    assert result.columns[-1] == "street_name"
+    assert not np.allclose(result["street_name"], train_result["street_name"])
+
+    loaded = tm.data_preprocessor.HdbDataPreprocessor(params, tmp_path)
+    loaded.load_preprocessors()
+    pd.testing.assert_frame_equal(loaded.transform_data(data), result)
@@ -6,8 +6,11 @@ import pytest
 from sklearn.metrics import (
     accuracy_score,
     f1_score,
+    max_error,
     mean_absolute_error,
     mean_squared_error,
+    median_absolute_error,
+    r2_score,
 )
 
 import train_model as tm
@@ -117,3 +120,53 @@ def test_cv_metric_class_get_mean(metric_hash):
     cv_metrics.metrics = metric_hash
 
     assert cv_metrics.get_mean("f1_score") == 0.6375
+
+
+def test_regression_accumulator_pooled_metrics(regression_config, regression_data):
+    """Test accumulator over chunks gives the same metrics as full arrays."""
+    ytrue, ypred = regression_data
+    accumulator = tm.evaluator.RegressionAccumulator()
+    other = tm.evaluator.RegressionAccumulator()
+    accumulator.update(ypred[:3], ytrue[:3]).update(ypred[3:6], ytrue[3:6])
+    other.update(ypred[6:], ytrue[6:])
+    accumulator.merge(other)
+    result = accumulator.result()
+
+    assert result["mean_absolute_error"] == pytest.approx(
+        mean_absolute_error(ytrue, ypred)
+    )
+    assert result["mean_squared_error"] == pytest.approx(
+        mean_squared_error(ytrue, ypred)
+    )
+    assert result["r2_score"] == pytest.approx(r2_score(ytrue, ypred))
+    assert result["max_error"] == pytest.approx(max_error(ytrue, ypred))
+
+    evaluator = tm.evaluator.Evaluator(regression_config.evaluate)
+    evaluator.evaluate_accumulator(accumulator)
+    assert evaluator.metrics["mean_squared_error"] == result["mean_squared_error"]
+
+
+def test_regression_accumulator_median_absolute_error():
+    """Test approximate median absolute error on a larger sample."""
+    rng = np.random.default_rng(0)
+    ytrue = rng.normal(size=50_000)
+    ypred = ytrue + rng.normal(size=50_000)
+    accumulator = tm.evaluator.RegressionAccumulator().update(ypred, ytrue)
+
+    assert accumulator.result()["median_absolute_error"] == pytest.approx(
+        median_absolute_error(ytrue, ypred), rel=0.01
+    )
+
+
+def test_cv_metric_class_pooled(regression_data):
+    """Test CVMetrics pooled metric differs from the mean of fold metrics."""
+    ytrue, ypred = regression_data
+    cv_metrics = tm.evaluator.CVMetrics()
+    for fold in (slice(0, 3), slice(3, 10)):
+        accumulator = tm.evaluator.RegressionAccumulator()
+        cv_metrics.update_accumulator(accumulator.update(ypred[fold], ytrue[fold]))
+
+    assert cv_metrics.get_pooled("r2_score") == pytest.approx(r2_score(ytrue, ypred))
+    assert cv_metrics.get_mean("r2_score") != pytest.approx(r2_score(ytrue, ypred))
+    with pytest.raises(KeyError):
+        cv_metrics.get_pooled("f2_score")
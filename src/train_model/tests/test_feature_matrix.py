@@ -0,0 +1,130 @@
+"""Test module for memory-mapped feature matrix."""
+
+import numpy as np
+import omegaconf
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, SGDRegressor
+
+import train_model as tm
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Config yaml mock for preprocessor."""
+    config = {
+        "save_path": tmp_path,
+        "preprocessor": {
+            "standardscaler": {"columns": ["floor_area_sqm", "storey_to"]},
+            "onehotencoder": {"columns": ["Column2"]},
+        },
+    }
+    return omegaconf.DictConfig(config)
+
+
+@pytest.fixture
+def data():
+    """Dataframe fixture with target column."""
+    df = pd.DataFrame(
+        {
+            "Column2": ["A", "B", "C", "A", "B", "C", "A"],
+            "storey_to": [4, 12, 9, 9, 12, 3, 6],
+            "floor_area_sqm": [60, 70, 80, 90, 60, 100, 110],
+            "resale_price": [300.0, 350.0, 400.0, 420.0, 310.0, 500.0, 520.0],
+        }
+    )
+    return df
+
+
+@pytest.fixture
+def preprocessor(config, data):
+    """Fitted preprocessor fixture."""
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor(
+        config.preprocessor, config.save_path
+    )
+    preprocessor.fit_preprocessors(data)
+    return preprocessor
+
+
+def test_write_feature_matrix(preprocessor, data, tmp_path):
+    """Test feature matrix is written chunk-wise and matches in-memory transform."""
+    matrix = tm.feature_matrix.write_feature_matrix(
+        preprocessor, data, tmp_path / "features", chunk_size=3
+    )
+    expected = preprocessor.transform_data(data)
+
+    assert isinstance(matrix.x, np.memmap)
+    assert matrix.x.dtype == np.float32
+    assert matrix.shape == expected.shape
+    assert matrix.columns == expected.columns.tolist()
+    np.testing.assert_allclose(matrix.x, expected.to_numpy(), rtol=1e-6)
+    np.testing.assert_allclose(matrix.y, data["resale_price"])
+
+
+def test_feature_matrix_reopen_and_iter_chunks(preprocessor, data, tmp_path):
+    """Test feature matrix can be reopened and iterated in chunks."""
+    tm.feature_matrix.write_feature_matrix(
+        preprocessor, [data.iloc[:4], data.iloc[4:]], tmp_path / "features"
+    )
+    matrix = tm.feature_matrix.FeatureMatrix(tmp_path / "features")
+    chunks = list(matrix.iter_chunks(chunk_size=3))
+
+    assert matrix.n_rows == 7
+    assert [len(x) for x, _ in chunks] == [3, 3, 1]
+
+
+def test_predictor_on_feature_matrix(preprocessor, data, tmp_path):
+    """Test predictors fit and predict on the memory-mapped matrix."""
+    matrix = tm.feature_matrix.write_feature_matrix(
+        preprocessor, data, tmp_path / "features"
+    )
+    predictor = tm.models.SKLearnPredictor({}, model=LinearRegression)
+    predictor.fit(matrix.x, matrix.y)
+
+    ypred = predictor.predict_chunks(matrix.x, chunk_size=2)
+    np.testing.assert_allclose(ypred, predictor.predict(matrix.x), rtol=1e-5)
+
+
+def test_predictor_fit_chunks(preprocessor, data, tmp_path):
+    """Test partial_fit over chunks and error for non incremental models."""
+    matrix = tm.feature_matrix.write_feature_matrix(
+        preprocessor, data, tmp_path / "features"
+    )
+    predictor = tm.models.SKLearnPredictor({"random_state": 0}, model=SGDRegressor)
+    predictor.fit_chunks(matrix.iter_chunks(chunk_size=3))
+    assert len(predictor.predict(matrix.x)) == 7
+
+    predictor = tm.models.SKLearnPredictor({}, model=LinearRegression)
+    with pytest.raises(NotImplementedError):
+        predictor.fit_chunks(matrix.iter_chunks(chunk_size=3))
+
+
+def test_evaluate_feature_matrix(preprocessor, data, tmp_path):
+    """Test chunked evaluation matches evaluating all predictions at once."""
+    matrix = tm.feature_matrix.write_feature_matrix(
+        preprocessor, data, tmp_path / "features"
+    )
+    predictor = tm.models.SKLearnPredictor({}, model=LinearRegression)
+    predictor.fit(matrix.x, matrix.y)
+    params = [
+        "sklearn.metrics.mean_absolute_error",
+        "sklearn.metrics.root_mean_squared_error",
+    ]
+
+    metrics = matrix.evaluate(predictor, tm.evaluator.Evaluator(params), chunk_size=3)
+    expected = tm.evaluator.Evaluator(params)
+    expected.evaluate(predictor.predict(matrix.x), matrix.y)
+
+    assert metrics.keys() == expected.metrics.keys()
+    for name, value in expected.metrics.items():
+        assert metrics[name] == pytest.approx(value, rel=1e-5)
+
+
+def test_empty_feature_matrix(preprocessor, data, tmp_path):
+    """Test an empty input writes a matrix that opens with zero rows."""
+    matrix = tm.feature_matrix.write_feature_matrix(
+        preprocessor, data.iloc[:0], tmp_path / "features"
+    )
+    assert matrix.shape == (0, len(matrix.columns))
+    assert len(matrix.y) == 0
+    assert list(matrix.iter_chunks()) == []
@@ -0,0 +1,130 @@
+"""Test module for monthly feature store."""
+
+import numpy as np
+import omegaconf
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+COL = tm.data_model.ColumnEnum
+
+
+@pytest.fixture
+def preprocessor(tmp_path):
+    """Preprocessor fixture for feature engineering."""
+    params = omegaconf.DictConfig({"standardscaler": {"columns": ["floor_area_sqm"]}})
+    return tm.data_preprocessor.HdbDataPreprocessor(params, tmp_path)
+
+
+@pytest.fixture
+def data():
+    """Dataframe fixture of cleaned data over three months."""
+    df = pd.DataFrame(
+        {
+            "month": ["2017-01", "2017-01", "2017-02", "2017-03", "2017-03"],
+            "town": ["A", "B", "C", "D", "E"],
+            "storey_to": [4, 12, 9, 9, 12],
+            "floor_area_sqm": [60.0, 70.0, 80.0, 90.0, 60.0],
+            "remaining_lease": [49, 50, 51, 90, 60],
+        }
+    )
+    return df
+
+
+def test_feature_store_update_and_read(preprocessor, data, tmp_path):
+    """Test feature store writes partitions and reads a time window."""
+    store = tm.feature_store.MonthlyFeatureStore(tmp_path / "store", preprocessor)
+
+    assert store.update(data) == ["2017-01", "2017-02", "2017-03"]
+    assert store.months() == ["2017-01", "2017-02", "2017-03"]
+
+    window = store.read(start="2017-02", columns=["town", COL.storey_area_ratio])
+    assert window.columns.tolist() == ["town", "storey_area_ratio"]
+    assert window["town"].tolist() == ["C", "D", "E"]
+    assert window[COL.storey_area_ratio].tolist() == [80 / 9, 10.0, 5.0]
+
+    full = store.read()
+    assert full.shape[0] == 5
+    assert full[COL.lease_less_than_50_yrs].dtype == bool
+
+
+def test_feature_store_recomputes_only_changed(preprocessor, data, tmp_path):
+    """Test only new, changed or invalidated partitions are recomputed."""
+    store = tm.feature_store.MonthlyFeatureStore(tmp_path / "store", preprocessor)
+    store.update(data)
+
+    assert store.update(data) == []
+
+    changed = data.copy()
+    changed.loc[2, "floor_area_sqm"] = 85.0
+    new_month = pd.DataFrame([{**data.iloc[0].to_dict(), "month": "2017-04"}])
+    updated = pd.concat([changed, new_month])
+    assert store.update(updated) == ["2017-02", "2017-04"]
+
+    store.invalidate(["2017-01"])
+    assert store.update(updated) == ["2017-01"]
+
+
+def test_feature_store_version_partitions(preprocessor, data, tmp_path):
+    """Test a new feature version does not read partitions of older versions."""
+    store = tm.feature_store.MonthlyFeatureStore(tmp_path / "store", preprocessor)
+    store.update(data)
+
+    store_v2 = tm.feature_store.MonthlyFeatureStore(
+        tmp_path / "store", preprocessor, version=2
+    )
+    assert store_v2.months() == []
+    assert store_v2.read().empty
+
+
+def test_feature_store_hash_row_order(preprocessor, data, tmp_path):
+    """Test reordered rows of a partition count as a change."""
+    store = tm.feature_store.MonthlyFeatureStore(tmp_path / "store", preprocessor)
+    store.update(data)
+
+    assert store.update(data.iloc[::-1]) == ["2017-01", "2017-03"]
+
+
+def test_feature_store_dtypes_without_pickle(preprocessor, data, tmp_path):
+    """Test text and nullable columns round-trip with missing values, no pickle."""
+    data = data.assign(
+        town=["A", np.nan, "C", "D", "E"],
+        year=pd.array([2017, 2017, None, 2017, 2017], dtype="Int64"),
+        street=pd.array(["X", "Y", "Z", None, "W"], dtype="string"),
+    )
+    store = tm.feature_store.MonthlyFeatureStore(tmp_path / "store", preprocessor)
+    store.update(data)
+    result = store.read(columns=["town", "year", "street", "storey_to"])
+
+    pd.testing.assert_frame_equal(result, data[["town", "year", "street", "storey_to"]])
+    for path in (tmp_path / "store").rglob("*.npy"):
+        assert not np.load(path, allow_pickle=False).dtype.hasobject
+
+
+def test_feature_store_follows_source(preprocessor, data, tmp_path, caplog):
+    """Test months gone from the source are removed and rows without one logged."""
+    store = tm.feature_store.MonthlyFeatureStore(tmp_path / "store", preprocessor)
+    store.update(data)
+
+    data = data.astype({"month": object})
+    data.loc[data["month"] == "2017-02", "month"] = None
+    with caplog.at_level("WARNING"):
+        assert store.update(data) == []
+
+    assert "Skipping 1 rows without a month" in caplog.text
+    assert store.months() == ["2017-01", "2017-03"]
+    assert store.read()["town"].tolist() == ["A", "B", "D", "E"]
+
+
+def test_feature_store_interrupted_swap(preprocessor, data, tmp_path):
+    """Test a partition renamed aside by an interrupted swap is restored."""
+    store = tm.feature_store.MonthlyFeatureStore(tmp_path / "store", preprocessor)
+    store.update(data)
+    partition = store._partition_path("2017-01")
+    partition.rename(partition.with_name(partition.name + ".old"))
+    assert store.months() == ["2017-02", "2017-03"]
+
+    store = tm.feature_store.MonthlyFeatureStore(tmp_path / "store", preprocessor)
+    assert store.months() == ["2017-01", "2017-02", "2017-03"]
+    assert store.update(data) == []
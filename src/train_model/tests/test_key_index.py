@@ -0,0 +1,192 @@
+"""Test module for the record key index."""
+
+import shutil
+from itertools import pairwise
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+
+@pytest.fixture
+def batch():
+    """Dataframe fixture of raw records with a record key."""
+    df = pd.DataFrame(
+        {
+            "record_id": [3, 1, 2],
+            "town": ["A", "B", "C"],
+            "floor_area_sqm": [60.0, 70.0, 80.0],
+            "resale_price": [300.0, 350.0, 400.0],
+        }
+    )
+    return df
+
+
+def test_lookup_and_update():
+    """Test keys are looked up by binary search and newer runs win."""
+    index = tm.key_index.KeyIndex()
+    index.update(
+        np.array([5, 1, 3]), np.array([0, 1, 2]), np.array([7, 8, 9], dtype=np.uint64)
+    )
+    assert index.runs[0].keys.tolist() == [1, 3, 5]
+
+    rows, hashes = index.lookup([3, 4, 5, 9])
+    assert rows.tolist() == [2, -1, 0, -1]
+    assert hashes.tolist() == [9, 0, 7, 0]
+
+    index.update(np.array([3, 2]), np.array([3, 4]), np.array([1, 2], dtype=np.uint64))
+    assert len(index) == 4
+    assert index.lookup([3])[0].tolist() == [3]
+    assert index.current_rows().tolist() == [0, 1, 3, 4]
+
+
+def test_runs_merged_size_tiered(tmp_path):
+    """Test small updates keep few runs of decreasing size that save and load."""
+    index = tm.key_index.KeyIndex()
+    for i in range(100):
+        index.update(np.array([i]), np.array([i]), np.array([i], dtype=np.uint64))
+        index.save(tmp_path)
+
+    sizes = [len(run) for run in index.runs]
+    assert len(sizes) <= 7
+    assert all(older > 2 * newer for older, newer in pairwise(sizes))
+    assert len(list(tmp_path.glob("*.npy"))) == len(sizes)
+
+    loaded = tm.key_index.KeyIndex.load(tmp_path)
+    assert len(loaded) == 100
+    assert loaded.lookup(np.arange(101))[0].tolist() == [*range(100), -1]
+
+
+def test_ingest_writes_only_the_batch(batch, tmp_path):
+    """Test an ingest adds a run of its batch and leaves saved runs untouched."""
+    data_path = tmp_path / "raw.csv"
+    tm.key_index.ingest(data_path, pd.concat([batch] * 4).assign(record_id=range(12)))
+    folder = tm.key_index.index_path(data_path)
+    base = folder / "run-00000000-00000000.npy"
+    mtime = base.stat().st_mtime_ns
+
+    tm.key_index.ingest(data_path, batch.iloc[[0]].assign(record_id=20))
+    assert sorted(path.name for path in folder.glob("*.npy")) == [
+        "run-00000000-00000000.npy",
+        "run-00000001-00000001.npy",
+    ]
+    assert base.stat().st_mtime_ns == mtime
+    assert len(tm.key_index.read_current(data_path)) == 13
+
+
+def test_interrupted_merge(batch, tmp_path):
+    """Test runs left behind by an interrupted merge are covered by the merged run."""
+    data_path = tmp_path / "raw.csv"
+    tm.key_index.ingest(data_path, batch)
+    folder = tm.key_index.index_path(data_path)
+    shutil.copytree(folder, tmp_path / "before")
+
+    tm.key_index.ingest(data_path, batch.assign(record_id=[4, 5, 6]))
+    assert [run.name for run in tm.key_index.load_index(data_path).runs] == [
+        "run-00000000-00000001"
+    ]
+    shutil.copytree(tmp_path / "before", folder, dirs_exist_ok=True)
+
+    index = tm.key_index.load_index(data_path)
+    assert [run.name for run in index.runs] == ["run-00000000-00000001"]
+    assert len(index) == 6
+    assert tm.key_index.ingest(data_path, batch).empty
+
+
+def test_ingest_upsert(batch, tmp_path):
+    """Test ingest appends new and changed records, unchanged records are skipped."""
+    data_path = tmp_path / "raw.csv"
+    tm.key_index.ingest(data_path, batch)
+
+    update = pd.DataFrame(
+        {
+            "resale_price": [360.0, 400.0, 500.0],
+            "town": ["B", "C", "D"],
+            "floor_area_sqm": [70.0, 80.0, 90.0],
+            "record_id": [1, 2, 4],
+        }
+    )
+    written = tm.key_index.ingest(data_path, update)
+    assert written["record_id"].tolist() == [1, 4]
+    assert len(pd.read_csv(data_path)) == 5
+
+    current = tm.key_index.read_current(data_path).set_index("record_id")
+    assert sorted(current.index) == [1, 2, 3, 4]
+    assert current.loc[1, "resale_price"] == 360.0
+    assert list(current.columns) == ["town", "floor_area_sqm", "resale_price"]
+
+
+def test_ingest_skip(batch, tmp_path):
+    """Test skip keeps stored records and only appends new keys."""
+    data_path = tmp_path / "raw.csv"
+    tm.key_index.ingest(data_path, batch, on_duplicate="skip")
+
+    update = batch.assign(resale_price=0.0, record_id=[3, 5, 5])
+    written = tm.key_index.ingest(data_path, update, on_duplicate="skip")
+    assert written["record_id"].tolist() == [5]
+
+    current = tm.key_index.read_current(data_path).set_index("record_id")
+    assert current.loc[3, "resale_price"] == 300.0
+    assert current.loc[5, "resale_price"] == 0.0
+
+
+def test_index_rebuilt_from_data(batch, tmp_path):
+    """Test a missing index is rebuilt with the latest row of every key."""
+    data_path = tmp_path / "raw.csv"
+    pd.concat([batch, batch.iloc[[0]].assign(resale_price=1.0)]).to_csv(
+        data_path, index=False
+    )
+
+    index = tm.key_index.load_index(data_path)
+    assert tm.key_index.index_path(data_path).is_dir()
+    assert index.n_rows == 4
+    assert index.lookup([3])[0].tolist() == [3]
+
+    # an unchanged record read back from csv hashes the same
+    assert tm.key_index.ingest(data_path, batch.iloc[[1, 2]]).empty
+
+
+def test_missing_values_hash_like_csv(batch, tmp_path):
+    """Test records with missing values are unchanged after a csv round-trip."""
+    batch = batch.astype({"town": object})
+    batch.loc[0, "town"] = None
+    batch.loc[1, "floor_area_sqm"] = np.nan
+    data_path = tmp_path / "raw.csv"
+    tm.key_index.ingest(data_path, batch)
+    assert tm.key_index.ingest(data_path, batch).empty
+
+    # hashes of the index rebuilt from csv match the in-memory batch
+    shutil.rmtree(tm.key_index.index_path(data_path))
+    assert tm.key_index.ingest(data_path, batch).empty
+    assert len(pd.read_csv(data_path)) == 3
+
+
+def test_interrupted_ingest(batch, tmp_path):
+    """Test data appended without its index is rolled back, other changes rebuilt."""
+    data_path = tmp_path / "raw.csv"
+    tm.key_index.ingest(data_path, batch)
+    with open(data_path, "a") as f:
+        f.write("4,D,9")
+
+    current = tm.key_index.read_current(data_path)
+    pd.testing.assert_frame_equal(current, batch)
+    written = tm.key_index.ingest(data_path, batch.assign(record_id=[4, 5, 6]))
+    assert len(written) == 3
+    current = tm.key_index.read_current(data_path)
+    assert current["record_id"].tolist() == [3, 1, 2, 4, 5, 6]
+
+    batch.to_csv(data_path, index=False)
+    assert len(tm.key_index.load_index(data_path)) == 3
+
+
+def test_ingest_errors(batch, tmp_path):
+    """Test unknown duplicate handling and missing columns raise."""
+    data_path = tmp_path / "raw.csv"
+    with pytest.raises(NotImplementedError):
+        tm.key_index.ingest(data_path, batch, on_duplicate="replace")
+
+    tm.key_index.ingest(data_path, batch)
+    with pytest.raises(KeyError):
+        tm.key_index.ingest(data_path, batch.drop(columns="town"))
@@ -2,11 +2,13 @@
 
 import pathlib
 
+import numpy as np
 import omegaconf
 import pandas as pd
 import pytest
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
+from sklearn.neighbors import KNeighborsRegressor
 
 import train_model as tm
 
@@ -111,3 +113,273 @@ def test_sklearn_predictor_save_func(config, model, tmp_path, request):
 
     directory_list = (str(i.stem) for i in pathlib.Path(tmp_path).iterdir())
     assert sk_predictor.model.__class__.__name__.lower() in list(directory_list)
+
+
+def test_sklearn_predictor_float32_precision(linear_regression_config, train_data):
+    """Test sklearn predictor casts features to float32 precision."""
+    sklearn_model = tm.models.SKLearnPredictor(
+        linear_regression_config.model, model=LinearRegression, precision="float32"
+    )
+    x = train_data[["floor_area_sqm"]]
+    sklearn_model.fit(x, train_data["remaining_lease"])
+
+    assert sklearn_model._cast_features(x).dtypes.iloc[0] == np.float32
+    assert sklearn_model.model.coef_.dtype == np.float32
+    assert len(sklearn_model.predict(x)) == x.shape[0]
+
+
+def test_sklearn_predictor_default_precision(linear_regression_config, tmp_path):
+    """Test predictor and preprocessor share the default precision."""
+    sklearn_model = tm.models.SKLearnPredictor(
+        linear_regression_config.model, model=LinearRegression
+    )
+    preprocessor = tm.data_preprocessor.HdbDataPreprocessor({}, tmp_path)
+
+    assert sklearn_model.precision == preprocessor.precision
+    assert sklearn_model._cast_features(np.ones((2, 1), np.float32)).dtype == np.float64
+    with pytest.raises(NotImplementedError):
+        tm.models.SKLearnPredictor({}, model=LinearRegression, precision="float16")
+
+
+@pytest.fixture
+def categorical_data():
+    """Dataframe fixture with an integer-coded categorical column."""
+    rng = np.random.default_rng(0)
+    town = rng.integers(0, 30, 500)
+    floor_area = rng.uniform(40, 150, 500)
+    df = pd.DataFrame({"town": town.astype(float), "floor_area_sqm": floor_area})
+    y = floor_area * 10 + (town % 7) * 100
+    return df, y
+
+
+def test_hist_gradient_boosting_predictor(categorical_data, tmp_path):
+    """Test native categorical gradient boosting fits, saves and loads."""
+    x, y = categorical_data
+    params = omegaconf.DictConfig(
+        {"categorical_features": ["town"], "max_iter": 200, "random_state": 0}
+    )
+    predictor = tm.models.HistGradientBoostingPredictor(params, n_threads=1)
+    predictor.fit(x, y)
+
+    assert predictor.model.is_categorical_.tolist() == [True, False]
+    assert predictor.model.n_iter_ < 200
+    ypred = predictor.predict(x.to_numpy())
+    assert np.corrcoef(ypred, y)[0, 1] > 0.95
+
+    predictor.save(tmp_path)
+    loaded = tm.models.HistGradientBoostingPredictor.load(
+        tmp_path, params, model=predictor.model_obj
+    )
+    np.testing.assert_allclose(loaded.predict(x), ypred)
+
+
+def test_hist_gradient_boosting_missing_categorical(categorical_data):
+    """Test unknown categorical column names raise."""
+    x, y = categorical_data
+    params = omegaconf.DictConfig({"categorical_features": ["flat_type"]})
+    predictor = tm.models.HistGradientBoostingPredictor(params)
+    with pytest.raises(KeyError):
+        predictor.fit(x, y)
+
+
+@pytest.mark.parametrize(
+    "model,params",
+    [
+        pytest.param(LinearRegression, {}, id="linear_regression"),
+        pytest.param(
+            RandomForestRegressor,
+            {"n_estimators": 5, "max_depth": 4, "random_state": 0},
+            id="randomforestregressor",
+        ),
+    ],
+)
+def test_sklearn_predictor_explain(categorical_data, model, params):
+    """Test contributions of each row sum to its prediction."""
+    x, y = categorical_data
+    predictor = tm.models.SKLearnPredictor(params, model=model)
+    predictor.fit(x, y)
+    contributions = predictor.explain(x)
+
+    assert list(contributions.columns) == ["town", "floor_area_sqm", "bias"]
+    np.testing.assert_allclose(contributions.sum(axis=1), predictor.predict(x))
+    # floor area drives the target far more than town
+    assert (
+        contributions["floor_area_sqm"].abs().mean()
+        > contributions["town"].abs().mean()
+    )
+
+
+def test_linear_explain_is_centred(categorical_data):
+    """Test linear contributions average to zero on training data."""
+    x, y = categorical_data
+    predictor = tm.models.SKLearnPredictor({}, model=LinearRegression)
+    predictor.fit(x, y)
+    contributions = predictor.explain(x)
+
+    np.testing.assert_allclose(
+        contributions[["town", "floor_area_sqm"]].mean(), 0, atol=1e-6
+    )
+    assert contributions["bias"].iloc[0] == pytest.approx(predictor.predict(x).mean())
+
+
+def test_linear_explain_float32_memmap(categorical_data, tmp_path):
+    """Test float32 memmapped features fit with float64 feature means."""
+    x, y = categorical_data
+    features = np.lib.format.open_memmap(
+        tmp_path / "x.npy", mode="w+", dtype=np.float32, shape=x.shape
+    )
+    features[:] = x.to_numpy()
+    predictor = tm.models.SKLearnPredictor(
+        {}, model=LinearRegression, precision="float32"
+    )
+    predictor.fit(features, y)
+
+    means = predictor.model.feature_means_
+    assert means.dtype == np.float64
+    np.testing.assert_allclose(means, x.mean(), rtol=1e-6)
+    np.testing.assert_allclose(
+        predictor.explain(features).sum(axis=1), predictor.predict(features), rtol=1e-5
+    )
+
+
+def test_hist_gradient_boosting_explain(categorical_data):
+    """Test boosting contributions sum to predictions, also for unseen values."""
+    x, y = categorical_data
+    params = {"categorical_features": ["town"], "max_iter": 50, "early_stopping": False}
+    x.loc[x.index % 10 == 0, "floor_area_sqm"] = np.nan
+    predictor = tm.models.HistGradientBoostingPredictor(params, n_threads=1)
+    predictor.fit(x, y)
+
+    # missing, negative and unknown categories are routed like missing values
+    new = pd.DataFrame(
+        {"town": [np.nan, -1.0, 99.0, 3.0], "floor_area_sqm": [np.nan, 50, 80, 120]}
+    )
+    for data in [x, new]:
+        contributions = predictor.explain(data)
+        assert list(contributions.columns) == ["town", "floor_area_sqm", "bias"]
+        np.testing.assert_allclose(
+            contributions.sum(axis=1), predictor.predict(data), rtol=1e-6
+        )
+
+    # node values are training means, the bias is the mean training prediction
+    contributions = predictor.explain(x)
+    assert contributions["bias"].iloc[0] == pytest.approx(predictor.predict(x).mean())
+    assert (
+        contributions["floor_area_sqm"].abs().mean()
+        > contributions["town"].abs().mean()
+    )
+
+
+def test_explain_not_implemented(categorical_data):
+    """Test models without an explanation method raise."""
+    x, y = categorical_data
+    predictor = tm.models.HistGradientBoostingPredictor(
+        {"max_iter": 5, "loss": "poisson"}
+    )
+    predictor.fit(x, y)
+    with pytest.raises(NotImplementedError):
+        predictor.explain(x)
+
+    predictor = tm.models.SKLearnPredictor({}, model=KNeighborsRegressor)
+    predictor.fit(x, y)
+    with pytest.raises(NotImplementedError):
+        predictor.explain(x)
+
+
+@pytest.fixture
+def stacking_params():
+    """Stacking params of a linear and a native categorical boosting base model.
+
+    Each base model sees one of the two columns the target adds up.
+    """
+    params = {
+        "n_splits": 3,
+        "n_jobs": 2,
+        "base_models": [
+            {
+                "predictor_path": "train_model.models.SKLearnPredictor",
+                "model_object": "sklearn.linear_model.LinearRegression",
+                "columns": ["floor_area_sqm"],
+            },
+            {
+                "predictor_path": "train_model.models.HistGradientBoostingPredictor",
+                "model_object": "sklearn.ensemble.HistGradientBoostingRegressor",
+                "columns": ["town"],
+                "params": {
+                    "categorical_features": ["town"],
+                    "max_iter": 100,
+                    "random_state": 0,
+                },
+            },
+        ],
+    }
+    return omegaconf.DictConfig(params)
+
+
+def test_stacking_predictor(categorical_data, stacking_params, tmp_path):
+    """Test stacking blends out-of-fold predictions and saves as one artefact."""
+    x, y = categorical_data
+    train, test = np.arange(400), np.arange(400, len(y))
+    predictor = tm.models.StackingPredictor(stacking_params, LinearRegression)
+    predictor.fit(x.iloc[train], y[train])
+
+    # out-of-fold predictions of the linear base model on the shared folds
+    kfold = tm.models.stacking.KFold(3, shuffle=True, random_state=0)
+    area = x.iloc[train][["floor_area_sqm"]]
+    expected = np.empty(len(train))
+    for train_index, test_index in kfold.split(area):
+        model = LinearRegression().fit(area.iloc[train_index], y[train_index])
+        expected[test_index] = model.predict(area.iloc[test_index])
+    np.testing.assert_allclose(predictor.oof_predictions_[:, 0], expected)
+
+    # the meta-model is fitted on them and base models are refitted on all rows
+    meta = LinearRegression().fit(predictor.oof_predictions_, y[train])
+    np.testing.assert_allclose(predictor.meta_predictor.model.coef_, meta.coef_)
+    np.testing.assert_allclose(
+        predictor.base_predictors[0].model.coef_,
+        LinearRegression().fit(area, y[train]).coef_,
+    )
+
+    # each base model sees one part of the target, the blend adds them up
+    base = predictor.predict_base(x.iloc[test])
+    ypred = predictor.predict(x.iloc[test])
+    base_mse = np.mean((base - y[test, None]) ** 2, axis=0)
+    assert np.mean((ypred - y[test]) ** 2) < 0.5 * base_mse.min()
+
+    predictor.save(tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == ["stackingpredictor.pkl"]
+    loaded = tm.models.StackingPredictor.load(tmp_path)
+    np.testing.assert_allclose(loaded.predict(x.iloc[test]), ypred)
+
+
+def test_stacking_limits_threads(categorical_data, stacking_params, monkeypatch):
+    """Test concurrent fits and predictions share the cores between them."""
+    seen = []
+    threadpool_limits = tm.models.stacking.threadpool_limits
+
+    def record_limits(limits=None, user_api=None):
+        seen.append(limits)
+        return threadpool_limits(limits=limits, user_api=user_api)
+
+    monkeypatch.setattr(tm.models.stacking.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(tm.models.stacking, "threadpool_limits", record_limits)
+    x, y = categorical_data
+    predictor = tm.models.StackingPredictor(stacking_params)
+    predictor.fit(x, y)
+    # 8 tasks on 2 workers, then 2 predictions on 2 workers
+    assert seen == [4] * 8
+
+    seen.clear()
+    predictor.predict(x)
+    assert seen == [4, 4]
+
+
+def test_stacking_predictor_errors(categorical_data, stacking_params):
+    """Test stacking requires base models and dataframes for base model columns."""
+    with pytest.raises(ValueError):
+        tm.models.StackingPredictor(omegaconf.DictConfig({"n_splits": 3}))
+
+    x, y = categorical_data
+    predictor = tm.models.StackingPredictor(stacking_params)
+    with pytest.raises(TypeError):
+        predictor.fit(x.to_numpy(), y)
@@ -0,0 +1,164 @@
+"""Test module for the pipeline DAG runner."""
+
+import os
+import threading
+
+import omegaconf
+import pytest
+
+import train_model as tm
+
+
+def concat(args, inputs, outputs, suffix=""):
+    """Toy stage writing its inputs' content joined with a suffix."""
+    text = "".join(p.read_text() for p in inputs) + suffix
+    for p in outputs:
+        p.write_text(text)
+
+
+def fail(args, inputs, outputs):
+    """Toy stage failing."""
+    raise RuntimeError("stage failed")
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Diamond pipeline a -> (b, c) -> d."""
+    stages = [
+        tm.pipeline.Stage(
+            "a", concat, outputs=[tmp_path / "a"], kwargs={"suffix": "a"}
+        ),
+        tm.pipeline.Stage(
+            "b", concat, [tmp_path / "a"], [tmp_path / "b"], kwargs={"suffix": "b"}
+        ),
+        tm.pipeline.Stage(
+            "c", concat, [tmp_path / "a"], [tmp_path / "c"], kwargs={"suffix": "c"}
+        ),
+        tm.pipeline.Stage(
+            "d", concat, [tmp_path / "b", tmp_path / "c"], [tmp_path / "d"]
+        ),
+    ]
+    return tm.pipeline.Pipeline(stages)
+
+
+def test_dependencies_and_order(pipeline):
+    """Test dependencies are resolved from declared files."""
+    assert pipeline.upstream == {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+    assert pipeline.order == ["a", "b", "c", "d"]
+
+
+def test_run_only_stale(pipeline, tmp_path):
+    """Test stages run once and re-run only downstream of a changed file."""
+    stages = pipeline.run(omegaconf.DictConfig({}), n_jobs=2)
+    assert stages[0] == "a" and stages[-1] == "d" and sorted(stages[1:3]) == ["b", "c"]
+    assert (tmp_path / "d").read_text() == "abac"
+    assert pipeline.run(omegaconf.DictConfig({})) == []
+
+    # make b's output older than its input
+    os.utime(tmp_path / "b", (0, 0))
+    assert list(pipeline.plan()) == ["b", "d"]
+    assert pipeline.plan(force=["c"]) == {
+        "b": "inputs newer than outputs",
+        "c": "forced",
+        "d": "upstream b runs",
+    }
+
+
+def test_config_change_reruns(tmp_path):
+    """Test a changed kwarg or config param re-runs the stage and downstream."""
+    stages = [
+        tm.pipeline.Stage(
+            "a", concat, outputs=[tmp_path / "a"], kwargs={"suffix": "a"}, params=["x"]
+        ),
+        tm.pipeline.Stage("b", concat, [tmp_path / "a"], [tmp_path / "b"]),
+    ]
+    args = omegaconf.OmegaConf.create({"x": {"n": 1}, "y": 1})
+    assert tm.pipeline.Pipeline(stages).run(args) == ["a", "b"]
+    assert tm.pipeline.Pipeline(stages).run(args) == []
+
+    args.y = 2
+    assert tm.pipeline.Pipeline(stages).plan(args=args) == {}
+    args.x.n = 2
+    assert tm.pipeline.Pipeline(stages).plan(args=args) == {
+        "a": "config changed",
+        "b": "upstream a runs",
+    }
+    assert tm.pipeline.Pipeline(stages).run(args) == ["a", "b"]
+
+    stages[0].kwargs["suffix"] = "z"
+    assert tm.pipeline.Pipeline(stages).run(args) == ["a", "b"]
+    assert (tmp_path / "b").read_text() == "z"
+
+
+def test_dry_run(pipeline, tmp_path):
+    """Test dry run plans all stages without running any."""
+    assert pipeline.run(omegaconf.DictConfig({}), dry_run=True) == ["a", "b", "c", "d"]
+    assert not any(tmp_path.iterdir())
+
+
+def test_independent_stages_run_in_parallel(tmp_path):
+    """Test independent stages run concurrently."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_other(args, inputs, outputs):
+        barrier.wait()
+        outputs[0].write_text("")
+
+    pipeline = tm.pipeline.Pipeline(
+        [
+            tm.pipeline.Stage("x", wait_for_other, outputs=[tmp_path / "x"]),
+            tm.pipeline.Stage("y", wait_for_other, outputs=[tmp_path / "y"]),
+        ]
+    )
+    assert sorted(pipeline.run(omegaconf.DictConfig({}), n_jobs=2)) == ["x", "y"]
+
+
+def test_failed_stage_stops_downstream(tmp_path):
+    """Test a failed stage raises and its downstream stages do not run."""
+    pipeline = tm.pipeline.Pipeline(
+        [
+            tm.pipeline.Stage("a", fail, outputs=[tmp_path / "a"]),
+            tm.pipeline.Stage("b", concat, [tmp_path / "a"], [tmp_path / "b"]),
+        ]
+    )
+    with pytest.raises(RuntimeError):
+        pipeline.run(omegaconf.DictConfig({}))
+    assert not (tmp_path / "b").exists()
+
+
+def test_invalid_pipelines(tmp_path):
+    """Test duplicated outputs and cycles are rejected."""
+    with pytest.raises(ValueError):
+        tm.pipeline.Pipeline(
+            [
+                tm.pipeline.Stage("a", concat, outputs=[tmp_path / "a"]),
+                tm.pipeline.Stage("b", concat, outputs=[tmp_path / "a"]),
+            ]
+        )
+
+    with pytest.raises(ValueError):
+        tm.pipeline.Pipeline(
+            [
+                tm.pipeline.Stage("a", concat, [tmp_path / "b"], [tmp_path / "a"]),
+                tm.pipeline.Stage("b", concat, [tmp_path / "a"], [tmp_path / "b"]),
+            ]
+        )
+
+
+def test_from_config(tmp_path):
+    """Test stages are built from config with resolved kwargs."""
+    config = omegaconf.OmegaConf.create(
+        {
+            "suffix": "z",
+            "stages": {
+                "a": {
+                    "func": "train_model.tests.test_pipeline.concat",
+                    "outputs": [str(tmp_path / "a")],
+                    "kwargs": {"suffix": "${suffix}"},
+                }
+            },
+        }
+    )
+    pipeline = tm.pipeline.Pipeline.from_config(config.stages)
+    pipeline.run(config)
+    assert (tmp_path / "a").read_text() == "z"
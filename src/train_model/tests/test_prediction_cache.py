@@ -0,0 +1,95 @@
+"""Test module for the prediction cache."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+
+@pytest.fixture
+def cache(fitted):
+    """Cache fixture in front of the fitted artefacts."""
+    return tm.prediction_cache.CachedPredictor(*fitted, version="v0001", max_entries=4)
+
+
+def test_predict_matches_uncached(cache, fitted, raw_data):
+    """Test cached predictions match the uncached pipeline."""
+    expected = tm.registry.ModelBundle("v0001", *fitted, {}).predict(raw_data.copy())
+    np.testing.assert_allclose(cache.predict(raw_data.iloc[:3]), expected[:3])
+    np.testing.assert_allclose(cache.predict(raw_data.iloc[:3]), expected[:3])
+
+    assert cache.stats()["misses"] == 3
+    assert cache.stats()["hits"] == 3
+
+
+def test_only_misses_are_computed(cache, raw_data, monkeypatch):
+    """Test a batch computes only new and unique records."""
+    cache.predict(raw_data.iloc[:2])
+    batch = pd.concat([raw_data.iloc[:3], raw_data.iloc[[2]]], ignore_index=True)
+    n_computed = []
+    predict = cache._bundle.predict
+    monkeypatch.setattr(
+        cache._bundle,
+        "predict",
+        lambda data: n_computed.append(len(data)) or predict(data),
+    )
+
+    ypred = cache.predict(batch)
+    assert n_computed == [1]
+    assert ypred[2] == ypred[3]
+
+
+def test_normalised_keys(cache, raw_data):
+    """Test records differing only in spaces or float noise share a key."""
+    noisy = raw_data.copy()
+    noisy["town"] = " " + noisy["town"]
+    noisy["floor_area_sqm"] += 1e-6
+    np.testing.assert_array_equal(
+        cache.feature_keys(cache.normalise(raw_data)),
+        cache.feature_keys(cache.normalise(noisy)),
+    )
+
+    lower = raw_data.assign(town=raw_data["town"].str.lower())
+    assert not np.isin(
+        cache.feature_keys(cache.normalise(lower)),
+        cache.feature_keys(cache.normalise(raw_data)),
+    ).any()
+
+
+@pytest.mark.parametrize("noisy_first", [True, False])
+def test_prediction_independent_of_cache_order(fitted, raw_data, noisy_first):
+    """Test both spellings of a record get the same prediction in either order."""
+    clean = raw_data.iloc[:1].copy()
+    noisy = clean.assign(town=" " + clean["town"], floor_area_sqm=60.004)
+    expected = tm.registry.ModelBundle("v0001", *fitted, {}).predict(clean.copy())
+
+    cache = tm.prediction_cache.CachedPredictor(*fitted, version="v0001")
+    first, second = (noisy, clean) if noisy_first else (clean, noisy)
+    np.testing.assert_allclose(cache.predict(first), expected)
+    np.testing.assert_allclose(cache.predict(second), expected)
+    assert cache.stats()["hits"] == 1
+
+
+def test_lru_eviction_and_ttl(fitted, raw_data, monkeypatch):
+    """Test least recently used entries are evicted and entries expire."""
+    cache = tm.prediction_cache.CachedPredictor(*fitted, max_entries=4, ttl=10)
+    cache.predict(raw_data)
+    assert len(cache) == 4
+    assert cache.stats()["evictions"] == 2
+
+    now = tm.prediction_cache.time.monotonic()
+    monkeypatch.setattr(tm.prediction_cache.time, "monotonic", lambda: now + 11)
+    cache.predict(raw_data.iloc[-1:])
+    assert cache.stats()["hits"] == 0
+
+
+def test_version_change_invalidates(cache, fitted, raw_data):
+    """Test a new model version clears the cache, the same version keeps it."""
+    cache.predict(raw_data)
+    cache.set_model(*fitted, version="v0001")
+    assert len(cache) == 4
+
+    cache.set_model(*fitted, version="v0002")
+    assert len(cache) == 0
+    assert cache.version == "v0002"
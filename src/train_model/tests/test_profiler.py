@@ -0,0 +1,99 @@
+"""Test module for streaming sketches and profiler."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+
+@pytest.fixture
+def data():
+    """Dataframe fixture with numeric, categorical, null and duplicated values."""
+    rng = np.random.default_rng(0)
+    n_rows = 20_000
+    df = pd.DataFrame(
+        {
+            "resale_price": rng.normal(500_000, 100_000, n_rows).round(-2),
+            "town": rng.choice(["A", "B", "C", "D"], n_rows, p=[0.5, 0.3, 0.15, 0.05]),
+            "floor_area_sqm": rng.integers(30, 150, n_rows).astype(float),
+        }
+    )
+    df.loc[:99, "floor_area_sqm"] = np.nan
+    df = pd.concat([df, df.iloc[:50]], ignore_index=True)
+    return df
+
+
+def iter_chunks(data, chunk_size=3_000):
+    """Yield consecutive chunks of data."""
+    return tm.feature_matrix.iter_dataframe_chunks(data, chunk_size)
+
+
+def test_hyperloglog_estimate():
+    """Test distinct estimate is within a few percent and merges."""
+    left = tm.utils.sketches.HyperLogLog()
+    right = tm.utils.sketches.HyperLogLog()
+    left.update(pd.Series(np.arange(0, 60_000)))
+    right.update(pd.Series(np.arange(40_000, 100_000)))
+    left.merge(right)
+
+    assert left.estimate() == pytest.approx(100_000, rel=0.03)
+
+
+def test_tdigest_quantiles():
+    """Test t-digest quantiles are close to exact quantiles after merging."""
+    values = np.random.default_rng(0).exponential(size=100_000)
+    digest = tm.utils.sketches.TDigest()
+    other = tm.utils.sketches.TDigest()
+    digest.update(values[:30_000])
+    other.update(values[30_000:])
+    digest.merge(other)
+
+    q = np.array([0.01, 0.25, 0.5, 0.75, 0.99])
+    np.testing.assert_allclose(digest.quantile(q), np.quantile(values, q), rtol=0.02)
+    assert digest.count == 100_000
+    assert digest.max == values.max()
+
+
+def test_heavy_hitters_top():
+    """Test heavy hitters keep the most frequent values in order."""
+    values = pd.Series(["A"] * 50 + ["B"] * 30 + list("CDEFGHIJ"))
+    heavy_hitters = tm.utils.sketches.HeavyHitters(capacity=3)
+    heavy_hitters.update(values)
+
+    assert heavy_hitters.top(2).index.tolist() == ["A", "B"]
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_profile_chunks_matches_pandas(data, n_jobs):
+    """Test single pass profile matches pandas statistics."""
+    profile = tm.utils.profiler.profile_chunks(iter_chunks(data), n_jobs=n_jobs)
+    summary = profile.describe()
+
+    assert profile.shape == data.shape
+    assert profile.null_counts.to_dict() == data.isna().sum().to_dict()
+    assert profile.n_duplicated == pytest.approx(data.duplicated().sum(), abs=30)
+    assert summary.loc["resale_price", "mean"] == pytest.approx(
+        data["resale_price"].mean()
+    )
+    assert summary.loc["resale_price", "std"] == pytest.approx(
+        data["resale_price"].std()
+    )
+    assert summary.loc["resale_price", "50%"] == pytest.approx(
+        data["resale_price"].median(), rel=0.01
+    )
+    assert summary.loc["floor_area_sqm", "distinct"] == pytest.approx(120, abs=2)
+    assert profile.columns["town"].top(2).index.tolist() == ["A", "B"]
+
+
+def test_profile_chunks_exact(data):
+    """Test exact mode gives exact distinct, top counts and duplicates."""
+    profile = tm.utils.profiler.profile_chunks(iter_chunks(data), exact=True)
+
+    assert profile.n_duplicated == data.duplicated().sum()
+    assert profile.columns["resale_price"].n_distinct == data["resale_price"].nunique()
+    pd.testing.assert_series_equal(
+        profile.columns["town"].top(4),
+        data["town"].value_counts().head(4),
+        check_names=False,
+    )
@@ -0,0 +1,87 @@
+"""Test module for the model registry."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import train_model as tm
+
+
+def test_register_and_load(fitted, raw_data, tmp_path):
+    """Test a registered version loads and predicts like the fitted artefacts."""
+    preprocessor, predictor = fitted
+    registry = tm.registry.ModelRegistry(tmp_path / "registry")
+    version = registry.register(preprocessor, predictor, metadata={"rmse": 1.0})
+
+    bundle = registry.load()
+    assert version == "v0001"
+    assert registry.current_version() == version
+    assert bundle.metadata["rmse"] == 1.0
+    assert bundle.metadata["predictor"] == "SKLearnPredictor"
+
+    expected = predictor.predict(
+        preprocessor.transform_data(
+            preprocessor.feature_engineer(
+                tm.data_cleaner.HdbDataCleaner().clean_data(raw_data.copy())
+            )
+        )
+    )
+    np.testing.assert_allclose(bundle.predict(raw_data.copy()), expected)
+
+
+def test_versions_and_activate(fitted, tmp_path):
+    """Test versions are kept and the current version can be rolled back."""
+    registry = tm.registry.ModelRegistry(tmp_path / "registry")
+    registry.register(*fitted)
+    registry.register(*fitted, activate=False)
+    assert registry.versions() == ["v0001", "v0002"]
+    assert registry.current_version() == "v0001"
+
+    registry.activate("v0002")
+    assert registry.load().version == "v0002"
+
+    with pytest.raises(KeyError):
+        registry.activate("v0003")
+
+
+def test_load_empty_registry(tmp_path):
+    """Test loading an empty registry raises."""
+    with pytest.raises(FileNotFoundError):
+        tm.registry.ModelRegistry(tmp_path).load()
+
+
+def test_concurrent_register(fitted, tmp_path):
+    """Test concurrent registrations claim distinct versions kept in order."""
+    registry = tm.registry.ModelRegistry(tmp_path / "registry")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        versions = list(executor.map(lambda _: registry.register(*fitted), range(8)))
+
+    assert sorted(versions) == [f"v{i:04d}" for i in range(1, 9)]
+    assert registry.versions() == sorted(versions)
+    assert registry.current_version() == "v0008"
+
+
+def test_older_register_finishing_last(fitted, tmp_path, monkeypatch):
+    """Test an older version finishing last neither reorders nor becomes current."""
+    registry = tm.registry.ModelRegistry(tmp_path / "registry")
+    claimed, release = threading.Event(), threading.Event()
+    write_bundle = registry._write_bundle
+
+    def slow_first(tmp_path, version, *args):
+        if version == "v0001":
+            claimed.set()
+            release.wait(timeout=30)
+        write_bundle(tmp_path, version, *args)
+
+    monkeypatch.setattr(registry, "_write_bundle", slow_first)
+    thread = threading.Thread(target=registry.register, args=fitted)
+    thread.start()
+    claimed.wait(timeout=30)
+    assert registry.register(*fitted) == "v0002"
+    release.set()
+    thread.join()
+
+    assert registry.versions() == ["v0001", "v0002"]
+    assert registry.current_version() == "v0002"
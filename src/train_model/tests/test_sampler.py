@@ -0,0 +1,113 @@
+"""Test module for stratified sampling of chunked data."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+
+@pytest.fixture
+def data():
+    """Data with strata of very different sizes."""
+    # not the sampler seeds, its keys would be the uniforms drawing towns
+    rng = np.random.default_rng(42)
+    n_rows = 20_000
+    return pd.DataFrame(
+        {
+            "town": rng.choice(["A", "B", "C", "D"], n_rows, p=[0.6, 0.3, 0.09, 0.01]),
+            "flat_type": rng.choice(["3 ROOM", "4 ROOM"], n_rows),
+            "year": rng.choice([2019, 2020], n_rows),
+            "value": np.arange(n_rows),
+        }
+    )
+
+
+def _chunks(data, chunk_size):
+    """Data split into chunks as read_csv with chunksize."""
+    return (data.iloc[i : i + chunk_size] for i in range(0, len(data), chunk_size))
+
+
+def test_allocate():
+    """Test allocations are proportional and sum to the sample size."""
+    counts = pd.Series([50, 30, 20, 1], index=list("abcd"))
+    allocation = tm.sampler.allocate(counts, 10)
+
+    assert allocation.sum() == 10
+    assert list(allocation) == [5, 3, 2, 0]
+    assert tm.sampler.allocate(counts, 1_000).sum() == counts.sum()
+
+
+def test_cap_allocation():
+    """Test allocations beyond the available rows move proportionally."""
+    counts = pd.Series([50, 30, 20], index=list("abc"))
+    allocation = tm.sampler.allocate(counts, 10)
+    available = pd.Series([2, 10, 10], index=list("abc"))
+
+    capped = tm.sampler.cap_allocation(allocation, counts, available)
+    assert list(capped) == [2, 5, 3]
+    assert list(tm.sampler.cap_allocation(allocation, counts, counts)) == [5, 3, 2]
+
+
+@pytest.mark.parametrize("strata", [["town"], ["town", "year"]])
+def test_sample_missing_strata_values(data, strata):
+    """Test rows with missing strata values are sampled as their own strata."""
+    data = data.astype({"town": object, "year": "Int64"})
+    data.loc[data.index % 5 == 0, "town"] = None
+    data.loc[data.index % 7 == 0, "year"] = pd.NA
+    sample = tm.sampler.sample_chunks(_chunks(data, 1_000), 1_000, strata=strata)
+
+    expected = tm.sampler.allocate(data.groupby(strata, dropna=False).size(), 1_000)
+    pd.testing.assert_series_equal(
+        sample.groupby(strata, dropna=False).size(), expected, check_names=False
+    )
+    assert sample["town"].isna().sum() == 200
+
+
+def test_sample_size_and_strata(data):
+    """Test the sample has the exact size and proportional strata."""
+    strata = ["town", "flat_type", "year"]
+    sample = tm.sampler.sample_chunks(_chunks(data, 1_000), 1_000, strata=strata)
+
+    assert len(sample) == 1_000
+    assert sample["value"].is_unique
+    assert sample.index.is_monotonic_increasing
+
+    expected = tm.sampler.allocate(data.groupby(strata).size(), 1_000)
+    pd.testing.assert_series_equal(
+        sample.groupby(strata).size(), expected, check_names=False
+    )
+
+
+def test_sample_reproducible(data):
+    """Test the sample depends on the seed, not on the chunk size."""
+    samples = [
+        tm.sampler.sample_chunks(_chunks(data, chunk_size), 500, seed=1)
+        for chunk_size in [300, 5_000, len(data)]
+    ]
+    for sample in samples[1:]:
+        pd.testing.assert_frame_equal(sample, samples[0])
+
+    other = tm.sampler.sample_chunks(_chunks(data, 300), 500, seed=2)
+    assert not other["value"].equals(samples[0]["value"])
+
+
+def test_sample_uniform_within_stratum(data):
+    """Test rows of a stratum are sampled uniformly over the stream."""
+    sample = tm.sampler.sample_chunks(_chunks(data, 1_000), 4_000, strata=["town"])
+    # early and late rows are equally likely, the mean position is the middle
+    assert abs(sample["value"].mean() / len(data) - 0.5) < 0.02
+
+
+def test_sample_small_data(data):
+    """Test a sample larger than the data returns all rows."""
+    small = data.head(50)
+    sample = tm.sampler.sample_chunks(_chunks(small, 20), 100)
+    pd.testing.assert_frame_equal(sample, small)
+
+
+def test_sample_missing_strata(data):
+    """Test strata columns not in data raise a KeyError."""
+    sampler = tm.sampler.StratifiedSampler(10, strata=["town", "block"])
+    with pytest.raises(KeyError):
+        sampler.update(data)
@@ -0,0 +1,233 @@
+"""Test module for model serving."""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import train_model as tm
+
+
+@pytest.fixture
+def registry(fitted, tmp_path):
+    """Registry fixture with a single registered version."""
+    registry = tm.registry.ModelRegistry(tmp_path / "registry")
+    registry.register(*fitted)
+    return registry
+
+
+@pytest.fixture
+def records():
+    """Request payload of records to predict."""
+    record = {
+        "month": "2017-01",
+        "town": "A",
+        "flat_type": "3 ROOM",
+        "block": "1",
+        "street_name": "STREET",
+        "storey_range": "10 TO 12",
+        "floor_area_sqm": 70.0,
+        "flat_model": "Improved",
+        "lease_commence_date": 1990,
+        "remaining_lease": 60,
+    }
+    return [record, {**record, "storey_range": "01 TO 03"}]
+
+
+def test_refresh_swaps_new_version(fitted, registry, raw_data):
+    """Test a newly activated version is pre-warmed and swapped in."""
+    service = tm.serving.ModelService(registry, warmup_data=raw_data)
+    assert service.version == "v0001"
+    assert not service.refresh()
+
+    registry.register(*fitted)
+    assert service.refresh()
+    assert service.version == "v0002"
+
+    registry.activate("v0001")
+    assert service.refresh()
+    assert service.version == "v0001"
+
+
+def test_read_warmup_data(raw_data, tmp_path):
+    """Test warmup records are read from the head of a raw data csv."""
+    raw_data.to_csv(tmp_path / "raw.csv", index=False)
+
+    warmup_data = tm.serving.read_warmup_data(str(tmp_path / "raw.csv"), n_rows=2)
+    pd.testing.assert_frame_equal(warmup_data, raw_data.head(2))
+    assert tm.serving.read_warmup_data(str(tmp_path / "missing.csv")) is None
+    assert tm.serving.read_warmup_data(None) is None
+
+
+def test_predict_api(registry, records):
+    """Test the api predicts records with the current version."""
+    service = tm.serving.ModelService(registry, poll_interval=0.01)
+    with TestClient(tm.serving.create_app(service)) as client:
+        assert client.get("/health").json() == {"status": "ok", "version": "v0001"}
+
+        response = client.post("/predict", json=records)
+        assert response.status_code == 200
+        body = response.json()
+
+    expected = registry.load().predict(pd.DataFrame(records))
+    assert body["version"] == "v0001"
+    assert body["predictions"] == pytest.approx(expected.tolist())
+
+
+def test_cached_service(fitted, registry, raw_data):
+    """Test the service cache serves repeats and is cleared on a new version."""
+    service = tm.serving.ModelService(registry, cache_size=100)
+    version, first = service.predict(raw_data.copy())
+    _, second = service.predict(raw_data.copy())
+    assert version == "v0001"
+    assert (first == second).all()
+    assert service.cache.stats()["hits"] == len(raw_data)
+
+    registry.register(*fitted)
+    service.refresh()
+    assert len(service.cache) == 0
+    assert service.predict(raw_data.copy())[0] == "v0002"
+
+
+def _arrow_body(table):
+    """Arrow IPC stream body of a table."""
+    import pyarrow as pa
+
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _npz_body(frame):
+    """Npz body of a frame's columns."""
+    sink = io.BytesIO()
+    np.savez(sink, **{col: np.asarray(frame[col].tolist()) for col in frame})
+    return sink.getvalue()
+
+
+@pytest.mark.parametrize("content_type", ["arrow", "npz"])
+def test_predict_batch_api(registry, records, content_type):
+    """Test binary batches predict like the json endpoint."""
+    frame = pd.DataFrame(records)
+    if content_type == "arrow":
+        pa = pytest.importorskip("pyarrow")
+        media_type = tm.serving.ARROW_STREAM
+        sink = io.BytesIO(
+            _arrow_body(pa.Table.from_pandas(frame, preserve_index=False))
+        )
+    else:
+        media_type = tm.serving.NPZ
+        sink = io.BytesIO(_npz_body(frame))
+
+    service = tm.serving.ModelService(registry)
+    with TestClient(tm.serving.create_app(service)) as client:
+        response = client.post(
+            "/predict/batch",
+            content=sink.getvalue(),
+            headers={"content-type": media_type},
+        )
+        expected = client.post("/predict", json=records).json()["predictions"]
+
+    assert response.status_code == 200
+    assert response.headers["x-model-version"] == "v0001"
+    if content_type == "arrow":
+        ypred = pa.ipc.open_stream(response.content).read_all()["prediction"]
+        ypred = ypred.to_numpy()
+    else:
+        ypred = np.load(io.BytesIO(response.content))["prediction"]
+    np.testing.assert_allclose(ypred, expected)
+
+
+def test_predict_batch_unsupported(registry):
+    """Test unsupported batch content types are rejected."""
+    service = tm.serving.ModelService(registry)
+    with TestClient(tm.serving.create_app(service)) as client:
+        response = client.post(
+            "/predict/batch", content=b"{}", headers={"content-type": "text/csv"}
+        )
+    assert response.status_code == 415
+
+
+def test_predict_batch_large_string(registry, records):
+    """Test large_string arrow columns predict like string columns."""
+    pa = pytest.importorskip("pyarrow")
+    table = pa.Table.from_pandas(pd.DataFrame(records), preserve_index=False)
+    schema = pa.schema(
+        [
+            field.with_type(pa.large_string())
+            if pa.types.is_string(field.type)
+            else field
+            for field in table.schema
+        ]
+    )
+
+    service = tm.serving.ModelService(registry)
+    with TestClient(tm.serving.create_app(service)) as client:
+        response = client.post(
+            "/predict/batch",
+            content=_arrow_body(table.cast(schema)),
+            headers={"content-type": tm.serving.ARROW_STREAM},
+        )
+        expected = client.post("/predict", json=records).json()["predictions"]
+
+    assert response.status_code == 200
+    ypred = pa.ipc.open_stream(response.content).read_all()["prediction"]
+    np.testing.assert_allclose(ypred.to_numpy(), expected)
+
+
+@pytest.mark.parametrize("content_type", ["arrow", "npz"])
+def test_predict_batch_invalid(registry, records, content_type):
+    """Test malformed bodies are a 400 and undecodable values a 422."""
+    frame = pd.DataFrame(records).assign(floor_area_sqm="abc")
+    if content_type == "arrow":
+        pa = pytest.importorskip("pyarrow")
+        media_type = tm.serving.ARROW_STREAM
+        body = _arrow_body(pa.Table.from_pandas(frame, preserve_index=False))
+    else:
+        media_type = tm.serving.NPZ
+        body = _npz_body(frame)
+
+    service = tm.serving.ModelService(registry)
+    with TestClient(tm.serving.create_app(service)) as client:
+        headers = {"content-type": media_type}
+        malformed = client.post("/predict/batch", content=b"garbage", headers=headers)
+        invalid = client.post("/predict/batch", content=body, headers=headers)
+
+    assert malformed.status_code == 400
+    assert invalid.status_code == 422
+
+
+def test_explain_api(registry, records):
+    """Test explanations are per input column and sum to the predictions."""
+    service = tm.serving.ModelService(registry)
+    with TestClient(tm.serving.create_app(service)) as client:
+        body = client.post("/explain", json=records).json()
+
+    contributions = pd.DataFrame(body["contributions"])
+    assert set(contributions.columns) == {
+        "floor_area_sqm",
+        "storey_area_ratio",
+        "lease_less_than_50_yrs",
+        "bias",
+    }
+    np.testing.assert_allclose(contributions.sum(axis=1), body["predictions"])
+
+
+def test_drift_api(registry, records):
+    """Test scored records are monitored for drift against the fit data."""
+    service = tm.serving.ModelService(registry, poll_interval=60, drift_interval=60)
+    with TestClient(tm.serving.create_app(service)) as client:
+        client.post("/predict", json=records)
+        # stopping waits for a batch the thread is counting, score drains the rest
+        service.drift.stop()
+        service.drift.score()
+        body = client.get("/drift").json()
+
+    assert body["version"] == "v0001"
+    assert body["n_failed"] == 0
+    scores = {s["column"]: s for s in body["scores"]}
+    assert scores["floor_area_sqm"]["n_rows"] == len(records)
+    assert service.drift._thread is None
@@ -0,0 +1,158 @@
+"""Test module for the training pipeline stages."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import omegaconf
+import pandas as pd
+import pytest
+
+import train_model as tm
+
+CONFIG_PATH = Path(__file__).parents[3] / "conf" / "process_data.yaml"
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Shipped config pointed at temporary data and model folders."""
+    config = omegaconf.OmegaConf.load(CONFIG_PATH)
+    config.data_folder = str(tmp_path / "data")
+    config.model_folder = str(tmp_path / "model")
+    config.validate.fail_on_error = False
+    return config
+
+
+@pytest.fixture
+def raw_file(config):
+    """Raw data saved as the retrieve stage would."""
+    rng = np.random.default_rng(0)
+    n_rows = 200
+    storey_from = rng.integers(0, 10, n_rows) * 3 + 1
+    floor_area = rng.uniform(40, 150, n_rows)
+    df = pd.DataFrame(
+        {
+            "record_id": np.arange(n_rows),
+            "month": "2020-01",
+            "town": rng.choice(["A", "B", "C"], n_rows),
+            "flat_type": "4 ROOM",
+            "block": "1",
+            "street_name": "STREET",
+            "flat_model": "Improved",
+            "lease_commence_date": 1990,
+            "storey_range": [f"{s:02d} TO {s + 2:02d}" for s in storey_from],
+            "floor_area_sqm": floor_area,
+            "remaining_lease": rng.integers(40, 99, n_rows),
+            "resale_price": floor_area * 5000 + rng.normal(0, 1000, n_rows),
+        }
+    )
+    raw_file = Path(config.data_folder, config.raw_file)
+    raw_file.parent.mkdir(parents=True)
+    df.to_csv(raw_file, index=False)
+    return raw_file
+
+
+def test_pipeline_from_config(config, raw_file):
+    """Test the configured pipeline runs from raw data to a model report."""
+    pipeline = tm.pipeline.Pipeline.from_config(config.pipeline.stages)
+    stages = pipeline.run(config, n_jobs=2)
+
+    assert "retrieve" not in stages
+    assert set(stages) == set(pipeline.order) - {"retrieve"}
+
+    report = pd.read_csv(Path(config.model_folder, "report.csv"), index_col="model")
+    assert list(report.index) == ["linear", "ridge"]
+    assert (report["r2_score"] > 0.9).all()
+
+    # every model is a bundle batch scoring reads, the best one is registered
+    cleaned = Path(config.data_folder, config.cleaned_file)
+    predictions = Path(config.data_folder, "predictions.csv")
+    tm.batch_scoring.score_file(config, cleaned, predictions, chunk_size=50)
+    assert len(pd.read_csv(predictions)) == 200
+
+    registered = json.loads(Path(config.model_folder, "registered.json").read_text())
+    registry = tm.registry.ModelRegistry(config.serve.registry_folder)
+    assert registry.current_version() == registered["version"] == "v0001"
+    assert (
+        registry.load().metadata["name"] == report["root_mean_squared_error"].idxmin()
+    )
+
+    assert pipeline.run(config) == []
+
+    # config edits re-run the stages reading them and their downstream stages
+    config.sample.n_rows = 150
+    plan = tm.pipeline.Pipeline.from_config(config.pipeline.stages).plan(args=config)
+    assert plan["sample"] == "config changed"
+    assert "report" in plan and "validate" not in plan
+
+    config.sample.n_rows = None
+    config.model.params = {"fit_intercept": False}
+    plan = tm.pipeline.Pipeline.from_config(config.pipeline.stages).plan(args=config)
+    assert plan == {
+        "train_linear": "config changed",
+        "evaluate_linear": "upstream train_linear runs",
+        "report": "upstream evaluate_linear runs",
+        "register": "upstream report runs",
+    }
+
+
+def test_failed_validation_gates_training(config, raw_file):
+    """Test a failed validation stops sampling and training, also on re-runs."""
+    config.validate.fail_on_error = True
+    config.validate.ranges.floor_area_sqm = [20, 50]
+    pipeline = tm.pipeline.Pipeline.from_config(config.pipeline.stages)
+    assert "validate" in pipeline.upstream["sample"]
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="failed validation"):
+            pipeline.run(config, n_jobs=4)
+
+    assert Path(config.data_folder, "validation_report.failed.csv").is_file()
+    assert not Path(config.data_folder, "validation_report.csv").exists()
+    assert not Path(config.data_folder, "sample.csv").exists()
+
+
+def test_sample_stage(config, raw_file):
+    """Test the sample stage writes a stratified sample of the configured size."""
+    cleaned = Path(config.data_folder, config.cleaned_file)
+    sample = Path(config.data_folder, "sample.csv")
+    tm.stages.clean(config, [raw_file], [cleaned])
+
+    tm.stages.sample(config, [cleaned], [sample])
+    pd.testing.assert_frame_equal(pd.read_csv(sample), pd.read_csv(cleaned))
+
+    config.sample.n_rows = 60
+    config.sample.chunk_size = 50
+    tm.stages.sample(config, [cleaned], [sample])
+    data = pd.read_csv(sample)
+    assert len(data) == 60
+    counts = pd.read_csv(cleaned)["town"].value_counts()
+    assert (data["town"].value_counts() - counts * 60 / counts.sum()).abs().max() < 1
+
+
+def test_confirm_stage(config, raw_file):
+    """Test confirm refits the best model of a sampled pipeline on full data."""
+    config.sample.n_rows = 100
+    pipeline = tm.pipeline.Pipeline.from_config(config.pipeline.stages)
+    pipeline.run(config)
+
+    metrics = Path(config.model_folder, "confirmed", "metrics.json")
+    tm.stages.confirm(
+        config,
+        [
+            Path(config.data_folder, config.cleaned_file),
+            Path(config.model_folder, "report.csv"),
+        ],
+        [metrics],
+        models={
+            "linear": config.model,
+            "ridge": config.pipeline.stages.train_ridge.kwargs.model,
+        },
+        metrics=list(config.pipeline.metrics),
+    )
+
+    report = pd.read_csv(Path(config.model_folder, "report.csv"), index_col="model")
+    result = json.loads(metrics.read_text())
+    assert result["model"] == report["root_mean_squared_error"].idxmin()
+    assert result["r2_score"] > 0.9
+    assert len(pd.read_csv(metrics.parent / "train.csv")) == 160
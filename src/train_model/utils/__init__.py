@@ -1,8 +1,30 @@
-"""Init file for utils module."""
+"""Init file for utils module.
 
-from . import eda, utils
+Submodules are imported on first access, eda pulls in matplotlib.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import eda, eda_report, profiler, sketches, utils
 
 __all__ = [
     "eda",
+    "eda_report",
+    "profiler",
+    "sketches",
     "utils",
 ]
+
+
+def __getattr__(name: str):
+    """Import a submodule on first access."""
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    """Submodules of the package."""
+    return __all__
@@ -1,26 +1,33 @@
 """Modules for Exploratory data analysis plotting and printing."""
 
+from collections.abc import Iterable
+
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from .profiler import ColumnProfile, DataProfile
+
 
 def describe_general_data(
     data: pd.DataFrame,
     missing_value: int = 5,
+    key: str | None = None,
 ) -> None:
     """
     Prints some generic information about the dataframe.
 
     Shape of Dataframe
-    Sum of Duplicated Rows (for all attributes)
+    Sum of Duplicated Rows (on key if given, else for all attributes)
     Sum of unique dtypes
     Top X Missing Values sorted by Sum,
 
     Args:
         data (pd.Dataframe): entire dataframe
         missing_value (int, optional): Top X missing values. Defaults to 5.
+        key (str, optional): Record key column, e.g. "record_id", duplicates are
+            found on the key instead of hashing every column. Defaults to None.
 
     ** start of sample output**
     General Data Information
@@ -46,10 +53,37 @@ def describe_general_data(
     """
     dtypes_value = data.dtypes.value_counts()
     na_value = data.isna().sum()
+    duplicated = data.duplicated() if key is None else data[key].duplicated()
 
     print("General Data Information", "-" * 30, sep="\n")
     print(f"{'Shape of Dataframe:':30}{data.shape}")
-    print(f"{'Sum of Duplicated Rows:':30}{data.duplicated().sum()}")
+    print(f"{'Sum of Duplicated Rows:':30}{duplicated.sum()}")
+    print("-" * 30)
+    print(f"{'Summary of Columns dtypes':30}{dtypes_value.sum()} total cols below")
+    print(dtypes_value)
+    print("-" * 30)
+    print(f"{f'Top {missing_value} Missing Rows':30}{na_value.sum()} overall na values")
+    print(na_value.sort_values(ascending=False).head(missing_value))
+
+
+def describe_general_profile(profile: DataProfile, missing_value: int = 5) -> None:
+    """
+    Prints the same information as `describe_general_data` from a DataProfile.
+
+    The profile is computed in a single streaming pass with
+    `profiler.profile_chunks`, so it works for data that does not fit in memory.
+    Duplicated rows are approximate unless profiled with exact=True.
+
+    Args:
+        profile (DataProfile): profile of the entire data
+        missing_value (int, optional): Top X missing values. Defaults to 5.
+    """
+    dtypes_value = profile.dtypes.astype(str).value_counts()
+    na_value = profile.null_counts
+
+    print("General Data Information", "-" * 30, sep="\n")
+    print(f"{'Shape of Dataframe:':30}{profile.shape}")
+    print(f"{'Sum of Duplicated Rows:':30}{profile.n_duplicated}")
     print("-" * 30)
     print(f"{'Summary of Columns dtypes':30}{dtypes_value.sum()} total cols below")
     print(dtypes_value)
@@ -98,32 +132,46 @@ def plot_cat_distribution(
     figsize: tuple[int, int] = (5, 4),
     dropna: bool = False,
     rot: int = 0,
+    counts: pd.Series | None = None,
+    n_categories: int | None = None,
 ) -> mpl.axes._axes.Axes:
     """
     Plot categorical bar chart using Pandas dataframe and Matplotlib.
 
     Args:
-        data (pd.DataFrame): DataFrame of the data
+        data (pd.DataFrame): DataFrame of the data, can be None if counts is given
         label (str): a string of the label you wish to plot
         title (str, optional): Defaults to "Count of {label}. Defaults to None.
         figsize (tuple[int,int], optional): Defaults to (5, 4).
         dropna (bool, optional): Whether to plot or hide NA. Defaults to False.
         rot (int, optional): rotation of xlabel. Defaults to 0.
+        counts (pd.Series, optional): Pre-aggregated value counts of label, e.g.
+            `ColumnProfile.top(60)`, skips scanning data. Defaults to None.
+        n_categories (int, optional): Number of categories of label before counts
+            were truncated, e.g. `ColumnProfile.n_distinct`. Defaults to None for
+            the number of counts.
 
     Returns:
         mpl.axes._axes.Axes: _description_
     """
-    plot_data = data[label].value_counts(dropna=dropna).sort_values(ascending=True)
-    column_list = data[label].unique()
+    if counts is None:
+        counts = data[label].value_counts(dropna=dropna)
+    elif dropna:
+        counts = counts[counts.index.notna()]
+
+    plot_data = counts.sort_values(ascending=True)
+    column_list = plot_data.index
+    # the too many categories guard applies to the label, not truncated counts
+    n_categories = len(column_list) if n_categories is None else n_categories
 
     # extends figure height if there are too many category
     if len(column_list) > 12:
         height = len(column_list) * 0.18
         figsize = (5, height)
 
-    if len(column_list) > 60:
+    if n_categories > 60:
         print(
-            f"This label has {len(column_list)}, too much categories to plot a bar chart.",
+            f"This label has {n_categories}, too much categories to plot a bar chart.",
             end="\n\n",
         )
         return
@@ -135,19 +183,74 @@ def plot_cat_distribution(
     else:
         axe = plot_data.plot.bar(rot=rot, figsize=figsize)
 
-    if title:
-        plt.title(title)
-    else:
-        plt.title(f"count of {label}")
+    if not title:
+        title = f"count of {label}"
+    if n_categories > len(column_list):
+        title += f" (top {len(column_list)} of {n_categories})"
+    plt.title(title)
 
     return axe
 
 
+def aggregate_histogram(
+    chunks: Iterable[pd.DataFrame],
+    label: str,
+    value_range: tuple[float, float],
+    bins: int = 30,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute histogram counts chunk by chunk with fixed bin edges.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): chunks of the data
+        label (str): numeric attribute to aggregate
+        value_range (tuple[float, float]): (min, max) of label, e.g. from a profile
+        bins (int, optional): number of bins. Defaults to 30.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (counts, bin edges) for plot_single_numeric_hist
+    """
+    edges = np.histogram_bin_edges([], bins=bins, range=value_range)
+    counts = np.zeros(bins, dtype=np.int64)
+    for chunk in chunks:
+        values = chunk[label].to_numpy(dtype=np.float64, na_value=np.nan)
+        counts += np.histogram(values[~np.isnan(values)], bins=edges)[0]
+
+    return counts, edges
+
+
+def box_stats_from_profile(profile: ColumnProfile, label: str) -> dict:
+    """
+    Boxplot statistics from the t-digest of a numeric column profile.
+
+    Whiskers extend to 1.5 IQR clipped to the min and max, fliers are not drawn.
+
+    Args:
+        profile (ColumnProfile): profile of a numeric column
+        label (str): attribute name used as the box label
+
+    Returns:
+        dict: statistics for `matplotlib.axes.Axes.bxp`
+    """
+    q1, med, q3 = profile.digest.quantile(np.array([0.25, 0.5, 0.75]))
+    iqr = q3 - q1
+    return {
+        "label": label,
+        "q1": q1,
+        "med": med,
+        "q3": q3,
+        "whislo": max(q1 - 1.5 * iqr, profile.digest.min),
+        "whishi": min(q3 + 1.5 * iqr, profile.digest.max),
+        "fliers": [],
+    }
+
+
 def plot_single_numeric_hist(
     data: pd.DataFrame,
     label: str,
     bins: int = 30,
     figsize: tuple[int] = (4, 3),
+    hist: tuple[np.ndarray, np.ndarray] | None = None,
     **kwargs,
 ) -> mpl.axes._axes.Axes:
     """
@@ -156,16 +259,25 @@ def plot_single_numeric_hist(
     Test different bin size for different histogram results
 
     Args:
-        data (pd.DataFrame): dataframe of the data
+        data (pd.DataFrame): dataframe of the data, can be None if hist is given
         label (str): attribute in string that you wish to plot
         bins (int, optional): Bins to appear in dataframe. Defaults to 30.
         figsize (tuple[int], optional): Defaults to (4, 3).
+        hist (tuple[np.ndarray, np.ndarray], optional): Pre-aggregated (counts,
+            bin edges) from `aggregate_histogram`, plot time does not depend on
+            number of rows. Defaults to None.
         **kwargs: For additional keywords into pd.DataFrame.hist(**kwargs)
 
     Returns:
         mpl.axes._axes.Axes: return as an axes for customization if needed
     """
-    axe = data[label].hist(bins=bins, edgecolor="k", figsize=figsize, **kwargs)
+    if hist is None:
+        axe = data[label].hist(bins=bins, edgecolor="k", figsize=figsize, **kwargs)
+    else:
+        axe = kwargs.pop("ax", None) or plt.subplots(figsize=figsize)[1]
+        axe.stairs(*hist, fill=True, edgecolor="k", **kwargs)
+        axe.grid(True)
+
     axe.set_title(f"Distribution of {label}")
     axe.set_xlabel(label)
     axe.set_ylabel(f"count of {label}")
@@ -215,6 +327,65 @@ def eda_for_single_numeric(
     plt.show()
 
 
+def eda_for_single_numeric_profile(
+    profile: DataProfile,
+    label: str,
+    hist: tuple[np.ndarray, np.ndarray] | None = None,
+    edit_plot: bool = False,
+    top_5: int = 5,
+) -> mpl.axes._axes.Axes:
+    """Same as `eda_for_single_numeric` from pre-aggregated statistics.
+
+    Statistics come from the DataProfile, the boxplot from its t-digest, and the
+    histogram from `aggregate_histogram`, so plot time is independent of row count.
+
+    Args:
+        profile (DataProfile): profile of the data from `profiler.profile_chunks`
+        label (str): Single Attribute as a String
+        hist (tuple[np.ndarray, np.ndarray]): (counts, bin edges) of label.
+            Defaults to None which plots only the boxplot, on a single axis.
+        edit_plot (bool, optional): Returns mpl.axes for customization. Defaults to False.
+        top_5 (int, optional): Number of top frequency values. Defaults to 5.
+
+    Returns:
+        mpl.axes._axes.Axes: axes for further customization of plt is needed.
+    """
+    col_profile = profile.columns[label]
+    top_values = col_profile.top(top_5)
+
+    print(f"Information for {label}".upper())
+    print("-" * 30)
+    print("Describe Statistic")
+    print(col_profile.describe().round(1))
+    print("-" * 30)
+    print("Showing sum of nulls: ", col_profile.n_null)
+    print("-" * 30)
+    print("Showing top 5 frequency value count")
+    print(
+        pd.concat(
+            [top_values, (top_values / col_profile.count * 100).round(2)],
+            axis=1,
+            keys=["count", "percentage %"],
+        )
+    )
+    print("-" * 30)
+
+    if hist is None:
+        fig, box_axe = plt.subplots(figsize=(3, 3))
+        axe = np.array([box_axe])
+    else:
+        fig, axe = plt.subplots(1, 2, width_ratios=(2, 1))
+        plot_single_numeric_hist(None, label, figsize=(7, 3), hist=hist, ax=axe[0])
+        box_axe = axe[1]
+        fig.subplots_adjust(wspace=0.3)
+    box_axe.bxp([box_stats_from_profile(col_profile, label)], showfliers=False)
+    box_axe.set_ylabel(f"{label} range for boxplot")
+    if edit_plot:
+        return axe
+    plt.tight_layout()
+    plt.show()
+
+
 def eda_for_single_category_str(
     data: pd.DataFrame,
     label: str,
@@ -0,0 +1,226 @@
+"""Headless EDA report of every column, rendered in parallel with cached figures."""
+
+import base64
+import hashlib
+import html
+import io
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+FIGURE_FOLDER = "figures"
+REPORT_FORMATS = {"markdown": "report.md", "html": "report.html"}
+# bump to invalidate cached figures when the rendering changes
+RENDER_VERSION = 1
+
+
+def column_hash(values: pd.Series, bins: int = 30, top: int = 5) -> str:
+    """Hash of a column's name, dtype, values and render settings."""
+    digest = hashlib.sha256()
+    digest.update(
+        f"{values.name}|{values.dtype}|{bins}|{top}|{RENDER_VERSION}".encode()
+    )
+    digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _summarize(values: pd.Series, top: int) -> dict[str, pd.DataFrame]:
+    """Summary tables of a column, the same as printed by `eda`."""
+    counts = values.value_counts(dropna=False)
+    percent = (counts / len(values) * 100).round(2)
+    tables = {
+        "null count": pd.DataFrame({"nulls": [int(values.isna().sum())]}),
+        f"top {top} frequency": pd.concat(
+            [counts, percent], axis=1, keys=["count", "percentage %"]
+        ).head(top),
+    }
+    if pd.api.types.is_numeric_dtype(values):
+        tables["describe"] = values.describe().round(1).to_frame()
+    else:
+        tables["describe"] = pd.DataFrame({"nunique": [values.nunique()]})
+    return tables
+
+
+def _plot(values: pd.Series, figure_path: Path, bins: int) -> None:
+    """Save histogram and boxplot of a numeric column, or a bar chart of counts.
+
+    A column without any non-null value gets a "no data" figure.
+
+    Uses the object oriented api on an Agg canvas, so no display or pyplot state
+    is touched and workers can plot concurrently.
+    """
+    label = values.name
+    if values.notna().sum() == 0:
+        fig = Figure(figsize=(5, 1.5))
+        axe = fig.subplots()
+        axe.axis("off")
+        axe.text(0.5, 0.5, f"no data in {label}", ha="center", va="center")
+    elif pd.api.types.is_numeric_dtype(values):
+        finite = values.dropna().to_numpy(dtype=np.float64)
+        fig = Figure(figsize=(7, 3))
+        axe = fig.subplots(1, 2, width_ratios=(2, 1))
+        axe[0].stairs(*np.histogram(finite, bins=bins), fill=True, edgecolor="k")
+        axe[0].set_title(f"Distribution of {label}")
+        axe[0].set_xlabel(label)
+        axe[0].set_ylabel(f"count of {label}")
+        axe[1].boxplot(finite)
+        axe[1].set_ylabel(f"{label} range for boxplot")
+    else:
+        # same layout rules as `eda.plot_cat_distribution`, top 60 categories
+        counts = values.value_counts(dropna=False).head(60).sort_values()
+        fig = Figure(figsize=(5, max(4, len(counts) * 0.18)))
+        axe = fig.subplots()
+        names = [str(c) for c in counts.index]
+        if max(len(n) for n in names) > 10 or len(counts) > 12:
+            axe.barh(names, counts.to_numpy())
+        else:
+            axe.bar(names, counts.to_numpy())
+        axe.set_title(f"count of {label}")
+
+    FigureCanvasAgg(fig)
+    fig.tight_layout()
+    fig.savefig(figure_path)
+
+
+def render_column(
+    values: pd.Series, figure_folder: Path, bins: int = 30, top: int = 5
+) -> dict:
+    """Render the summary tables and figure of a column into figure_folder.
+
+    Outputs are named by `column_hash`, a column with unchanged data is read back
+    from the cache instead of rendered.
+
+    Returns:
+        dict: label, figure file name and summary tables as split-oriented json.
+    """
+    name = f"{values.name}-{column_hash(values, bins, top)}"
+    figure_path = Path(figure_folder, name + ".png")
+    summary_path = Path(figure_folder, name + ".json")
+    if figure_path.is_file() and summary_path.is_file():
+        with open(summary_path) as f:
+            return json.load(f)
+
+    _plot(values, figure_path, bins)
+    tables = _summarize(values, top)
+    section = {
+        "label": str(values.name),
+        "figure": f"{FIGURE_FOLDER}/{figure_path.name}",
+        "tables": {k: t.to_json(orient="split") for k, t in tables.items()},
+    }
+    with open(summary_path, "w") as f:
+        json.dump(section, f)
+    return section
+
+
+def _format_section(section: dict, report_format: str, output_folder: Path) -> str:
+    """Format a rendered column as a markdown or html section.
+
+    Markdown links the figure file, html inlines it as a base64 data uri so the
+    report is a single self-contained file.
+    """
+    label = section["label"]
+    tables = {
+        k: pd.read_json(io.StringIO(t), orient="split")
+        for k, t in section["tables"].items()
+    }
+    if report_format == "markdown":
+        lines = [f"## {label}", ""]
+        for name, table in tables.items():
+            lines += [f"**{name}**", "", "```", table.to_string(), "```", ""]
+        lines += [f"![{label}]({section['figure']})", ""]
+        return "\n".join(lines)
+
+    parts = [f"<h2>{html.escape(label)}</h2>"]
+    for name, table in tables.items():
+        parts += [f"<h4>{html.escape(name)}</h4>", table.to_html()]
+    figure = base64.b64encode(Path(output_folder, section["figure"]).read_bytes())
+    parts.append(
+        f'<img src="data:image/png;base64,{figure.decode()}" '
+        f'alt="{html.escape(label)}">'
+    )
+    return "<section>" + "\n".join(parts) + "</section>"
+
+
+def write_report(
+    data: pd.DataFrame,
+    output_folder: str | Path,
+    columns: list[str] | None = None,
+    report_format: str = "markdown",
+    n_workers: int = 0,
+    bins: int = 30,
+    top: int = 5,
+) -> Path:
+    """Write a single EDA report of every column with figures saved next to it.
+
+    Replaces looping `eda.eda_all_numeric_attribute` and
+    `eda.eda_all_category_attribute` in a notebook. Columns are rendered headless
+    across `n_workers` processes, only columns whose data changed since the last
+    report are re-rendered. The html report inlines its figures, the markdown
+    report links to them.
+
+    Args:
+        data (pd.DataFrame): entire dataframe
+        output_folder (str | Path): folder of the report and its figures folder
+        columns (list[str], optional): columns to report. Defaults to all.
+        report_format (str, optional): "markdown" or "html". Defaults to "markdown".
+        n_workers (int, optional): worker processes, 0 renders in the current
+            process. Defaults to 0.
+        bins (int, optional): histogram bins of numeric columns. Defaults to 30.
+        top (int, optional): number of top frequency values. Defaults to 5.
+
+    Returns:
+        Path: path of the written report
+    """
+    if report_format not in REPORT_FORMATS:
+        raise NotImplementedError(
+            f"{report_format} is not implemented, expected one of "
+            f"{list(REPORT_FORMATS)}."
+        )
+
+    figure_folder = Path(output_folder, FIGURE_FOLDER)
+    figure_folder.mkdir(parents=True, exist_ok=True)
+    columns = list(data.columns) if columns is None else columns
+
+    if n_workers == 0:
+        sections = [render_column(data[c], figure_folder, bins, top) for c in columns]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(render_column, data[c], figure_folder, bins, top)
+                for c in columns
+            ]
+            sections = [future.result() for future in futures]
+
+    body = [
+        _format_section(section, report_format, Path(output_folder))
+        for section in sections
+    ]
+    overview = (
+        f"{data.shape[0]} rows, {data.shape[1]} columns, "
+        f"{int(data.isna().sum().sum())} overall na values"
+    )
+    if report_format == "markdown":
+        content = "\n".join(["# EDA report", "", overview, "", *body])
+    else:
+        content = "\n".join(
+            [
+                "<!DOCTYPE html>",
+                '<html><head><meta charset="utf-8"><title>EDA report</title></head>',
+                f"<body><h1>EDA report</h1><p>{overview}</p>",
+                *body,
+                "</body></html>",
+            ]
+        )
+
+    report_path = Path(output_folder, REPORT_FORMATS[report_format])
+    report_path.write_text(content)
+    logger.info(f"EDA report of {len(columns)} columns written to {report_path}")
+    return report_path
@@ -0,0 +1,220 @@
+"""Single-pass streaming profiler for chunked data, replacing repeated full scans."""
+
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .sketches import HeavyHitters, HyperLogLog, TDigest, hash_values
+
+
+class ColumnProfile:
+    """Statistics of a single column accumulated chunk by chunk.
+
+    Distinct counts, quantiles and top values are approximated with sketches, with
+    `exact=True` full value counts are also kept for exact distinct and top counts.
+    """
+
+    def __init__(self, exact: bool = False, top_capacity: int = 100) -> None:
+        """Initialize empty column statistics."""
+        self.exact = exact
+        self.count = 0
+        self.n_null = 0
+        self.dtype = None
+        self.distinct = HyperLogLog()
+        self.top_values = HeavyHitters(top_capacity)
+        self.value_counts = pd.Series(dtype=np.int64) if exact else None
+
+        # numeric only statistics
+        self.is_numeric = False
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.digest = TDigest()
+
+    def update(self, series: pd.Series) -> None:
+        """Update statistics with a chunk of the column."""
+        self.dtype = series.dtype
+        self.count += len(series)
+        self.n_null += int(series.isna().sum())
+
+        # distinct and top values are sketched from the chunk's value counts
+        counts = series.value_counts(dropna=False)
+        self.top_values.update_counts(counts)
+        if self.exact:
+            self.value_counts = self.value_counts.add(counts, fill_value=0)
+
+        uniques = counts.index.dropna()
+        is_numeric = pd.api.types.is_numeric_dtype(series)
+        if is_numeric and not pd.api.types.is_bool_dtype(series):
+            # hash as float so int and float chunks of a column hash alike
+            uniques = uniques.astype(np.float64)
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            self.is_numeric = True
+            self.sum += values.sum()
+            self.sum_sq += np.square(values).sum()
+            self.digest.update(values)
+
+        self.distinct.update(pd.Series(uniques))
+
+    def merge(self, other: "ColumnProfile") -> None:
+        """Merge statistics of another chunk or process into this one."""
+        self.dtype = self.dtype if other.dtype is None else other.dtype
+        self.count += other.count
+        self.n_null += other.n_null
+        self.distinct.merge(other.distinct)
+        self.top_values.merge(other.top_values)
+        if self.exact:
+            self.value_counts = self.value_counts.add(other.value_counts, fill_value=0)
+
+        self.is_numeric = self.is_numeric or other.is_numeric
+        self.sum += other.sum
+        self.sum_sq += other.sum_sq
+        self.digest.merge(other.digest)
+
+    @property
+    def n_distinct(self) -> float:
+        """Distinct non null values, exact if profiled with exact=True."""
+        if self.exact:
+            return int(self.value_counts.index.notna().sum())
+        return round(self.distinct.estimate())
+
+    def top(self, n: int = 5) -> pd.Series:
+        """Most frequent values, exact if profiled with exact=True."""
+        if self.exact:
+            return self.value_counts.astype(np.int64).nlargest(n)
+        return self.top_values.top(n)
+
+    def describe(self) -> pd.Series:
+        """Summary similar to pd.Series.describe, quantiles from the t-digest."""
+        summary = {
+            "count": self.count - self.n_null,
+            "null": self.n_null,
+            "distinct": self.n_distinct,
+        }
+        if self.is_numeric:
+            n = self.count - self.n_null
+            mean = self.sum / n if n else np.nan
+            var = (self.sum_sq - n * mean**2) / (n - 1) if n > 1 else np.nan
+            quantiles = self.digest.quantile(np.array([0.25, 0.5, 0.75]))
+            summary.update(
+                {
+                    "mean": mean,
+                    "std": np.sqrt(max(var, 0)),
+                    "min": self.digest.min,
+                    "25%": quantiles[0],
+                    "50%": quantiles[1],
+                    "75%": quantiles[2],
+                    "max": self.digest.max,
+                }
+            )
+        return pd.Series(summary)
+
+
+class DataProfile:
+    """Profile of a whole dataframe accumulated chunk by chunk in a single pass."""
+
+    def __init__(self, exact: bool = False) -> None:
+        """Initialize an empty profile."""
+        self.exact = exact
+        self.n_rows = 0
+        self.columns: dict[str, ColumnProfile] = {}
+        self.row_distinct = HyperLogLog()
+        self._row_hashes = [] if exact else None
+
+    def update(self, chunk: pd.DataFrame) -> "DataProfile":
+        """Update profile with a chunk of rows."""
+        self.n_rows += len(chunk)
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnProfile(exact=self.exact)
+            self.columns[col].update(chunk[col])
+
+        row_hashes = hash_values(chunk)
+        self.row_distinct.update_hashes(row_hashes)
+        if self.exact:
+            self._row_hashes.append(row_hashes)
+
+        return self
+
+    def merge(self, other: "DataProfile") -> "DataProfile":
+        """Merge another profile into this one."""
+        self.n_rows += other.n_rows
+        for col, col_profile in other.columns.items():
+            if col not in self.columns:
+                self.columns[col] = ColumnProfile(exact=self.exact)
+            self.columns[col].merge(col_profile)
+
+        self.row_distinct.merge(other.row_distinct)
+        if self.exact:
+            self._row_hashes.extend(other._row_hashes)
+
+        return self
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Number of rows and columns profiled."""
+        return self.n_rows, len(self.columns)
+
+    @property
+    def n_duplicated(self) -> int:
+        """Duplicated rows, exact if profiled with exact=True."""
+        if self.exact:
+            n_unique = len(np.unique(np.concatenate(self._row_hashes or [[]])))
+            return self.n_rows - n_unique
+        return max(self.n_rows - round(self.row_distinct.estimate()), 0)
+
+    @property
+    def dtypes(self) -> pd.Series:
+        """Dtype of each column."""
+        return pd.Series({col: p.dtype for col, p in self.columns.items()})
+
+    @property
+    def null_counts(self) -> pd.Series:
+        """Sum of nulls of each column."""
+        return pd.Series({col: p.n_null for col, p in self.columns.items()})
+
+    def describe(self) -> pd.DataFrame:
+        """Summary statistics of all columns, one row per column."""
+        return pd.DataFrame({col: p.describe() for col, p in self.columns.items()}).T
+
+
+def _profile_chunk(chunk: pd.DataFrame, exact: bool) -> DataProfile:
+    """Profile a single chunk, used by worker processes."""
+    return DataProfile(exact=exact).update(chunk)
+
+
+def profile_chunks(
+    chunks: Iterable[pd.DataFrame], exact: bool = False, n_jobs: int = 1
+) -> DataProfile:
+    """Profile chunks of data in a single streaming pass.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Chunks of data, e.g. `read_csv(chunksize)`.
+        exact (bool, optional): Keep exact value counts and row hashes as well.
+        n_jobs (int, optional): Processes to profile chunks in parallel, profiles
+            of each chunk are merged as they complete. Defaults to 1.
+
+    Returns:
+        DataProfile: Merged profile of all chunks.
+    """
+    profile = DataProfile(exact=exact)
+    if n_jobs == 1:
+        for chunk in chunks:
+            profile.update(chunk)
+        return profile
+
+    # bound chunks in flight so memory does not grow with the input size
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        for chunk in chunks:
+            if len(pending) >= 2 * n_jobs:
+                profile.merge(pending.popleft().result())
+            pending.append(executor.submit(_profile_chunk, chunk, exact))
+
+        while pending:
+            profile.merge(pending.popleft().result())
+
+    return profile
@@ -0,0 +1,186 @@
+"""Mergeable streaming sketches for approximate statistics over chunked data.
+
+All sketches support `update` with a chunk of values and `merge` with another
+sketch of the same configuration, so chunks can be sketched in parallel processes
+and combined afterwards.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values: pd.Series | pd.DataFrame) -> np.ndarray:
+    """Vectorized 64 bit hash of values or rows, nulls hash consistently."""
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+class HyperLogLog:
+    """HyperLogLog sketch for approximate distinct counts.
+
+    Relative standard error is about 1.04 / sqrt(2 ** precision).
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        """Initialize 2 ** precision registers."""
+        self.precision = precision
+        self.registers = np.zeros(2**precision, dtype=np.uint8)
+
+    def update_hashes(self, hashes: np.ndarray) -> None:
+        """Update registers with 64 bit hashes."""
+        hashes = hashes.astype(np.uint64, copy=False)
+        n_bits = 64 - self.precision
+        index = (hashes >> np.uint64(n_bits)).astype(np.intp)
+        remainder = hashes & np.uint64((1 << n_bits) - 1)
+
+        # bit length of remainder is exact in float64 as n_bits <= 53
+        _, bit_length = np.frexp(remainder.astype(np.float64))
+        rank = (n_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def update(self, values: pd.Series) -> None:
+        """Update sketch with a chunk of values."""
+        self.update_hashes(hash_values(values))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Merge another sketch of the same precision into this one."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m**2 / np.sum(np.exp2(-self.registers.astype(np.float64)))
+
+        n_zero = np.count_nonzero(self.registers == 0)
+        if raw <= 2.5 * m and n_zero > 0:
+            return m * np.log(m / n_zero)
+        return raw
+
+
+class TDigest:
+    """Merging t-digest for approximate quantiles.
+
+    Values are buffered and compressed into weighted centroids with a vectorized
+    pass, accuracy is highest near the tails.
+    """
+
+    def __init__(self, compression: float = 200, buffer_size: int = 50_000) -> None:
+        """Initialize an empty digest."""
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffer_count = 0
+
+    @property
+    def count(self) -> float:
+        """Total weight of values added."""
+        self._compress()
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray | pd.Series) -> None:
+        """Update digest with a chunk of values, NaN is ignored."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._buffer.append(values)
+        self._buffer_count += len(values)
+        if self._buffer_count >= self.buffer_size:
+            self._compress()
+
+    def merge(self, other: "TDigest") -> None:
+        """Merge another digest into this one."""
+        other._compress()
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.means = np.concatenate([self.means, other.means])
+        self.weights = np.concatenate([self.weights, other.weights])
+        self._compress(force=True)
+
+    def _compress(self, force: bool = False) -> None:
+        """Merge buffered values and centroids into at most ~compression centroids."""
+        if not self._buffer and not force:
+            return
+
+        means = np.concatenate([self.means, *self._buffer])
+        weights = np.concatenate(
+            [self.weights, *(np.ones(len(b)) for b in self._buffer)]
+        )
+        self._buffer = []
+        self._buffer_count = 0
+        if len(means) == 0:
+            return
+
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        # k1 scale function, each centroid spans at most one unit of k
+        total = weights.sum()
+        q_left = (np.cumsum(weights) - weights) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_left - 1)
+        groups = np.floor(k - k[0]).astype(np.int64)
+
+        starts = np.flatnonzero(np.diff(groups, prepend=-1))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q: float | np.ndarray) -> float | np.ndarray:
+        """Estimated quantiles for q in [0, 1]."""
+        self._compress()
+        if len(self.means) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+
+        total = self.weights.sum()
+        centers = (np.cumsum(self.weights) - self.weights / 2) / total
+        positions = np.concatenate([[0.0], centers, [1.0]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(q, positions, values)
+
+
+class HeavyHitters:
+    """Misra-Gries summary for the most frequent values.
+
+    Keeps at most `capacity` counters, undercounts by at most n / (capacity + 1).
+    """
+
+    def __init__(self, capacity: int = 100) -> None:
+        """Initialize an empty summary."""
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.total = 0
+
+    def update(self, values: pd.Series) -> None:
+        """Update summary with a chunk of values, nulls are counted as a value."""
+        self.update_counts(values.value_counts(dropna=False))
+
+    def update_counts(self, counts: pd.Series) -> None:
+        """Update summary with pre-aggregated value counts."""
+        self.total += int(counts.sum())
+        self.counts = self.counts.add(counts, fill_value=0).astype(np.int64)
+        self._prune()
+
+    def merge(self, other: "HeavyHitters") -> None:
+        """Merge another summary into this one."""
+        self.total += other.total
+        self.counts = self.counts.add(other.counts, fill_value=0).astype(np.int64)
+        self._prune()
+
+    def _prune(self) -> None:
+        """Decrement all counters by the (capacity + 1)th largest and drop zeros."""
+        if len(self.counts) <= self.capacity:
+            return
+
+        threshold = self.counts.nlargest(self.capacity + 1).iloc[-1]
+        self.counts = self.counts - threshold
+        self.counts = self.counts[self.counts > 0]
+
+    def top(self, n: int = 5) -> pd.Series:
+        """Top n values sorted by (lower bound) count."""
+        return self.counts.sort_values(ascending=False, kind="stable").head(n)
@@ -6,6 +6,8 @@ import pickle
 from pathlib import Path
 from typing import Any
 
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +34,19 @@ def load_object(file_path: str | Path) -> Any:
     return f
 
 
+def with_columns(data: pd.DataFrame, columns: dict[str, Any]) -> pd.DataFrame:
+    """New dataframe of data with columns added or replaced, data is unchanged.
+
+    Unlike `DataFrame.assign`, which deep copies unless pandas copy-on-write is
+    enabled, columns that are not replaced are shared with data, so only the new
+    columns take memory. Only ever replace whole columns of the result.
+    """
+    result = data.copy(deep=False)
+    for name, values in columns.items():
+        result[name] = values
+    return result
+
+
 def load_func(dotpath: str):
     """Load function in module. Function name is right-most segment.
 